@@ -2,8 +2,28 @@ import logging
 logging.getLogger(__name__).warning("The API clients available in this package are deprecated "
                                     "and will be no longer available in their current form "
                                     "starting with version 2.0!")
-from bitex.interfaces import Kraken, Bitfinex, Bitstamp, CCEX, Coincheck
-from bitex.interfaces import Cryptopia, Gemini, ItBit, OKCoin, RockTradingLtd
-from bitex.interfaces import Yunbi, Bittrex, Poloniex, Quoine, QuadrigaCX
-from bitex.interfaces import Vaultoro, HitBtc, Bter, GDAX
+from bitex.lazy import lazy_attributes
 
+# Interfaces and their dependencies are imported on first access
+lazy_attributes(__name__, {
+    'Bitfinex': 'bitex.interfaces',
+    'Bitstamp': 'bitex.interfaces',
+    'Bittrex': 'bitex.interfaces',
+    'CCEX': 'bitex.interfaces',
+    'Coincheck': 'bitex.interfaces',
+    'Cryptopia': 'bitex.interfaces',
+    'Gemini': 'bitex.interfaces',
+    'ItBit': 'bitex.interfaces',
+    'Kraken': 'bitex.interfaces',
+    'OKCoin': 'bitex.interfaces',
+    'RockTradingLtd': 'bitex.interfaces',
+    'Yunbi': 'bitex.interfaces',
+    'Poloniex': 'bitex.interfaces',
+    'Quoine': 'bitex.interfaces',
+    'QuadrigaCX': 'bitex.interfaces',
+    'GDAX': 'bitex.interfaces',
+    'Vaultoro': 'bitex.interfaces',
+    'HitBtc': 'bitex.interfaces',
+    'Bter': 'bitex.interfaces',
+    'fan_out': 'bitex.fanout'
+})
@@ -1,20 +1,24 @@
-from bitex.api.REST.bitfinex import BitfinexREST
-from bitex.api.REST.bitstamp import BitstampREST
-from bitex.api.REST.bittrex import BittrexREST
-from bitex.api.REST.bter import BterREST
-from bitex.api.REST.ccex import CCEXRest
-from bitex.api.REST.coincheck import CoincheckREST
-from bitex.api.REST.cryptopia import CryptopiaREST
-from bitex.api.REST.gdax import GDAXRest
-from bitex.api.REST.gemini import GeminiREST
-from bitex.api.REST.hitbtc import HitBTCREST
-from bitex.api.REST.itbit import ItbitREST
-from bitex.api.REST.kraken import KrakenREST
-from bitex.api.REST.okcoin import OKCoinREST
-from bitex.api.REST.poloniex import PoloniexREST
-from bitex.api.REST.quadriga import QuadrigaCXREST
-from bitex.api.REST.quoine import QuoineREST
-from bitex.api.REST.rocktrading import RockTradingREST
-from bitex.api.REST.vaultoro import VaultoroREST
-from bitex.api.REST.yunbi import YunbiREST
+from bitex.lazy import lazy_attributes
 
+# Clients are imported on first access
+lazy_attributes(__name__, {
+    'BitfinexREST': 'bitex.api.REST.bitfinex',
+    'BitstampREST': 'bitex.api.REST.bitstamp',
+    'BittrexREST': 'bitex.api.REST.bittrex',
+    'BterREST': 'bitex.api.REST.bter',
+    'CCEXRest': 'bitex.api.REST.ccex',
+    'CoincheckREST': 'bitex.api.REST.coincheck',
+    'CryptopiaREST': 'bitex.api.REST.cryptopia',
+    'GDAXRest': 'bitex.api.REST.gdax',
+    'GeminiREST': 'bitex.api.REST.gemini',
+    'HitBTCREST': 'bitex.api.REST.hitbtc',
+    'ItbitREST': 'bitex.api.REST.itbit',
+    'KrakenREST': 'bitex.api.REST.kraken',
+    'OKCoinREST': 'bitex.api.REST.okcoin',
+    'PoloniexREST': 'bitex.api.REST.poloniex',
+    'QuadrigaCXREST': 'bitex.api.REST.quadriga',
+    'QuoineREST': 'bitex.api.REST.quoine',
+    'RockTradingREST': 'bitex.api.REST.rocktrading',
+    'VaultoroREST': 'bitex.api.REST.vaultoro',
+    'YunbiREST': 'bitex.api.REST.yunbi'
+})
@@ -0,0 +1,170 @@
+"""
+asyncio-based counterpart of the APIClient base class.
+
+Requests are prepared (and signed) exactly like their synchronous
+counterparts - by the client's sign() method and a requests.Session - and
+sent using aiohttp. The received response is converted into an APIResponse,
+hence formatters and response handling are shared with the blocking clients.
+
+Requires aiohttp to be installed.
+"""
+# Import Built-Ins
+import logging
+import time
+from datetime import timedelta
+
+# Import Third-Party
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from yarl import URL
+
+# Import Homebrew
+from bitex.api.REST.api import APIClient
+from bitex.api.REST.response import APIResponse
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+# Keyword arguments accepted by requests.Request(); anything else passed to
+# api_request() is a send-time option of requests.request()
+REQUEST_KWARGS = ('headers', 'files', 'data', 'params', 'auth', 'cookies',
+                  'hooks', 'json')
+
+
+class AsyncAPIClient(APIClient):
+    """
+    Mixin providing awaitable versions of query() and api_request(). Mix it
+    into any APIClient subclass (or interface) by listing it first in the
+    class's bases:
+
+        class AsyncKraken(AsyncAPIClient, Kraken):
+            pass
+
+    Since all interface methods pass on the return value of query(), they
+    return coroutines as well, and need to be awaited.
+    """
+    # Maximum number of simultaneously open connections, per client
+    connection_limit = 100
+
+    _aio_session = None
+
+    def _get_aio_session(self):
+        """
+        Returns the client's aiohttp.ClientSession, creating it if necessary.
+        This must be called from within a coroutine.
+        :return: aiohttp.ClientSession()
+        """
+        if self._aio_session is None or self._aio_session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connection_limit)
+            self._aio_session = aiohttp.ClientSession(connector=connector)
+        return self._aio_session
+
+    async def close(self):
+        """
+        Closes the client's aiohttp.ClientSession and its connections.
+        :return:
+        """
+        if self._aio_session is not None:
+            await self._aio_session.close()
+            self._aio_session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def api_request(self, method_verb, url, timeout=None, **kwargs):
+        """
+        Sends the request using aiohttp, and converts the result into our
+        custom APIResponse object.
+        :param method_verb: valid request type (PUT, GET, POST etc)
+        :param url: str
+        :param timeout: float, total timeout in seconds
+        :param kwargs: Kwargs as accepted by requests.request()
+        :return: APIResponse() obj
+        """
+        request_kwargs = {k: kwargs.pop(k) for k in REQUEST_KWARGS
+                          if k in kwargs}
+        allow_redirects = kwargs.pop('allow_redirects', True)
+        if kwargs:
+            log.debug("AsyncAPIClient.api_request(): Ignoring unsupported "
+                      "kwargs %s", kwargs)
+
+        prepared = self.session.prepare_request(
+            requests.Request(method_verb, url, **request_kwargs))
+        body = prepared.body
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        session = self._get_aio_session()
+        started = time.time()
+        async with session.request(prepared.method,
+                                   URL(prepared.url, encoded=True),
+                                   headers=dict(prepared.headers), data=body,
+                                   allow_redirects=allow_redirects,
+                                   timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            content = await resp.read()
+
+        r = requests.Response()
+        r.status_code = resp.status
+        r.headers = CaseInsensitiveDict(resp.headers)
+        r.encoding = get_encoding_from_headers(r.headers)
+        r.reason = resp.reason
+        r.url = str(resp.url)
+        r.request = prepared
+        r.elapsed = timedelta(seconds=time.time() - started)
+        r._content = content
+        return APIResponse(r)
+
+    async def query(self, method_verb, endpoint, authenticate=False,
+                    *args, **kwargs):
+        """
+        Awaitable version of APIClient.query().
+        :param method_verb: valid request type (PUT, GET, POST etc)
+        :param endpoint: endpoint path for the resource to query, sans the url &
+                         API version (i.e. '/btcusd/ticker/').
+        :param authenticate: Bool to determine whether or not a signature is
+                             required.
+        :param args: Optional args for self.sign()
+        :param kwargs: Optional Kwargs for self.sign() and requests.request()
+        :return: APIResponse() obj
+        """
+        if self.cache is not None:
+            key = self.cache.make_key(self, method_verb, endpoint,
+                                      authenticate, kwargs)
+            if key is not None:
+                return await self.cache.fetch_async(key, endpoint, lambda: self._query(
+                    method_verb, endpoint, authenticate, *args, **kwargs))
+        return await self._query(method_verb, endpoint, authenticate,
+                                 *args, **kwargs)
+
+    async def _query(self, method_verb, endpoint, authenticate=False,
+                     *args, **kwargs):
+        """
+        Awaitable version of APIClient._query().
+        :param method_verb: valid request type (PUT, GET, POST etc)
+        :param endpoint: endpoint path for the resource to query, sans the url &
+                         API version (i.e. '/btcusd/ticker/').
+        :param authenticate: Bool to determine whether or not a signature is
+                             required.
+        :param args: Optional args for self.sign()
+        :param kwargs: Optional Kwargs for self.sign() and requests.request()
+        :return: APIResponse() obj
+        """
+        # Wait before signing, so nonces are sent in ascending order
+        if self.rate_limiter is not None:
+            await self.rate_limiter.wait_async(endpoint, authenticate)
+        url, request_kwargs = self.prepare_query(method_verb, endpoint,
+                                                 authenticate, *args, **kwargs)
+        log.debug("Making request to: %s, kwargs: %s", url, request_kwargs)
+        r = await self.api_request(method_verb, url, timeout=self.timeout,
+                                   **request_kwargs)
+        log.debug("Made %s request made to %s, with headers %s and body %s. "
+                  "Status code %s", r.request.method,
+                  r.request.url, r.request.headers,
+                  r.request.body, r.status_code)
+        return r
@@ -4,6 +4,7 @@ ABC for Exchange APIs
 # Import Built-Ins
 import logging
 import time
+from threading import Thread
 from abc import ABCMeta, abstractmethod
 from urllib.parse import urljoin
 from os.path import join
@@ -13,6 +14,8 @@ import requests
 
 # Import Homebrew
 from bitex.api.REST.response import APIResponse
+from bitex.api.REST.session import get_session, configure_pool
+from bitex.api.REST.ratelimit import get_rate_limiter
 
 log = logging.getLogger(__name__)
 
@@ -22,7 +25,17 @@ class APIClient(metaclass=ABCMeta):
     Base Class for API ojects. Provides basic methods to interact
     with exchange APIs, such as sending queries and signing messages to pass
     authentication.
+
+    Queries are rate limited according to the class's rate_limits, using a
+    RateLimiter shared by all clients of the same host. Assign a custom
+    RateLimiter (or None) to an instance's rate_limiter attribute to
+    override this.
+
+    Responses of public GET queries may be cached by assigning a
+    ResponseCache to an instance's cache attribute.
     """
+    # Dict of rate limits, as accepted by RateLimiter.from_limits()
+    rate_limits = None
 
     def __init__(self, uri, api_version=None, key=None, secret=None, timeout=5):
         """
@@ -37,6 +50,9 @@ class APIClient(metaclass=ABCMeta):
         self.uri = uri
         self.version = api_version if api_version else ''
         self.timeout = timeout
+        self.session = get_session(uri)
+        self.rate_limiter = get_rate_limiter(uri, self.rate_limits)
+        self.cache = None
         log.debug("Initialized API Client for URI: %s; "
                   "Will request on API version: %s" %
                   (self.uri, self.version))
@@ -57,16 +73,53 @@ class APIClient(metaclass=ABCMeta):
         """
         return str(round(100000 * time.time()) * 2) 
 
-    @staticmethod
-    def api_request(*args, **kwargs):
+    def configure_pool(self, pool_connections=None, pool_maxsize=None):
+        """
+        Configures the keep-alive connection pool shared by all clients
+        querying this client's host.
+        :param pool_connections: int, number of connection pools to cache
+        :param pool_maxsize: int, maximum number of connections kept per host
+        :return:
+        """
+        self.session = configure_pool(self.uri, pool_connections=pool_connections,
+                                      pool_maxsize=pool_maxsize)
+
+    def warm_up(self, connections=1):
+        """
+        Pre-establishes connections to the exchange, so that the first queries
+        do not have to pay for the TCP and TLS handshakes.
+        :param connections: int, number of connections to open concurrently
+        :return: int, number of connections successfully established
+        """
+        results = []
+
+        def connect():
+            try:
+                self.session.head(self.uri, timeout=self.timeout)
+            except requests.RequestException as e:
+                log.warning("APIClient.warm_up(): Could not connect to %s: %s",
+                            self.uri, e)
+            else:
+                results.append(True)
+
+        threads = [Thread(target=connect, daemon=True) for _ in range(connections)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        log.debug("APIClient.warm_up(): Established %s/%s connections to %s",
+                  len(results), connections, self.uri)
+        return len(results)
+
+    def api_request(self, *args, **kwargs):
         """
-        Wrapper which converts a requests.Response into our custom APIResponse
-        object
+        Wrapper which sends the request using the client's pooled session and
+        converts the requests.Response into our custom APIResponse object
         :param args:
         :param kwargs:
         :return:
         """
-        r = requests.request(*args, **kwargs)
+        r = self.session.request(*args, **kwargs)
         return APIResponse(r)
 
     @abstractmethod
@@ -85,18 +138,19 @@ class APIClient(metaclass=ABCMeta):
 
         return url, {'params': {'test_param': "authenticated_chimichanga"}}
 
-    def query(self, method_verb, endpoint, authenticate=False,
-              *args, **kwargs):
+    def prepare_query(self, method_verb, endpoint, authenticate=False,
+                      *args, **kwargs):
         """
-        Queries exchange using given data. Defaults to unauthenticated query.
+        Builds the url and request kwargs for the given query, signing them
+        if authentication is required.
         :param method_verb: valid request type (PUT, GET, POST etc)
         :param endpoint: endpoint path for the resource to query, sans the url &
                          API version (i.e. '/btcusd/ticker/').
         :param authenticate: Bool to determine whether or not a signature is
                              required.
-        :param args: Optional args for requests.request()
+        :param args: Optional args for self.sign()
         :param kwargs: Optional Kwargs for self.sign() and requests.request()
-        :return: request.response() obj
+        :return: tuple of url (str) and request kwargs (dict)
         """
         if self.version:
             endpoint_path = join(self.version, endpoint)
@@ -109,6 +163,48 @@ class APIClient(metaclass=ABCMeta):
                                             method_verb, *args, **kwargs)
         else:
             request_kwargs = kwargs
+        return url, request_kwargs
+
+    def query(self, method_verb, endpoint, authenticate=False,
+              *args, **kwargs):
+        """
+        Queries exchange using given data. Defaults to unauthenticated query.
+        Returns a cached response instead, if available.
+        :param method_verb: valid request type (PUT, GET, POST etc)
+        :param endpoint: endpoint path for the resource to query, sans the url &
+                         API version (i.e. '/btcusd/ticker/').
+        :param authenticate: Bool to determine whether or not a signature is
+                             required.
+        :param args: Optional args for requests.request()
+        :param kwargs: Optional Kwargs for self.sign() and requests.request()
+        :return: request.response() obj
+        """
+        if self.cache is not None:
+            key = self.cache.make_key(self, method_verb, endpoint,
+                                      authenticate, kwargs)
+            if key is not None:
+                return self.cache.fetch(key, endpoint, lambda: self._query(
+                    method_verb, endpoint, authenticate, *args, **kwargs))
+        return self._query(method_verb, endpoint, authenticate, *args, **kwargs)
+
+    def _query(self, method_verb, endpoint, authenticate=False,
+               *args, **kwargs):
+        """
+        Sends the query to the exchange.
+        :param method_verb: valid request type (PUT, GET, POST etc)
+        :param endpoint: endpoint path for the resource to query, sans the url &
+                         API version (i.e. '/btcusd/ticker/').
+        :param authenticate: Bool to determine whether or not a signature is
+                             required.
+        :param args: Optional args for requests.request()
+        :param kwargs: Optional Kwargs for self.sign() and requests.request()
+        :return: request.response() obj
+        """
+        # Wait before signing, so nonces are sent in ascending order
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(endpoint, authenticate)
+        url, request_kwargs = self.prepare_query(method_verb, endpoint,
+                                                 authenticate, *args, **kwargs)
         log.debug("Making request to: %s, kwargs: %s", url, request_kwargs)
         r = self.api_request(method_verb, url, timeout=self.timeout,
                              **request_kwargs)
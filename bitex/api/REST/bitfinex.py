@@ -17,6 +17,11 @@ log = logging.getLogger(__name__)
 
 
 class BitfinexREST(APIClient):
+    rate_limits = {'public': (90, 60), 'private': (90, 60),
+                   'endpoints': {'pubticker': (30, 60), 'book': (30, 60),
+                                 'trades': (30, 60), 'stats': (10, 60),
+                                 'lendbook': (45, 60), 'lends': (45, 60)}}
+
     def __init__(self, key=None, secret=None, api_version='v1',
                  url='https://api.bitfinex.com', timeout=5):
         super(BitfinexREST, self).__init__(url, api_version=api_version,
@@ -15,6 +15,8 @@ log = logging.getLogger(__name__)
 
 
 class BitstampREST(APIClient):
+    rate_limits = {'public': (600, 600), 'private': (600, 600)}
+
     def __init__(self, user_id='', key=None, secret=None, api_version=None,
                  url='https://www.bitstamp.net/api', timeout=5):
         self.id = user_id
@@ -18,8 +18,10 @@ log = logging.getLogger(__name__)
 
 
 class BittrexREST(APIClient):
+    rate_limits = {'public': (60, 60), 'private': (60, 60)}
+
     def __init__(self, key=None, secret=None, api_version='v1.1',
-                 url='https://bittrex.com/api', timeout=5):
+                 url='https://bittrex.com/api/', timeout=5):
         super(BittrexREST, self).__init__(url, api_version=api_version, key=key,
                                           secret=secret, timeout=timeout)
 
@@ -32,11 +34,12 @@ class BittrexREST(APIClient):
 
         nonce = self.nonce()
 
-        req_string = endpoint_path + '?apikey=' + self.key + "&nonce=" + nonce + '&'
-        req_string += urllib.parse.urlencode(params)
+        # The signature covers the full url requested
+        url += '?apikey=' + self.key + "&nonce=" + nonce + '&'
+        url += urllib.parse.urlencode(params)
         headers = {"apisign": hmac.new(self.secret.encode('utf-8'),
-                                       (self.uri + req_string).encode('utf-8'),
+                                       url.encode('utf-8'),
                                        hashlib.sha512).hexdigest()}
 
-        return self.uri + req_string, {'headers': headers, 'params': {}}
+        return url, {'headers': headers, 'params': {}}
 
@@ -0,0 +1,206 @@
+"""
+TTL response cache for public REST endpoints.
+
+Identical concurrent queries are coalesced into a single request, whose
+response is handed to all callers. Each caller receives its own APIResponse,
+which decodes the body anew, hence formatters may modify the decoded data in
+place. Authenticated queries are never cached.
+"""
+# Import Built-Ins
+import logging
+import threading
+import time
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.REST.response import APIResponse
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+def unshared(response):
+    """
+    Returns a new APIResponse wrapping the same response as the given one,
+    which does not share its decoded json body.
+    :param response: APIResponse obj
+    :return: APIResponse
+    """
+    return APIResponse(getattr(response, '_response', response))
+
+
+class ResponseCache:
+    """
+    LRU cache of APIResponse objects, keyed by exchange, endpoint and
+    parameters, whose entries expire after a per-endpoint TTL.
+    """
+    def __init__(self, ttl=1.0, maxsize=1024, endpoint_ttls=None):
+        """
+        Initialize Object.
+        :param ttl: float, default number of seconds a response is valid
+        :param maxsize: int, maximum number of cached responses
+        :param endpoint_ttls: dict of endpoint prefix: ttl; a ttl of 0
+                              disables caching for matching endpoints
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.endpoint_ttls = endpoint_ttls or {}
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._inflight_async = {}
+        self._lock = threading.Lock()
+
+    def get_ttl(self, endpoint):
+        """
+        Returns the TTL for the given endpoint.
+        :param endpoint: str
+        :return: float
+        """
+        for prefix, ttl in self.endpoint_ttls.items():
+            if endpoint.startswith(prefix):
+                return ttl
+        return self.ttl
+
+    def make_key(self, client, method_verb, endpoint, authenticate, kwargs):
+        """
+        Returns the cache key for the given query, or None if it may not be
+        cached - that is, if it is authenticated, not a GET request, passes
+        other request kwargs than params, or its endpoint's TTL is 0.
+        :param client: APIClient() obj
+        :param method_verb: str
+        :param endpoint: str
+        :param authenticate: bool
+        :param kwargs: dict, kwargs passed to APIClient.query()
+        :return: tuple or None
+        """
+        if authenticate or method_verb != 'GET' or not self.get_ttl(endpoint):
+            return None
+        if any(k != 'params' for k in kwargs):
+            return None
+        params = kwargs.get('params')
+        if isinstance(params, dict):
+            params = tuple(sorted((k, repr(v)) for k, v in params.items()))
+        else:
+            params = repr(params)
+        return client.uri, client.version, endpoint, params
+
+    def _lookup(self, key):
+        # Must be called while holding self._lock
+        try:
+            expires, response = self._entries[key]
+        except KeyError:
+            return None
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def _store(self, key, endpoint, response):
+        # Must be called while holding self._lock
+        if response.status_code >= 400:
+            return
+        self._entries[key] = time.monotonic() + self.get_ttl(endpoint), response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def fetch(self, key, endpoint, func):
+        """
+        Returns the cached response for key, or calls func to fetch it. If
+        another thread is already fetching the same key, its result is
+        awaited instead of sending another request.
+        :param key: tuple, as returned by make_key()
+        :param endpoint: str
+        :param func: callable returning an APIResponse
+        :return: APIResponse
+        """
+        with self._lock:
+            response = self._lookup(key)
+            if response is not None:
+                self.hits += 1
+                return unshared(response)
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.hits += 1
+
+        if not owner:
+            return unshared(future.result())
+
+        try:
+            response = func()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._store(key, endpoint, unshared(response))
+        future.set_result(response)
+        return response
+
+    async def fetch_async(self, key, endpoint, func):
+        """
+        Awaitable version of fetch(); coalesces identical queries issued on
+        the same event loop.
+        :param key: tuple, as returned by make_key()
+        :param endpoint: str
+        :param func: callable returning an awaitable of an APIResponse
+        :return: APIResponse
+        """
+        loop = asyncio.get_event_loop()
+        inflight_key = id(loop), key
+        with self._lock:
+            response = self._lookup(key)
+            if response is not None:
+                self.hits += 1
+                return unshared(response)
+            future = self._inflight_async.get(inflight_key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = loop.create_future()
+                self._inflight_async[inflight_key] = future
+            else:
+                self.hits += 1
+
+        if not owner:
+            return unshared(await asyncio.shield(future))
+
+        try:
+            response = await func()
+        except BaseException as e:
+            with self._lock:
+                self._inflight_async.pop(inflight_key, None)
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark the exception as retrieved, in case nobody awaits it
+                future.exception()
+            raise
+        with self._lock:
+            self._inflight_async.pop(inflight_key, None)
+            self._store(key, endpoint, unshared(response))
+        future.set_result(response)
+        return response
+
+    def clear(self):
+        """
+        Removes all cached responses.
+        :return:
+        """
+        with self._lock:
+            self._entries.clear()
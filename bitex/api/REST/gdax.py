@@ -44,6 +44,8 @@ class GdaxAuth(AuthBase):
 
 
 class GDAXRest(APIClient):
+    rate_limits = {'public': (3, 1), 'private': (5, 1)}
+
     def __init__(self, passphrase='', key=None, secret=None, api_version=None,
                  url='https://api.gdax.com', timeout=5):
         self.passphrase = passphrase
@@ -17,6 +17,8 @@ log = logging.getLogger(__name__)
 
 
 class GeminiREST(APIClient):
+    rate_limits = {'public': (120, 60), 'private': (600, 60)}
+
     def __init__(self, key=None, secret=None, api_version='v1',
                  url='https://api.gemini.com', timeout=5):
         super(GeminiREST, self).__init__(url, api_version=api_version, key=key,
@@ -18,6 +18,13 @@ log = logging.getLogger(__name__)
 
 
 class KrakenREST(APIClient):
+    # Public calls are limited to ~1/s; private calls increase a counter of
+    # max. 15, which decreases by 1 every 3 seconds.
+    rate_limits = {'public': (1, 1), 'private': (15, 45),
+                   'costs': {'private/Ledgers': 2, 'private/QueryLedgers': 2,
+                             'private/TradesHistory': 2,
+                             'private/QueryTrades': 2}}
+
     def __init__(self, key=None, secret=None, api_version='0',
                  url='https://api.kraken.com', timeout=5):
         super(KrakenREST, self).__init__(url, api_version=api_version,
@@ -34,7 +41,8 @@ class KrakenREST(APIClient):
 
         # Unicode-objects must be encoded before hashing
         encoded = (str(req['nonce']) + postdata).encode('utf-8')
-        message = (endpoint_path.encode('utf-8') +
+        # Kraken signs the url's absolute path, i.e. '/0/private/Balance'
+        message = (urllib.parse.urlsplit(url).path.encode('utf-8') +
                    hashlib.sha256(encoded).digest())
 
         signature = hmac.new(base64.b64decode(self.secret),
@@ -17,6 +17,8 @@ log = logging.getLogger(__name__)
 
 
 class PoloniexREST(APIClient):
+    rate_limits = {'public': (6, 1), 'private': (6, 1)}
+
     def __init__(self, key=None, secret=None, api_version=None,
                  url='https://poloniex.com', timeout=5):
         super(PoloniexREST, self).__init__(url, api_version=api_version,
@@ -0,0 +1,183 @@
+"""
+Token-bucket rate limiting for the REST API clients.
+
+Buckets hand out reservations instead of blocking while holding their lock,
+hence the same bucket can be used safely from threads (RateLimiter.wait())
+and coroutines (RateLimiter.wait_async()) at the same time.
+"""
+# Import Built-Ins
+import logging
+import threading
+import time
+import asyncio
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.REST.session import host_key
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket, allowing bursts of up to capacity calls, and
+    refilling at rate tokens per second.
+    """
+    def __init__(self, rate, capacity):
+        """
+        Initialize Object.
+        :param rate: float, tokens added per second
+        :param capacity: float, maximum number of tokens in the bucket
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_limit(cls, calls, period):
+        """
+        Creates a bucket allowing the given number of calls per period.
+        :param calls: int
+        :param period: float, seconds
+        :return: TokenBucket()
+        """
+        return cls(calls / period, calls)
+
+    def reserve(self, tokens=1):
+        """
+        Takes the given number of tokens from the bucket, and returns the
+        number of seconds the caller has to wait before it may proceed.
+        :param tokens: float
+        :return: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Rate limiter consulted by APIClient.query() before sending a request.
+    Features separate buckets for public and private endpoints, as well as
+    optional per-endpoint buckets and costs.
+    """
+    def __init__(self, public=None, private=None, endpoints=None, costs=None):
+        """
+        Initialize Object.
+        :param public: TokenBucket for unauthenticated queries, or None
+        :param private: TokenBucket for authenticated queries, or None
+        :param endpoints: dict of endpoint prefix: TokenBucket, applied in
+                          addition to the public or private bucket
+        :param costs: dict of endpoint prefix: number of tokens a call costs
+        """
+        self.public = public
+        self.private = private
+        self.endpoints = endpoints or {}
+        self.costs = costs or {}
+
+    @classmethod
+    def from_limits(cls, limits):
+        """
+        Creates a RateLimiter from a dict of limits, as found in
+        APIClient.rate_limits:
+            {'public': (calls, period), 'private': (calls, period),
+             'endpoints': {endpoint_prefix: (calls, period)},
+             'costs': {endpoint_prefix: tokens}}
+        :param limits: dict
+        :return: RateLimiter()
+        """
+        def bucket(limit):
+            return TokenBucket.from_limit(*limit) if limit else None
+
+        endpoints = {endpoint: bucket(limit) for endpoint, limit
+                     in limits.get('endpoints', {}).items()}
+        return cls(public=bucket(limits.get('public')),
+                   private=bucket(limits.get('private')),
+                   endpoints=endpoints, costs=limits.get('costs'))
+
+    @staticmethod
+    def _match(endpoint, prefixes):
+        for prefix in prefixes:
+            if endpoint.startswith(prefix):
+                return prefix
+        return None
+
+    def reserve(self, endpoint, authenticate=False):
+        """
+        Reserves tokens for the given query in all relevant buckets.
+        :param endpoint: str, endpoint as passed to APIClient.query()
+        :param authenticate: bool, whether or not the query is authenticated
+        :return: float, seconds to wait before sending the query
+        """
+        prefix = self._match(endpoint, self.costs)
+        tokens = self.costs[prefix] if prefix is not None else 1
+
+        buckets = [self.private if authenticate else self.public]
+        prefix = self._match(endpoint, self.endpoints)
+        if prefix is not None:
+            buckets.append(self.endpoints[prefix])
+
+        delay = 0.0
+        for bucket in buckets:
+            if bucket is not None:
+                delay = max(delay, bucket.reserve(tokens))
+        if delay:
+            log.debug("RateLimiter.reserve(): Delaying query to %s by %.3fs",
+                      endpoint, delay)
+        return delay
+
+    def wait(self, endpoint, authenticate=False):
+        """
+        Blocks until the given query may be sent.
+        :param endpoint: str
+        :param authenticate: bool
+        :return:
+        """
+        delay = self.reserve(endpoint, authenticate)
+        if delay:
+            time.sleep(delay)
+
+    async def wait_async(self, endpoint, authenticate=False):
+        """
+        Awaitable version of wait(), which does not block the event loop.
+        :param endpoint: str
+        :param authenticate: bool
+        :return:
+        """
+        delay = self.reserve(endpoint, authenticate)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(uri, limits):
+    """
+    Returns the RateLimiter shared by all clients of the given uri's host,
+    creating it from limits if necessary.
+    :param uri: str
+    :param limits: dict, as accepted by RateLimiter.from_limits(), or None
+    :return: RateLimiter() or None, if no limits were given
+    """
+    if not limits:
+        return None
+    key = host_key(uri)
+    with _limiters_lock:
+        try:
+            return _limiters[key]
+        except KeyError:
+            limiter = RateLimiter.from_limits(limits)
+            _limiters[key] = limiter
+            return limiter
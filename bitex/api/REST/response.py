@@ -1,27 +1,98 @@
+# Import Built-Ins
+import logging
+
 # Import Third-Party
 from requests import Response
 
+# Import Homebrew
+from bitex.utils import json_loads
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+# Sentinel for not yet decoded json
+_MISSING = object()
+
 
 class APIResponse(Response):
+    """
+    Wraps a requests.Response, without copying it. Any attribute not found on
+    the wrapper is looked up on the wrapped response.
+
+    The decoded json body is cached, hence json() decodes the body only once.
+    The `formatted` attribute is computed from it on first access, if a
+    formatter was set via set_formatter().
+    """
 
     def __init__(self, req_response, formatted_json=None):
-        for k, v in req_response.__dict__.items():
-            self.__dict__[k] = v
+        self._json = _MISSING
+        if isinstance(req_response, APIResponse):
+            # Share the already decoded body with the wrapped response
+            self._json = req_response._json
+            req_response = req_response._response
+        self._response = req_response
+        self._formatter = None
         self._formatted = formatted_json
 
+    def __getattr__(self, name):
+        # Only called if the attribute wasn't found on the wrapper itself
+        if name == '_response':
+            raise AttributeError(name)
+        return getattr(self._response, name)
+
+    def __getstate__(self):
+        return {'_response': self._response, '_formatted': self.formatted}
+
+    def __setstate__(self, state):
+        self.__init__(state['_response'], state['_formatted'])
+
+    def json(self, **kwargs):
+        """
+        Returns the decoded json body. Without kwargs, the body is decoded
+        only once, using the decoder configured via
+        bitex.utils.set_json_decoder(), and the result is cached.
+        :param kwargs: kwargs passed to json.loads()
+        :return: decoded json
+        """
+        if kwargs:
+            return self._response.json(**kwargs)
+        if self._json is _MISSING:
+            self._json = json_loads(self._response.content)
+        return self._json
+
+    def set_formatter(self, formatter, *args, **kwargs):
+        """
+        Sets the formatter to apply to the json body when `formatted` is
+        accessed the first time.
+        :param formatter: callable, accepting data, *args and **kwargs
+        :param args: args passed to the formatter
+        :param kwargs: kwargs passed to the formatter
+        :return:
+        """
+        self._formatter = formatter, args, kwargs
+        self._formatted = None
+
     @property
     def formatted(self):
+        if self._formatter is not None:
+            formatter, args, kwargs = self._formatter
+            self._formatter = None
+            try:
+                data = self.json()
+            except ValueError:
+                log.error('APIResponse.formatted: Error while parsing json. '
+                          'Request url was: %s, result is: %s',
+                          self.request.url, self.text)
+                data = None
+            if data:
+                try:
+                    self._formatted = formatter(data, *args, **kwargs)
+                except Exception:
+                    log.exception("Error while applying formatter!")
         return self._formatted
 
     @formatted.setter
     def formatted(self, value):
+        self._formatter = None
         self._formatted = value
 
-
-if __name__ == '__main__':
-    from bitex import Kraken
-
-    k = Kraken()
-    resp = k.ticker('XXBTZEUR')
-    print(resp.formatted)
-    print(resp.json())
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Provides pooled, keep-alive HTTP sessions for the REST API clients.
+
+Sessions are shared per host, so all APIClient instances talking to the same
+exchange reuse the same connection pool instead of performing a new TCP and
+TLS handshake for every request.
+"""
+# Import Built-Ins
+import logging
+import threading
+from urllib.parse import urlsplit
+
+# Import Third-Party
+import requests
+from requests.adapters import HTTPAdapter
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+# Default number of hosts to cache pools for, and connections per host
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def host_key(uri):
+    """
+    Returns the key under which the session for the given uri is registered.
+    :param uri: str, i.e. 'https://api.kraken.com/0/public/Time'
+    :return: str, i.e. 'https://api.kraken.com'
+    """
+    parts = urlsplit(uri)
+    return '%s://%s' % (parts.scheme, parts.netloc)
+
+
+def _make_session(key, pool_connections, pool_maxsize):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize)
+    session.mount(key, adapter)
+    log.debug("_make_session(): Created session for %s (pool_connections=%s, "
+              "pool_maxsize=%s)", key, pool_connections, pool_maxsize)
+    return session
+
+
+def get_session(uri):
+    """
+    Returns the shared requests.Session for the given uri's host, creating it
+    with the module's default pool settings if necessary.
+    :param uri: str
+    :return: requests.Session()
+    """
+    key = host_key(uri)
+    with _sessions_lock:
+        try:
+            return _sessions[key]
+        except KeyError:
+            session = _make_session(key, POOL_CONNECTIONS, POOL_MAXSIZE)
+            _sessions[key] = session
+            return session
+
+
+def configure_pool(uri, pool_connections=None, pool_maxsize=None):
+    """
+    (Re-)configures the connection pool of the given uri's host. Clients
+    already holding a reference to the host's session pick up the new
+    settings, as the adapter is replaced in-place.
+    :param uri: str
+    :param pool_connections: int, number of connection pools to cache
+    :param pool_maxsize: int, maximum number of connections kept per host
+    :return: requests.Session()
+    """
+    pool_connections = pool_connections or POOL_CONNECTIONS
+    pool_maxsize = pool_maxsize or POOL_MAXSIZE
+    key = host_key(uri)
+    session = get_session(uri)
+    with _sessions_lock:
+        old_adapter = session.adapters.get(key)
+        session.mount(key, HTTPAdapter(pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize))
+    if old_adapter is not None:
+        old_adapter.close()
+    log.debug("configure_pool(): Configured session for %s (pool_connections=%s, "
+              "pool_maxsize=%s)", key, pool_connections, pool_maxsize)
+    return session
+
+
+def close_sessions():
+    """
+    Closes all registered sessions and their pooled connections.
+    :return:
+    """
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
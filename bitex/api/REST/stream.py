@@ -0,0 +1,128 @@
+"""
+Incremental parsing of order book responses.
+
+Full-depth order books can be several megabytes large. Instead of loading and
+decoding the entire body, the price levels are decoded one by one as the body
+arrives, and reading stops as soon as the requested number of levels per side
+has been found.
+"""
+# Import Built-Ins
+import logging
+import codecs
+import json
+import re
+
+# Import Third-Party
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+# Whitespace and separators between two levels of a side's array
+_SEPARATORS = re.compile(r'[\s,]*')
+
+
+class OrderBookScanner:
+    """
+    Incrementally scans a JSON document for arrays of price levels, stored
+    under the given side keys (i.e. "bids" and "asks"), and decodes each level
+    as soon as it has been received completely. Levels are expected to be
+    JSON arrays or objects; everything outside the side arrays is skipped
+    without being decoded.
+    """
+    def __init__(self, sides, depth=None):
+        """
+        Initialize Object.
+        :param sides: dict of JSON key: side name, i.e. {'buy': 'bids'}
+        :param depth: int, number of levels to decode per side, or None to
+                      decode all of them
+        """
+        self.sides = sides
+        self.depth = depth
+        self.counts = dict.fromkeys(set(sides.values()), 0)
+        self._key_re = re.compile(r'"(%s)"\s*:\s*\[' %
+                                  '|'.join(re.escape(k) for k in sides))
+        # Number of characters kept when searching for a side key, in case
+        # the key is split across two chunks
+        self._key_tail = max(len(k) for k in sides) + 32
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._side = None
+
+    @property
+    def done(self):
+        """
+        True if depth levels have been decoded for every side.
+        """
+        return (self.depth is not None and
+                all(n >= self.depth for n in self.counts.values()))
+
+    def feed(self, text):
+        """
+        Scans the given chunk of the document, and returns all levels which
+        were completed by it.
+        :param text: str
+        :return: list of tuples of (side, level)
+        """
+        buf = self._buf[self._pos:] + text
+        pos = 0
+        levels = []
+        while True:
+            if self._side is None:
+                match = self._key_re.search(buf, pos)
+                if match is None:
+                    pos = max(pos, len(buf) - self._key_tail)
+                    break
+                self._side = self.sides[match.group(1)]
+                pos = match.end()
+
+            pos = _SEPARATORS.match(buf, pos).end()
+            if pos >= len(buf):
+                break
+            if buf[pos] == ']' or (self.depth is not None and
+                                   self.counts[self._side] >= self.depth):
+                # End of this side, or no more levels required; look for the
+                # next side's key
+                self._side = None
+                continue
+            try:
+                level, end = self._decoder.raw_decode(buf, pos)
+            except ValueError:
+                # Level is incomplete, wait for the next chunk
+                break
+            levels.append((self._side, level))
+            self.counts[self._side] += 1
+            pos = end
+
+        self._buf, self._pos = buf, pos
+        return levels
+
+
+def iter_order_book(response, sides, depth=None, chunk_size=64 * 1024):
+    """
+    Yields the price levels of an order book response, which must have been
+    requested with stream=True, as they arrive. The response is closed once
+    depth levels have been found for every side, or the body was read
+    completely.
+    :param response: requests.Response or APIResponse obj
+    :param sides: dict of JSON key: side name, i.e. {'buy': 'bids'}
+    :param depth: int, number of levels to yield per side, or None for all
+    :param chunk_size: int, number of bytes to read at once
+    :return: generator of tuples of (side, level)
+    """
+    scanner = OrderBookScanner(sides, depth)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for chunk in response.iter_content(chunk_size):
+            for level in scanner.feed(decoder.decode(chunk)):
+                yield level
+            if scanner.done:
+                return
+        if not any(scanner.counts.values()):
+            log.error("iter_order_book(): No levels found in response to %s, "
+                      "status code %s", response.url, response.status_code)
+    finally:
+        response.close()
@@ -1,7 +1,12 @@
-from bitex.api.WSS.bitfinex import BitfinexWSS
-from bitex.api.WSS.bitstamp import BitstampWSS
-from bitex.api.WSS.gdax import GDAXWSS
-from bitex.api.WSS.gemini import GeminiWSS
-from bitex.api.WSS.hitbtc import HitBTCWSS
-from bitex.api.WSS.okcoin import OKCoinWSS
-from bitex.api.WSS.poloniex import PoloniexWSS
+from bitex.lazy import lazy_attributes
+
+# Clients, and their websocket libraries, are imported on first access
+lazy_attributes(__name__, {
+    'BitfinexWSS': 'bitex.api.WSS.bitfinex',
+    'BitstampWSS': 'bitex.api.WSS.bitstamp',
+    'GDAXWSS': 'bitex.api.WSS.gdax',
+    'GeminiWSS': 'bitex.api.WSS.gemini',
+    'HitBTCWSS': 'bitex.api.WSS.hitbtc',
+    'OKCoinWSS': 'bitex.api.WSS.okcoin',
+    'PoloniexWSS': 'bitex.api.WSS.poloniex'
+})
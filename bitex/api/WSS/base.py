@@ -6,6 +6,7 @@ from threading import Thread
 # Import Third-Party
 
 # Import Homebrew
+from bitex.api.WSS.queues import DataQueue, BLOCK, conflation_key
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
@@ -35,11 +36,14 @@ class WSSAPI:
         self._controller_q = Queue()
 
         # Queue storing all received data
-        self.data_q = Queue()
+        self.data_q = DataQueue()
 
         # Internal Controller thread, responsible for starts / restarts / stops
         self._controller_thread = None
 
+        # CaptureWriter recording all received frames, if capturing
+        self.recorder = None
+
     def start(self):
         """
         Starts threads. Extend this in your child class.
@@ -61,6 +65,8 @@ class WSSAPI:
         """
         log.debug("WSSAPI.stop(): Stopping..")
         self.running = False
+        if self.recorder is not None:
+            self.recorder.flush()
 
     def restart(self):
         """
@@ -109,3 +115,158 @@ class WSSAPI:
 
     def get(self, **kwargs):
         return self.data_q.get(**kwargs)
+
+    def get_batch(self, max_items=None, timeout=None):
+        """
+        Returns up to max_items messages from data_q at once, waiting up to
+        timeout seconds for the first one.
+        :param max_items: int, or None for all queued messages
+        :param timeout: float, or None to wait indefinitely
+        :return: list of messages, oldest first
+        """
+        try:
+            get_batch = self.data_q.get_batch
+        except AttributeError:
+            # Plain queues, i.e. multiprocessing.Queue
+            items = []
+            try:
+                items.append(self.data_q.get(timeout=timeout))
+                while max_items is None or len(items) < max_items:
+                    items.append(self.data_q.get_nowait())
+            except Empty:
+                pass
+            return items
+        return get_batch(max_items, timeout=timeout)
+
+    def drain(self, max_items=None):
+        """
+        Returns up to max_items of the currently queued messages, without
+        waiting.
+        :param max_items: int, or None for all queued messages
+        :return: list of messages, oldest first
+        """
+        if not hasattr(self.data_q, 'get_batch'):
+            return self.get_batch(max_items, timeout=0)
+        return self.data_q.get_batch(max_items, block=False)
+
+    def conflation_key(self, item):
+        """
+        Returns the key by which messages of this client are conflated, or
+        None if the message must not be conflated; see
+        bitex.api.WSS.queues.conflation_key().
+        :param item: Message obj, as put on data_q
+        :return: hashable or None
+        """
+        return conflation_key(item)
+
+    def configure_queue(self, maxsize=0, policy=BLOCK, key=None):
+        """
+        Replaces data_q with a bounded DataQueue. Call this before start(),
+        or before adding the client to a WSSEngine.
+        Note that with the BLOCK policy, a full queue stalls the receiving
+        thread - or, if run by a WSSEngine, this client's connections, whose
+        messages the engine then processes in a worker thread.
+        :param maxsize: int, capacity; 0 for unbounded
+        :param policy: str, one of 'block', 'drop_oldest' or 'conflate'
+        :param key: callable, returning the conflation key of a message;
+                    defaults to self.conflation_key
+        :return: DataQueue obj
+        """
+        self.data_q = DataQueue(maxsize, policy, key or self.conflation_key)
+        return self.data_q
+
+    def capture(self, path, **kwargs):
+        """
+        Records all frames received from now on, with their receive
+        timestamps, to the given capture file; see bitex.api.WSS.capture.
+        :param path: str, appended to if it exists
+        :param kwargs: keyword arguments passed to CaptureWriter
+        :return: CaptureWriter obj
+        """
+        # Imported here, as most clients never capture
+        from bitex.api.WSS.capture import CaptureWriter
+        self.stop_capture()
+        self.recorder = CaptureWriter(path, **kwargs)
+        return self.recorder
+
+    def stop_capture(self):
+        """
+        Stops recording frames, and closes the capture file.
+        :return:
+        """
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+
+    def record(self, url, raw, ts):
+        """
+        Writes a received frame to the capture file, if capturing. Call this
+        for each frame, before processing it.
+        :param url: str
+        :param raw: str or bytes, frame as received
+        :param ts: timestamp, declares when data was received by the client
+        :return:
+        """
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.write(ts, url, raw)
+
+    ##
+    # Interface for bitex.api.WSS.engine.WSSEngine, which runs the
+    # connections of clients on a shared event loop instead of in threads
+    ##
+
+    @classmethod
+    def supports_engine(cls):
+        """
+        Returns whether this client implements the engine interface, which
+        requires overriding on_message() at least.
+        :return: bool
+        """
+        return cls.supports_replay()
+
+    @classmethod
+    def supports_replay(cls):
+        """
+        Returns whether this client overrides on_message(), to which
+        bitex.api.WSS.capture.replay() feeds captured frames.
+        :return: bool
+        """
+        return cls.on_message is not WSSAPI.on_message
+
+    def prepare(self):
+        """
+        Called before connecting, in the thread starting the client; load
+        anything the connection requires here, i.e. lists of symbols.
+        :return:
+        """
+        pass
+
+    def feed_urls(self):
+        """
+        Returns the urls of all websocket connections this client requires.
+        :return: list of str
+        """
+        return [self.addr]
+
+    def on_open(self, url, conn):
+        """
+        Called once the connection to url was established; send any required
+        subscriptions here.
+        :param url: str
+        :param conn: connection obj, offering send(str) and close()
+        :return:
+        """
+        pass
+
+    def on_message(self, url, raw, ts):
+        """
+        Called for each message received on the connection to url. Raise a
+        ConnectionError to have the engine reconnect. Clients which do not
+        override this are rejected by WSSEngine.add().
+        :param url: str
+        :param raw: str, message as received
+        :param ts: timestamp, declares when data was received by the client
+        :return:
+        """
+        pass
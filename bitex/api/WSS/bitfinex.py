@@ -5,6 +5,7 @@ import time
 import queue
 import threading
 from threading import Thread
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
 
 # Import Third-Party
 from websocket import create_connection, WebSocketTimeoutException
@@ -12,6 +13,11 @@ from websocket import WebSocketConnectionClosedException
 
 # Import Homebrew
 from bitex.api.WSS.base import WSSAPI
+from bitex.api.WSS.messages import Ticker, BookSnapshot, BookDelta, Trade
+from bitex.api.WSS.messages import Candle, AccountEvent
+from bitex.api.WSS.orderbook import L2Book, L3Book
+from bitex.api.WSS.sequence import SequenceTracker, GAP, OUT_OF_ORDER
+from bitex.utils import json_loads
 
 # import Server-side Exceptions
 from bitex.api.WSS.exceptions import InvalidBookLengthError, GenericSubscriptionError
@@ -36,12 +42,17 @@ class BitfinexWSS(WSSAPI):
     the Server issues a connection reset.
     """
 
-    def __init__(self, pairs=None):
+    # Executors available as parse stage
+    parsers = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+
+    def __init__(self, pairs=None, parser='inline', parse_workers=2):
         """
         Initializes BitfinexWSS Instance.
-        :param key: Api Key as string
-        :param secret: Api secret as string
-        :param addr: Websocket API Address
+        :param pairs: list of pairs to subscribe to
+        :param parser: str, where received messages are decoded - 'inline'
+                       (in the processing thread), 'thread' or 'process' (in
+                       a pool of parse_workers threads or processes)
+        :param parse_workers: int, number of workers of the parse pool
         """
         super(BitfinexWSS, self).__init__('wss://api.bitfinex.com/ws/2', 'Bitfinex')
         self.conn = None
@@ -52,13 +63,31 @@ class BitfinexWSS(WSSAPI):
                           'ZECUSD', 'ZECBTC', 'XMRUSD', 'XMRBTC', 'LTCUSD',
                           'LTCBTC', 'DSHUSD', 'DSHBTC']
 
-        # Set up variables for receiver and main loop threads
-        self._receiver_lock = threading.Lock()
-        self._processor_lock = threading.Lock()
+        # Set up variables for receiver and main loop threads; both block
+        # until there is work to do. The receiver waits while _unpaused is
+        # cleared; the processor is woken up on stop() by a None item.
+        self._unpaused = threading.Event()
+        self._unpaused.set()
         self.receiver_q = queue.Queue()
         self.receiver_thread = None
         self.processing_thread = None
 
+        # Heartbeats and pings are checked by a timer thread, every
+        # timer_interval seconds
+        self.timer_interval = 1.0
+        self.timer_thread = None
+        self._timer_stopped = threading.Event()
+
+        # The receiver only reads and timestamps frames; decoding happens
+        # either in the processing thread or in a pool, whose futures are
+        # queued in the order their frames were received.
+        if parser != 'inline' and parser not in self.parsers:
+            raise ValueError("parser must be one of 'inline', %s" %
+                             ', '.join(sorted(self.parsers)))
+        self.parser = parser
+        self.parse_workers = parse_workers
+        self._parse_pool = None
+
         self.ping_timer = None
         self.timeout = 5
         self._heartbeats = {}
@@ -72,6 +101,16 @@ class BitfinexWSS(WSSAPI):
         self.channel_configs = {}  # Variables, as set by subscribe command
         self.wss_config = {}  # Config as passed by 'config' command
 
+        # If sequencing is enabled via config(), the connection's sequence
+        # numbers are checked; a gap causes a restart, re-subscribing to all
+        # channels, which refreshes all order books.
+        self.sequencing = False
+        self.sequences = SequenceTracker(self.name)
+
+        # Local order books, maintained from the book and raw_book channels
+        self.books = {}  # Dict of pair: L2Book
+        self.raw_books = {}  # Dict of pair: L3Book
+
         self._event_handlers = {'error': self._raise_error,
                                 'unsubscribed': self._handle_unsubscribed,
                                 'subscribed': self._handle_subscribed,
@@ -124,15 +163,15 @@ class BitfinexWSS(WSSAPI):
         :param ts: timestamp, declares when data was received by the client
         :return:
         """
-        for chan_id in self._heartbeats:
-            if ts - self._heartbeats[chan_id] >= 10:
+        for chan_id, last_heartbeat in list(self._heartbeats.items()):
+            if ts - last_heartbeat >= 10:
                 if chan_id not in self._late_heartbeats:
                     try:
                         # This is newly late; escalate
                         log.warning("BitfinexWSS.heartbeats: Channel %s hasn't "
                                     "sent a heartbeat in %s seconds!",
                                     self.channel_labels[chan_id],
-                                    ts - self._heartbeats[chan_id])
+                                    ts - last_heartbeat)
                         self._late_heartbeats[chan_id] = ts
                     except KeyError:
                         # This channel ID Is not known to us - log and raise
@@ -163,12 +202,40 @@ class BitfinexWSS(WSSAPI):
         if time.time() - self.ping_timer > self.timeout:
             raise TimeoutError("Ping Command timed out!")
 
+    def _check_timers(self):
+        """
+        Thread func, checking heartbeats and pending pings periodically.
+        :return:
+        """
+        while not self._timer_stopped.wait(self.timer_interval):
+            if not self.conn:
+                # The connection was killed - initiate restart
+                self._controller_q.put('restart')
+                continue
+            if self.ping_timer:
+                try:
+                    self._check_ping()
+                except TimeoutError:
+                    log.exception("BitfinexWSS.ping(): TimedOut! (%ss)" %
+                                  self.ping_timer)
+                    self.ping_timer = None
+                    self._controller_q.put('restart')
+                    continue
+            try:
+                self._check_heartbeats(time.time())
+            except UnknownChannelError:
+                self._controller_q.put('restart')
+            except (WebSocketConnectionClosedException, ConnectionResetError,
+                    AttributeError):
+                log.exception("BitfinexWSS.ping(): Connection Error!")
+                self._controller_q.put('restart')
+
     def pause(self):
         """
         Pauses the client
         :return:
         """
-        self._receiver_lock.acquire()
+        self._unpaused.clear()
         log.info("BitfinexWSS.pause(): Pausing client..")
 
     def unpause(self):
@@ -176,7 +243,7 @@ class BitfinexWSS(WSSAPI):
         Unpauses the client
         :return:
         """
-        self._receiver_lock.release()
+        self._unpaused.set()
         log.info("BitfinexWSS.pause(): Unpausing client..")
 
     def start(self):
@@ -186,6 +253,11 @@ class BitfinexWSS(WSSAPI):
         """
         super(BitfinexWSS, self).start()
 
+        if self.parser != 'inline' and self._parse_pool is None:
+            log.info("BitfinexWSS.start(): Starting %s parse workers..",
+                     self.parse_workers)
+            self._parse_pool = self.parsers[self.parser](self.parse_workers)
+
         log.info("BitfinexWSS.start(): Initializing Websocket connection..")
         while self.conn is None:
             try:
@@ -210,6 +282,13 @@ class BitfinexWSS(WSSAPI):
             log.info("BitfinexWSS.start(): Thread not started! "
                      "self.processing_thread is populated!")
 
+        log.info("BitfinexWSS.start(): Initializing timer thread..")
+        if not self.timer_thread:
+            self._timer_stopped.clear()
+            self.timer_thread = Thread(target=self._check_timers,
+                                       name='Timer Thread', daemon=True)
+            self.timer_thread.start()
+
         self.setup_subscriptions()
 
     def stop(self):
@@ -221,21 +300,10 @@ class BitfinexWSS(WSSAPI):
 
         log.info("BitfinexWSS.stop(): Stopping client..")
 
-        log.info("BitfinexWSS.stop(): Joining receiver thread..")
-        try:
-            self.receiver_thread.join()
-            if self.receiver_thread.is_alive():
-                time.time(1)
-        except AttributeError:
-            log.debug("BitfinexWSS.stop(): Receiver thread was not running!")
-
-        log.info("BitfinexWSS.stop(): Joining processing thread..")
-        try:
-            self.processing_thread.join()
-            if self.processing_thread.is_alive():
-                time.time(1)
-        except AttributeError:
-            log.debug("BitfinexWSS.stop(): Processing thread was not running!")
+        # Wake up all threads; stopping ends a pause
+        self._timer_stopped.set()
+        self._unpaused.set()
+        self.receiver_q.put(None)
 
         log.info("BitfinexWSS.stop(): Closing websocket conection..")
         try:
@@ -246,9 +314,22 @@ class BitfinexWSS(WSSAPI):
             # Connection is None
             pass
 
+        for name in ('receiver_thread', 'processing_thread', 'timer_thread'):
+            log.info("BitfinexWSS.stop(): Joining %s..", name)
+            try:
+                getattr(self, name).join()
+            except AttributeError:
+                log.debug("BitfinexWSS.stop(): %s was not running!", name)
+
         self.conn = None
         self.processing_thread = None
         self.receiver_thread = None
+        self.timer_thread = None
+
+        if self._parse_pool is not None:
+            log.info("BitfinexWSS.stop(): Shutting down parse workers..")
+            self._parse_pool.shutdown(wait=False)
+            self._parse_pool = None
 
         log.info("BitfinexWSS.stop(): Done!")
 
@@ -264,14 +345,25 @@ class BitfinexWSS(WSSAPI):
         # cache channel labels temporarily if soft == True
         channel_labels = [self.channel_labels[k] for k in self.channel_labels] if soft else None
 
-        # clear previous channel caches
+        self._resubscribe(channel_labels)
+
+    def _resubscribe(self, channel_labels):
+        """
+        Clears all channel caches, and subscribes to the given channels again.
+        :param channel_labels: list of (channel name, kwargs) tuples, as
+                               stored in self.channel_labels, or None
+        :return:
+        """
         self.channels = {}
         self.channel_labels = {}
         self.channel_states = {}
+        self.sequences.clear()
 
         if channel_labels:
-            # re-subscribe to channels
             for channel_name, kwargs in channel_labels:
+                # raw books are subscribed to via the book channel
+                if channel_name == 'raw_book':
+                    channel_name = 'book'
                 self._subscribe(channel_name, **kwargs)
 
     def receive(self):
@@ -281,28 +373,44 @@ class BitfinexWSS(WSSAPI):
         :return:
         """
         while self.running:
-            if self._receiver_lock.acquire(blocking=False):
-                try:
-                    raw = self.conn.recv()
-                except WebSocketTimeoutException:
-                    self._receiver_lock.release()
-                    continue
-                except WebSocketConnectionClosedException:
-                    # this needs to restart the client, while keeping track
-                    # of the currently subscribed channels!
+            self._unpaused.wait()
+            try:
+                raw = self.conn.recv()
+            except WebSocketTimeoutException:
+                continue
+            except (WebSocketConnectionClosedException, AttributeError):
+                # this needs to restart the client, while keeping track
+                # of the currently subscribed channels!
+                if self.running:
                     self.conn = None
                     self._controller_q.put('restart')
-                except AttributeError:
-                    # self.conn is None, idle loop until shutdown of thread
-                    self._receiver_lock.release()
-                    continue
-                msg = time.time(), json.loads(raw)
-                log.debug("receiver Thread: Data Received: %s", msg)
-                self.receiver_q.put(msg)
-                self._receiver_lock.release()
-            else:
-                # The receiver_lock was locked, idling until available
-                time.sleep(0.5)
+                return
+            ts = time.time()
+            self.record(self.addr, raw, ts)
+            self._enqueue(ts, raw)
+
+    def _enqueue(self, ts, raw):
+        """
+        Puts a received frame on the receiver queue - submitted to the parse
+        pool, if there is one.
+        :param ts: timestamp, declares when data was received by the client
+        :param raw: str, message as received
+        :return:
+        """
+        if self._parse_pool is not None:
+            raw = self._parse_pool.submit(json_loads, raw)
+        self.receiver_q.put((ts, raw))
+
+    @staticmethod
+    def _decode(payload):
+        """
+        Returns the decoded message of a receiver queue item.
+        :param payload: str or Future obj
+        :return: list or dict
+        """
+        if isinstance(payload, Future):
+            return payload.result()
+        return json_loads(payload)
 
     def process(self):
         """
@@ -312,56 +420,64 @@ class BitfinexWSS(WSSAPI):
         """
 
         while self.running:
-            if self._processor_lock.acquire(blocking=False):
+            item = self.receiver_q.get()
+            if item is None:
+                # Woken up by stop()
+                continue
+            ts, data = item
+            self._process_message(ts, self._decode(data))
 
-                if self.ping_timer:
-                    try:
-                        self._check_ping()
-                    except TimeoutError:
-                        log.exception("BitfinexWSS.ping(): TimedOut! (%ss)" %
-                                      self.ping_timer)
-                    except (WebSocketConnectionClosedException,
-                            ConnectionResetError):
-                        log.exception("BitfinexWSS.ping(): Connection Error!")
-                        self.conn = None
-                if not self.conn:
-                    # The connection was killed - initiate restart
-                    self._controller_q.put('restart')
+    def _process_message(self, ts, data):
+        """
+        Passes a decoded message to handle_data() or handle_response().
+        :param ts: timestamp, declares when data was received by the client
+        :param data: list or dict, the decoded message
+        :return:
+        """
+        log.debug("Processing Data: %s", data)
+        if isinstance(data, list):
+            self.handle_data(ts, data)
+        else:  # Not a list, hence it could be a response
+            try:
+                self.handle_response(ts, data)
+            except UnknownEventError:
+
+                # We don't know what event this is- Raise an
+                # error & log data!
+                log.exception("main() - UnknownEventError: %s", data)
+                log.info("main() - Shutting Down due to Unknown Error!")
+                self._controller_q.put('stop')
+            except ConnectionResetError:
+                log.info("processor Thread: Connection Was reset, "
+                         "initiating restart")
+                self._controller_q.put('restart')
+
+    def on_open(self, url, conn):
+        self.conn = conn
+        if self.channel_labels:
+            # Reconnected - subscribe to the previous channels again
+            channel_labels = list(self.channel_labels.values())
+            if self.wss_config:
+                self.config(**self.wss_config)
+            self._resubscribe(channel_labels)
+        else:
+            self.setup_subscriptions()
 
-                skip_processing = False
+    def on_message(self, url, raw, ts):
+        self._process_message(ts, json_loads(raw))
+        self._check_heartbeats(ts)
 
-                try:
-                    ts, data = self.receiver_q.get(timeout=0.1)
-                except queue.Empty:
-                    skip_processing = True
-                    ts = time.time()
-                    data = None
-
-                if not skip_processing:
-                    log.debug("Processing Data: %s", data)
-                    if isinstance(data, list):
-                        self.handle_data(ts, data)
-                    else:  # Not a list, hence it could be a response
-                        try:
-                            self.handle_response(ts, data)
-                        except UnknownEventError:
-
-                            # We don't know what event this is- Raise an
-                            # error & log data!
-                            log.exception("main() - UnknownEventError: %s",
-                                          data)
-                            log.info("main() - Shutting Down due to "
-                                     "Unknown Error!")
-                            self._controller_q.put('stop')
-                        except ConnectionResetError:
-                            log.info("processor Thread: Connection Was reset, "
-                                     "initiating restart")
-                            self._controller_q.put('restart')
-
-                self._check_heartbeats(ts)
-                self._processor_lock.release()
-            else:
-                time.sleep(0.5)
+        # Commands issued by handlers are executed by the engine
+        while True:
+            try:
+                cmd = self._controller_q.get_nowait()
+            except queue.Empty:
+                break
+            if cmd == 'restart':
+                raise ConnectionResetError("Restart requested")
+            elif cmd == 'stop':
+                self.running = False
+                raise ConnectionAbortedError("Stop requested")
 
     ##
     # Response Message Handlers
@@ -537,6 +653,20 @@ class BitfinexWSS(WSSAPI):
         except ValueError as e:
             # Too many or too few values
             raise FaultyPayloadError("handle_data(): %s - %s" % (msg, e))
+        if self.sequencing:
+            # Public sequence number is appended, followed by the private
+            # one on the account channel
+            if chan_id == 0:
+                seq = data[-2]
+                del data[-2:]
+            else:
+                seq = data.pop()
+            result = self.sequences.check('public', seq)
+            if result == OUT_OF_ORDER:
+                return
+            elif result == GAP:
+                self._controller_q.put('restart')
+                return
         self._heartbeats[chan_id] = ts
         if data[0] == 'hb':
             self._handle_hearbeat(ts, chan_id)
@@ -567,32 +697,46 @@ class BitfinexWSS(WSSAPI):
         :return:
         """
         pair = self.channel_labels[chan_id][1]['pair']
-        entry = (*data, ts)
-        self.data_q.put(('ticker', pair, entry))
+        self.data_q.put(Ticker(self.name, 'ticker', pair, data[0], ts))
 
     def _handle_book(self, ts, chan_id, data):
         """
-        Updates the order book stored in self.books[chan_id]
+        Updates the order book stored in self.books[pair], and puts the data
+        on the data queue.
         :param ts: timestamp, declares when data was received by the client
         :param chan_id: int, channel id
         :param data: dict, tuple or list of data received via wss
         :return:
         """
         pair = self.channel_labels[chan_id][1]['pair']
-        entry = data, ts
-        self.data_q.put(('order_book', pair, entry))
+        try:
+            book = self.books[pair]
+        except KeyError:
+            book = self.books[pair] = L2Book(pair)
+        book.update(data[0], ts)
+        self.data_q.put(self._book_message('book', pair, data[0], ts))
 
     def _handle_raw_book(self, ts, chan_id, data):
         """
-        Updates the raw order books stored in self.raw_books[chan_id]
+        Updates the raw order book stored in self.raw_books[pair], and puts
+        the data on the data queue.
         :param ts: timestamp, declares when data was received by the client
         :param chan_id: int, channel id
         :param data: dict, tuple or list of data received via wss
         :return:
         """
         pair = self.channel_labels[chan_id][1]['pair']
-        entry = data, ts
-        self.data_q.put(('raw_order_book', pair, entry))
+        try:
+            book = self.raw_books[pair]
+        except KeyError:
+            book = self.raw_books[pair] = L3Book(pair)
+        book.update(data[0], ts)
+        self.data_q.put(self._book_message('raw_book', pair, data[0], ts))
+
+    def _book_message(self, channel, pair, data, ts):
+        if not data or isinstance(data[0], (list, tuple)):
+            return BookSnapshot(self.name, channel, pair, data, ts)
+        return BookDelta(self.name, channel, pair, data, ts)
 
     def _handle_trades(self, ts, chan_id, data):
         """
@@ -603,8 +747,7 @@ class BitfinexWSS(WSSAPI):
         :return:
         """
         pair = self.channel_labels[chan_id][1]['pair']
-        entry = data, ts
-        self.data_q.put(('trades', pair, entry))
+        self.data_q.put(Trade(self.name, 'trades', pair, data, ts))
 
     def _handle_candles(self, ts, chan_id, data):
         """
@@ -615,8 +758,7 @@ class BitfinexWSS(WSSAPI):
         :return:
         """
         pair = self.channel_labels[chan_id][1]['key'].split(':')[-1][1:]
-        entry = data, ts
-        self.data_q.put(('ohlc', pair, entry))
+        self.data_q.put(Candle(self.name, 'candles', pair, data[0], ts))
 
     def _handle_auth(self, ts, chan_id, data):
         keys = {'hts': self._handle_auth_trades,
@@ -662,48 +804,37 @@ class BitfinexWSS(WSSAPI):
             raise
 
     def _handle_auth_trades(self, ts, data):
-        entry = data, ts
-        self.data_q.put(('account_trades', 'NA', entry))
+        self.data_q.put(AccountEvent(self.name, 'account_trades', None, data, ts))
 
     def _handle_auth_positions(self, ts, data):
-        entry = data, ts
-        self.data_q.put(('account_positions', 'NA', entry))
+        self.data_q.put(AccountEvent(self.name, 'account_positions', None, data, ts))
 
     def _handle_auth_orders(self, ts, data):
-        entry = data, ts
-        self.data_q.put(('account_orders', 'NA', entry))
+        self.data_q.put(AccountEvent(self.name, 'account_orders', None, data, ts))
 
     def _handle_auth_wallet(self, ts, data):
-        entry = data, ts
-        self.data_q.put(('account_wallet', 'NA', entry))
+        self.data_q.put(AccountEvent(self.name, 'account_wallet', None, data, ts))
 
     def _handle_auth_balance(self, ts, data):
-        entry = data, ts
-        self.data_q.put(('account_balance', 'NA', entry))
+        self.data_q.put(AccountEvent(self.name, 'account_balance', None, data, ts))
 
     def _handle_auth_margin_info(self, ts, data):
-        entry = data, ts
-        self.data_q.put(('account_margin_info', 'NA', entry))
+        self.data_q.put(AccountEvent(self.name, 'account_margin_info', None, data, ts))
 
     def _handle_auth_funding_info(self, ts, data):
-        entry = data, ts
-        self.data_q.put(('account_funding_info', 'NA', entry))
+        self.data_q.put(AccountEvent(self.name, 'account_funding_info', None, data, ts))
 
     def _handle_auth_offers(self, ts, data):
-        entry = data, ts
-        self.data_q.put(('account_offers', 'NA', entry))
+        self.data_q.put(AccountEvent(self.name, 'account_offers', None, data, ts))
 
     def _handle_auth_credits(self, ts, data):
-        entry = data, ts
-        self.data_q.put(('account_credits', 'NA', entry))
+        self.data_q.put(AccountEvent(self.name, 'account_credits', None, data, ts))
 
-    def _handle_auth_loans(self, event, data):
-        entry = data, time.time()
-        self.data_q.put(('account_loans', 'NA', entry))
+    def _handle_auth_loans(self, ts, data):
+        self.data_q.put(AccountEvent(self.name, 'account_loans', None, data, ts))
 
-    def _handle_auth_funding_trades(self, event, data):
-        entry = data, time.time()
-        self.data_q.put(('account_funding_trades', 'NA', entry))
+    def _handle_auth_funding_trades(self, ts, data):
+        self.data_q.put(AccountEvent(self.name, 'account_funding_trades', None, data, ts))
 
     ##
     # Commands
@@ -749,6 +880,11 @@ class BitfinexWSS(WSSAPI):
             flags += 65536
         payload = {'event': 'conf', 'flags': flags}
         payload.update(kwargs)
+        self.wss_config = dict(decimals_as_strings=decimals_as_strings,
+                               ts_as_dates=ts_as_dates, sequencing=sequencing,
+                               **kwargs)
+        self.sequencing = sequencing
+        self.sequences.clear()
         self.send(payload)
 
     def _subscribe(self, channel_name, **kwargs):
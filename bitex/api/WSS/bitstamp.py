@@ -1,11 +1,15 @@
 # Import Built-Ins
+import json
 import logging
+import time
 
 # Import Third-Party
 import pusherclient
 
 # Import Homebrew
 from bitex.api.WSS.base import WSSAPI
+from bitex.api.WSS.messages import Trade, BookSnapshot, BookDelta
+from bitex.utils import json_loads
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
@@ -71,6 +75,9 @@ class BitstampWSS(WSSAPI):
         :return:
         """
         super(BitstampWSS, self).start()
+        if self.recorder is not None:
+            log.warning("BitstampWSS.start(): pusherclient does not expose "
+                        "frames - run the client by a WSSEngine to capture!")
 
         self.pusher = pusherclient.Pusher(self.addr, **self.__pusher_options)
         self.pusher.connection.bind('pusher:connection_established',
@@ -81,6 +88,45 @@ class BitstampWSS(WSSAPI):
         super(BitstampWSS, self).stop()
         self.pusher = None
 
+    """
+    WSSEngine Interface - speaks the pusher protocol directly, instead of
+    using pusherclient's connection thread
+    """
+
+    # Channel types, mapped to the callback and events of their channels;
+    # diff_order_book must be matched before order_book.
+    _channel_types = (('diff_order_book', 'diff_order_book_callback', ('data',)),
+                      ('order_book', 'order_book_callback', ('data',)),
+                      ('live_trades', 'live_trades_callback', ('trade',)),
+                      ('live_orders', 'live_orders_callback',
+                       ('order_created', 'order_changed', 'order_deleted')))
+
+    def feed_urls(self):
+        return ['wss://ws.pusherapp.com/app/%s?protocol=7&client=bitex'
+                '&version=1.0' % self.addr]
+
+    def on_open(self, url, conn):
+        self.pusher = conn
+        for channel_name in self.channels:
+            conn.send(json.dumps({'event': 'pusher:subscribe',
+                                  'data': {'channel': channel_name}}))
+
+    def on_message(self, url, raw, ts):
+        msg = json_loads(raw)
+        event = msg.get('event')
+        if event == 'pusher:ping':
+            self.pusher.send(json.dumps({'event': 'pusher:pong', 'data': {}}))
+            return
+        channel_name = msg.get('channel')
+        if channel_name not in self.channels:
+            return
+        for channel_type, callback, events in self._channel_types:
+            if channel_name.startswith(channel_type):
+                if event in events:
+                    pair = channel_name[len(channel_type) + 1:] or 'btcusd'
+                    getattr(self, callback)(pair.upper(), msg.get('data'))
+                return
+
     """
     Custom Callbacks
     """
@@ -94,7 +140,8 @@ class BitstampWSS(WSSAPI):
         :param data:
         :return:
         """
-        self.data_q.put(('live_trades', pair, data))
+        self.data_q.put(Trade(self.name, 'live_trades', pair,
+                              json_loads(data), time.time()))
 
     def btcusd_lt_callback(self, data):
         self.live_trades_callback('BTCUSD', data)
@@ -125,7 +172,8 @@ class BitstampWSS(WSSAPI):
         :param data:
         :return:
         """
-        self.data_q.put(('order_book', pair, data))
+        self.data_q.put(BookSnapshot(self.name, 'order_book', pair,
+                                     json_loads(data), time.time()))
 
     def btcusd_ob_callback(self, data):
         self.order_book_callback('BTCUSD', data)
@@ -157,7 +205,8 @@ class BitstampWSS(WSSAPI):
         :param data:
         :return:
         """
-        self.data_q.put(('diff_order_book', pair, data))
+        self.data_q.put(BookDelta(self.name, 'diff_order_book', pair,
+                                  json_loads(data), time.time()))
 
     def btcusd_dob_callback(self, data):
         self.diff_order_book_callback('BTCUSD', data)
@@ -189,7 +238,8 @@ class BitstampWSS(WSSAPI):
         :param data:
         :return:
         """
-        self.data_q.put(('live_orders', pair, data))
+        self.data_q.put(BookDelta(self.name, 'live_orders', pair,
+                                  json_loads(data), time.time()))
 
     def btcusd_lo_callback(self, data):
         self.live_orders_callback('BTCUSD', data)
@@ -0,0 +1,305 @@
+"""
+Capture files of raw websocket frames, and a driver replaying them through
+a client.
+
+A capture file starts with MAGIC, followed by any number of chunks: a
+CHUNK_HEADER (compressed size, number of frames, first and last receive
+timestamp) and the zlib-compressed frames. Each frame is a FRAME_HEADER
+(receive timestamp, binary flag, length of url and of data), followed by the
+url and the data. Chunks are only ever appended. The sidecar file at
+path + '.idx' holds an INDEX_ENTRY per chunk (offset, size, number of frames,
+first and last timestamp), hence readers seek straight to the chunks of a
+time range; it is rebuilt from the capture file if missing or out of date.
+
+    wss = BitfinexWSS()
+    wss.capture('btcusd.cap')
+    wss.start()
+    ...
+    wss.stop()
+
+    stats = replay(BitfinexWSS(), 'btcusd.cap', speed=None)
+"""
+# Import Built-Ins
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_left
+from collections import namedtuple
+
+# Import Third-Party
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+MAGIC = b'BTXCAP\x00\x01'
+CHUNK_HEADER = struct.Struct('<IIdd')
+FRAME_HEADER = struct.Struct('<dBHI')
+INDEX_ENTRY = struct.Struct('<QIIdd')
+
+IndexEntry = namedtuple('IndexEntry', ['offset', 'size', 'count', 'first_ts',
+                                       'last_ts'])
+
+
+def index_path(path):
+    return path + '.idx'
+
+
+def scan_chunks(f):
+    """
+    Reads the headers of all complete chunks of a capture file.
+    :param f: file obj, opened in binary mode
+    :raises ValueError: if f is not a capture file
+    :return: list of IndexEntry objs
+    """
+    f.seek(0)
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a capture file!")
+    entries = []
+    file_size = os.fstat(f.fileno()).st_size
+    offset = len(MAGIC)
+    while offset + CHUNK_HEADER.size <= file_size:
+        f.seek(offset)
+        size, count, first_ts, last_ts = CHUNK_HEADER.unpack(
+            f.read(CHUNK_HEADER.size))
+        if offset + CHUNK_HEADER.size + size > file_size:
+            break  # Truncated by a crash while writing
+        entries.append(IndexEntry(offset, size, count, first_ts, last_ts))
+        offset += CHUNK_HEADER.size + size
+    return entries
+
+
+def load_index(path):
+    """
+    Returns the index of a capture file, rebuilding its sidecar file if it
+    does not cover all complete chunks.
+    :param path: str, path of the capture file
+    :return: list of IndexEntry objs
+    """
+    try:
+        with open(index_path(path), 'rb') as f:
+            entries = [IndexEntry(*e) for e in
+                       INDEX_ENTRY.iter_unpack(f.read())]
+    except (OSError, struct.error):
+        entries = []
+    end = (entries[-1].offset + CHUNK_HEADER.size + entries[-1].size
+           if entries else len(MAGIC))
+    if end == os.path.getsize(path):
+        return entries
+    log.info("load_index(): Rebuilding index of %s", path)
+    with open(path, 'rb') as f:
+        entries = scan_chunks(f)
+    with open(index_path(path), 'wb') as f:
+        f.write(b''.join(INDEX_ENTRY.pack(*e) for e in entries))
+    return entries
+
+
+class CaptureWriter:
+    """
+    Appends frames to a capture file, compressing them in chunks. Thread-safe.
+    """
+    def __init__(self, path, chunk_frames=4096, chunk_bytes=2 ** 20,
+                 max_delay=5.0, level=6):
+        """
+        Initialize Object.
+        :param path: str, path of the capture file; appended to if it exists
+        :param chunk_frames: int, write a chunk once it holds this many frames
+        :param chunk_bytes: int, ... or this many uncompressed bytes
+        :param max_delay: float, ... or its first frame is this many seconds
+                          old, as checked on each write
+        :param level: int, zlib compression level
+        """
+        self.path = path
+        self.chunk_frames = chunk_frames
+        self.chunk_bytes = chunk_bytes
+        self.max_delay = max_delay
+        self.level = level
+        self.frames = 0
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._buffered_frames = self._buffered_bytes = 0
+        self._first_ts = self._last_ts = None
+
+        if os.path.exists(path) and os.path.getsize(path):
+            # Drop a chunk left incomplete by a crash, and bring the index
+            # up to date, before appending to it
+            entries = load_index(path)
+            end = (entries[-1].offset + CHUNK_HEADER.size + entries[-1].size
+                   if entries else len(MAGIC))
+            if end < os.path.getsize(path):
+                log.warning("CaptureWriter: Truncating incomplete chunk of %s",
+                            path)
+                os.truncate(path, end)
+        self._file = open(path, 'ab')
+        if not self._file.tell():
+            self._file.write(MAGIC)
+            open(index_path(path), 'wb').close()
+        self._index = open(index_path(path), 'ab')
+
+    def write(self, ts, url, raw):
+        """
+        Adds a frame to the current chunk.
+        :param ts: timestamp, declares when data was received by the client
+        :param url: str, url of the connection the frame was received on
+        :param raw: str or bytes, frame as received
+        :return:
+        """
+        binary = isinstance(raw, bytes)
+        data = raw if binary else raw.encode('utf-8')
+        url = url.encode('utf-8')
+        with self._lock:
+            if self._file is None:
+                return
+            self._buffer.append(FRAME_HEADER.pack(ts, binary, len(url),
+                                                  len(data)))
+            self._buffer.append(url)
+            self._buffer.append(data)
+            self._buffered_frames += 1
+            self._buffered_bytes += FRAME_HEADER.size + len(url) + len(data)
+            if self._first_ts is None:
+                self._first_ts = ts
+            self._last_ts = ts
+            if (self._buffered_frames >= self.chunk_frames or
+                    self._buffered_bytes >= self.chunk_bytes or
+                    ts - self._first_ts >= self.max_delay):
+                self._write_chunk()
+
+    def _write_chunk(self):
+        if not self._buffer:
+            return
+        count = self._buffered_frames
+        payload = zlib.compress(b''.join(self._buffer), self.level)
+        offset = self._file.tell()
+        self._file.write(CHUNK_HEADER.pack(len(payload), count, self._first_ts,
+                                           self._last_ts))
+        self._file.write(payload)
+        self._file.flush()
+        self._index.write(INDEX_ENTRY.pack(offset, len(payload), count,
+                                           self._first_ts, self._last_ts))
+        self._index.flush()
+        self.frames += count
+        self._buffer = []
+        self._buffered_frames = self._buffered_bytes = 0
+        self._first_ts = self._last_ts = None
+
+    def flush(self):
+        """
+        Writes all buffered frames as a chunk.
+        :return:
+        """
+        with self._lock:
+            if self._file is not None:
+                self._write_chunk()
+
+    def close(self):
+        """
+        Writes all buffered frames and closes the file.
+        :return:
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            self._write_chunk()
+            self._file.close()
+            self._index.close()
+            self._file = self._index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CaptureReader:
+    """
+    Reads the frames of a capture file.
+    """
+    def __init__(self, path):
+        """
+        Initialize Object.
+        :param path: str, path of the capture file
+        """
+        self.path = path
+        self.chunks = load_index(path)
+        self._last_ts = [chunk.last_ts for chunk in self.chunks]
+
+    def __len__(self):
+        return sum(chunk.count for chunk in self.chunks)
+
+    def __iter__(self):
+        return self.frames()
+
+    def frames(self, start=None, end=None):
+        """
+        Yields the frames received between start and end, in the order they
+        were written. Only chunks overlapping the time range are read.
+        :param start: timestamp, or None to start at the first frame
+        :param end: timestamp, or None to stop at the last frame
+        :return: generator of tuples of (ts, url, raw)
+        """
+        first = 0 if start is None else bisect_left(self._last_ts, start)
+        with open(self.path, 'rb') as f:
+            for chunk in self.chunks[first:]:
+                if end is not None and chunk.first_ts > end:
+                    return
+                f.seek(chunk.offset + CHUNK_HEADER.size)
+                payload = zlib.decompress(f.read(chunk.size))
+                pos = 0
+                for _ in range(chunk.count):
+                    ts, binary, url_len, data_len = FRAME_HEADER.unpack_from(
+                        payload, pos)
+                    pos += FRAME_HEADER.size
+                    url = payload[pos:pos + url_len].decode('utf-8')
+                    pos += url_len
+                    raw = payload[pos:pos + data_len]
+                    pos += data_len
+                    if start is not None and ts < start:
+                        continue
+                    if end is not None and ts > end:
+                        return
+                    yield ts, url, raw if binary else raw.decode('utf-8')
+
+
+def replay(client, path, speed=None, start=None, end=None):
+    """
+    Feeds the frames of a capture file to client.on_message(), as if they had
+    just been received - hence they take the same paths as live data, and
+    end up on client.data_q.
+    A ConnectionError raised by the client, on which it would be reconnected
+    if live, is logged and replay continues.
+    :param client: WSSAPI obj
+    :param path: str, path of the capture file
+    :param speed: float, 1 for the original speed, 10 for ten times that; or
+                  None to replay frames as fast as possible
+    :param start: timestamp, replay frames received since then only
+    :param end: timestamp, replay frames received until then only
+    :raises TypeError: if the client does not implement on_message()
+    :return: dict of the number of frames, seconds taken and frames / second
+    """
+    if not client.supports_replay():
+        raise TypeError("replay(): %s does not implement on_message()!" %
+                        client.__class__.__name__)
+    frames = 0
+    began = time.monotonic()
+    first_ts = None
+    for ts, url, raw in CaptureReader(path).frames(start, end):
+        if speed is not None:
+            if first_ts is None:
+                first_ts = ts
+            delay = (ts - first_ts) / speed - (time.monotonic() - began)
+            if delay > 0:
+                time.sleep(delay)
+        try:
+            client.on_message(url, raw, ts)
+        except ConnectionError as e:
+            log.info("replay(): %s requested a reconnect: %s", client.name, e)
+        frames += 1
+    seconds = time.monotonic() - began
+    return {'frames': frames, 'seconds': seconds,
+            'rate': frames / seconds if seconds else float('inf')}
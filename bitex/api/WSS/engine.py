@@ -0,0 +1,272 @@
+"""
+Runs the websocket connections of any number of WSSAPI clients on a single
+asyncio event loop, in one thread - instead of one or more threads per client.
+
+Clients take part by implementing WSSAPI's engine interface: feed_urls(),
+on_open() and on_message(). The engine connects to each url, calls on_open()
+once connected, and passes every received message to on_message(). Lost
+connections are re-established automatically, as long as the client is
+running.
+
+on_message() runs on the event loop, unless putting to the client's data_q
+may block (a bounded queue with the BLOCK policy): the client's messages are
+then processed by a worker thread of its own, so that a full queue only
+pauses reading from this client's connections, not all of the engine's.
+
+    engine = WSSEngine()
+    engine.start()
+    engine.add(GDAXWSS())
+    engine.add(BitfinexWSS())
+"""
+# Import Built-Ins
+import logging
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, Future
+from queue import Queue
+
+# Import Third-Party
+import aiohttp
+
+# Import Homebrew
+from bitex.api.WSS.queues import BLOCK
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+def may_block(data_q):
+    """
+    Returns whether putting to the given queue may block.
+    :param data_q: Queue obj
+    :return: bool
+    """
+    # multiprocessing.Queue does not expose its maxsize
+    return (getattr(data_q, 'policy', BLOCK) == BLOCK and
+            getattr(data_q, 'maxsize', 1) > 0)
+
+
+class DaemonExecutor(Executor):
+    """
+    Executor running submitted calls in order, in a single daemon thread -
+    unlike ThreadPoolExecutor's workers, a call blocked on a full queue does
+    not keep the interpreter from exiting.
+    """
+    def __init__(self, name):
+        self._calls = Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=name)
+        self._thread.start()
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self._calls.put((future, fn, args, kwargs))
+        return future
+
+    def _run(self):
+        while True:
+            call = self._calls.get()
+            if call is None:
+                return
+            future, fn, args, kwargs = call
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self, wait=True):
+        self._calls.put(None)
+        if wait:
+            self._thread.join()
+
+
+class FeedConnection:
+    """
+    Connection object handed to WSSAPI.on_open(); its methods may be called
+    from any thread.
+    """
+    def __init__(self, ws, loop, thread):
+        self.ws = ws
+        self.loop = loop
+        self.thread = thread
+
+    def _call(self, coro):
+        if self.loop.is_closed():
+            coro.close()
+            return
+        if threading.current_thread() is self.thread:
+            self.loop.create_task(coro)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def send(self, text):
+        """
+        Sends the given text message.
+        :param text: str
+        :return:
+        """
+        self._call(self.ws.send_str(text))
+
+    def close(self):
+        """
+        Closes the connection; the engine reconnects if the client is
+        still running.
+        :return:
+        """
+        self._call(self.ws.close())
+
+
+class WSSEngine:
+    """
+    Event loop running the connections of all added clients.
+    """
+    def __init__(self, reconnect_delay=1.0, heartbeat=30.0):
+        """
+        Initialize Object.
+        :param reconnect_delay: float, seconds to wait before reconnecting
+        :param heartbeat: float, interval of websocket pings in seconds, or
+                          None to disable them
+        """
+        self.reconnect_delay = reconnect_delay
+        self.heartbeat = heartbeat
+        self.loop = None
+        self.thread = None
+        self._session = None
+        self._tasks = {}  # Dict of client: list of tasks
+        self._executors = {}  # Dict of client: executor running on_message()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """
+        Starts the event loop in a dedicated thread.
+        :return:
+        """
+        if self.running:
+            return
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(ready,),
+                                       daemon=True, name='WSS Engine')
+        self.thread.start()
+        ready.wait()
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(ready.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def stop(self):
+        """
+        Removes all clients, closing their connections, and stops the event
+        loop.
+        :return:
+        """
+        if not self.running:
+            return
+        for client in list(self._tasks):
+            self.remove(client)
+        if self._session is not None:
+            future = asyncio.run_coroutine_threadsafe(self._session.close(),
+                                                      self.loop)
+            future.result(timeout=5)
+            self._session = None
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.thread = None
+
+    def add(self, client):
+        """
+        Connects to all feeds of the given client.
+        :param client: WSSAPI obj
+        :raises TypeError: if the client does not support the engine
+        :return:
+        """
+        if not self.running:
+            raise RuntimeError("WSSEngine.add(): Engine is not running!")
+        if not client.supports_engine():
+            raise TypeError("WSSEngine.add(): %s does not implement the "
+                            "engine interface, and cannot be run by "
+                            "WSSEngine!" % client.__class__.__name__)
+        client.prepare()
+        client.running = True
+        if may_block(client.data_q):
+            self._executors[client] = DaemonExecutor('%s Engine Worker' %
+                                                     client.name)
+        future = asyncio.run_coroutine_threadsafe(self._add(client), self.loop)
+        future.result()
+
+    async def _add(self, client):
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        self._tasks[client] = [self.loop.create_task(self._run_feed(client, url))
+                               for url in client.feed_urls()]
+
+    def remove(self, client):
+        """
+        Closes all connections of the given client.
+        :param client: WSSAPI obj
+        :return:
+        """
+        client.running = False
+        tasks = self._tasks.pop(client, [])
+        for task in tasks:
+            self.loop.call_soon_threadsafe(task.cancel)
+        executor = self._executors.pop(client, None)
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    async def _run_feed(self, client, url):
+        """
+        Connection loop of a single feed; reconnects until the client stops.
+        :param client: WSSAPI obj
+        :param url: str
+        :return:
+        """
+        executor = self._executors.get(client)
+        while client.running:
+            try:
+                async with self._session.ws_connect(url, heartbeat=self.heartbeat,
+                                                    autoping=True) as ws:
+                    log.info("WSSEngine: %s connected to %s", client.name, url)
+                    client.on_open(url, FeedConnection(ws, self.loop,
+                                                       self.thread))
+                    async for msg in ws:
+                        if msg.type in (aiohttp.WSMsgType.TEXT,
+                                        aiohttp.WSMsgType.BINARY):
+                            ts = time.time()
+                            client.record(url, msg.data, ts)
+                            try:
+                                if executor is None:
+                                    client.on_message(url, msg.data, ts)
+                                else:
+                                    await self.loop.run_in_executor(
+                                        executor, client.on_message, url,
+                                        msg.data, ts)
+                            except ConnectionError as e:
+                                log.info("WSSEngine: %s reconnecting to %s: "
+                                         "%s", client.name, url, e)
+                                break
+                            except Exception:
+                                log.exception("WSSEngine: %s failed to "
+                                              "process message %s",
+                                              client.name, msg.data)
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+            except asyncio.CancelledError:
+                raise
+            except (aiohttp.ClientError, OSError, asyncio.TimeoutError) as e:
+                log.error("WSSEngine: %s could not connect to %s: %s",
+                          client.name, url, e)
+            if client.running:
+                log.info("WSSEngine: Connection of %s to %s lost, "
+                         "reconnecting..", client.name, url)
+                await asyncio.sleep(self.reconnect_delay)
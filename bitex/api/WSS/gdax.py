@@ -6,23 +6,77 @@ import time
 
 # Import Third-Party
 from websocket import create_connection, WebSocketTimeoutException
-import requests
+
 # Import Homebrew
 from bitex.api.WSS.base import WSSAPI
+from bitex.api.WSS.sequence import SequenceTracker, BookResynchronizer
+from bitex.api.WSS.sequence import OUT_OF_ORDER
+from bitex.api.WSS.messages import Ticker, BookSnapshot, BookDelta, Trade
+from bitex.metadata import metadata_cache, fetch_json
+from bitex.utils import json_loads
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
 
 
+def fetch_pairs():
+    """
+    Fetches the ids of all products listed on GDAX.
+    :return: list of str
+    """
+    return [x['id'] for x in fetch_json('https://api.gdax.com/products')]
+
+
 class GDAXWSS(WSSAPI):
-    def __init__(self):
+    """
+    Websocket client for GDAX's full channel. The sequence numbers of all
+    messages are checked per pair; out-of-order messages are dropped, and
+    gaps logged.
+
+    If resync_books is True, an order book snapshot is fetched via REST for
+    each pair before its first message, and again whenever a gap is
+    detected. The snapshot is put on the data queue as a BookSnapshot,
+    followed by all messages newer than it.
+
+    Match messages are put on the data queue as Trade, ticker messages as
+    Ticker, and all other messages of the full channel as BookDelta. They
+    are tagged with the channels 'matches', 'ticker', 'snapshot' and 'full'
+    respectively.
+    """
+    _message_types = {'match': Trade, 'last_match': Trade, 'ticker': Ticker,
+                      'snapshot': BookSnapshot}
+    _channels = {Trade: 'matches', Ticker: 'ticker', BookSnapshot: 'snapshot',
+                 BookDelta: 'full'}
+
+    def __init__(self, resync_books=False, pairs=None):
+        """
+        Initialize Object.
+        :param resync_books: bool, fetch REST snapshots of order books
+        :param pairs: list of product ids; all listed products if None, as
+                      cached by bitex.metadata
+        """
         super(GDAXWSS, self).__init__('wss://ws-feed.gdax.com', 'GDAX')
         self.conn = None
-        r = requests.get('https://api.gdax.com/products').json()
-        self.pairs = [x['id'] for x in r]
+        self.pairs = pairs or metadata_cache.get('gdax.pairs', fetch_pairs)
         self._data_thread = None
+        self._rest = None
+        self.sequences = SequenceTracker(self.name)
+        if resync_books:
+            self.book_sync = BookResynchronizer(self._fetch_snapshot,
+                                                self._put_snapshot,
+                                                self._put_message, self.name)
+        else:
+            self.book_sync = None
+
+    def prepare(self):
+        if not self.pairs:
+            self.pairs = metadata_cache.get('gdax.pairs', fetch_pairs,
+                                            wait=True, timeout=30)
+        if not self.pairs:
+            raise ConnectionError("GDAXWSS: Could not fetch products!")
 
     def start(self):
+        self.prepare()
         super(GDAXWSS, self).start()
 
         self._data_thread = threading.Thread(target=self._process_data)
@@ -36,15 +90,53 @@ class GDAXWSS(WSSAPI):
 
     def _process_data(self):
         self.conn = create_connection(self.addr, timeout=4)
-        payload = json.dumps({'type': 'subscribe', 'product_ids': self.pairs})
-        self.conn.send(payload)
+        self.on_open(self.addr, self.conn)
         while self.running:
             try:
-                data = json.loads(self.conn.recv())
+                raw = self.conn.recv()
             except (WebSocketTimeoutException, ConnectionResetError):
                 self._controller_q.put('restart')
+                continue
+            ts = time.time()
+            self.record(self.addr, raw, ts)
+            self.on_message(self.addr, raw, ts)
+        self.conn = None
+
+    def on_open(self, url, conn):
+        payload = json.dumps({'type': 'subscribe', 'product_ids': self.pairs})
+        conn.send(payload)
+
+    def on_message(self, url, raw, ts):
+        data = json_loads(raw)
+        if 'product_id' not in data:
+            return
+        pair = data['product_id']
+        if 'sequence' not in data:
+            self._put_message(pair, None, (data, ts))
+        elif self.book_sync is not None:
+            self.book_sync.process(pair, data['sequence'], (data, ts))
+        elif self.sequences.check(pair, data['sequence']) != OUT_OF_ORDER:
+            self._put_message(pair, data['sequence'], (data, ts))
+
+    def _fetch_snapshot(self, pair):
+        """
+        Fetches the pair's full order book via REST.
+        :param pair: str
+        :return: tuple of sequence number and order book
+        """
+        # Imported here to avoid a circular import
+        from bitex.interfaces.gdax import GDAX
+        if self._rest is None:
+            self._rest = GDAX()
+        book = self._rest.order_book(pair, level=3).json()
+        return book['sequence'], book
+
+    def _put_snapshot(self, pair, book):
+        self.data_q.put(BookSnapshot(self.name, 'snapshot', pair, book,
+                                     time.time()))
 
-            if 'product_id' in data:
-                self.data_q.put(('order_book', data['product_id'],
-                                 data, time.time()))
-        self.conn = None
\ No newline at end of file
+    def _put_message(self, pair, seq, message):
+        data, ts = message
+        msg_type = self._message_types.get(data.get('type'), BookDelta)
+        self.data_q.put(msg_type(self.name, self._channels[msg_type], pair,
+                                 data, ts))
@@ -1,136 +1,168 @@
 # Import Built-Ins
 import logging
-import time
-from threading import Thread
-from queue import Queue
+import json
+import threading
 
 # Import Third-Party
-import requests
 
 # Import Homebrew
 from bitex.api.WSS.base import WSSAPI
+from bitex.api.WSS.engine import WSSEngine
+from bitex.api.WSS.messages import BookDelta, Trade, Candle
+from bitex.metadata import metadata_cache, fetch_json
+from bitex.utils import json_loads
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
 
-from websocket import create_connection, WebSocketTimeoutException
+
+def fetch_symbols():
+    """
+    Fetches all symbols listed on Gemini.
+    :return: list of str
+    """
+    return fetch_json('https://api.gemini.com/v1/symbols')
 
 
 class GeminiWSS(WSSAPI):
-    def __init__(self, endpoints=None):
-        super(GeminiWSS, self).__init__('wss://api.gemini.com/v1/', 'Gemini')
-        self.endpoints = (endpoints if endpoints else
-                          requests.get('https://api.gemini.com/v1/symbols').json())
-        self.endpoints = ['marketdata/' + x.upper() for x in self.endpoints]
-        self.endpoint_threads = {}
-        self.threads_running = {}
-        self.restarter_thread = None
-        self.restart_q = Queue()
-
-    def _restart_thread(self):
-        """
-        Restarts subscription threads if their connection drops.
-        :return:
+    """
+    Client for Gemini's v2 market data websocket, which multiplexes any number
+    of symbols over a single connection. Symbols are spread across a fixed
+    pool of connections, all of which are run by a WSSEngine - hence the
+    number of connections and threads does not grow with the number of
+    symbols. Symbols may be subscribed to and unsubscribed from while running.
+
+    Trades are put on data_q as Trade, candles as Candle, and all other
+    messages (i.e. l2_updates, whose first message per symbol contains the
+    full book) as BookDelta.
+    """
+    # Feeds subscribed to for each symbol
+    subscriptions = ('l2',)
+
+    def __init__(self, endpoints=None, pool_size=2, engine=None):
         """
-        while self.running['restart_thread']:
-            try:
-                endpoint = self.restart_q.get(timeout=.5)
-            except TimeoutError:
-                continue
-            log.info("_restart_thread(): Restarting Thread for endpoint %s",
-                     endpoint)
-            self.unsubscribe(endpoint)
-            self.subscribe(endpoint)
-
-    def _subscription_thread(self, endpoint):
-        """
-        Thread Method, running the connection for each endpoint.
-        :param endpoint:
-        :return:
+        Initialize Object.
+        :param endpoints: list of symbols, i.e. ['btcusd', 'ethusd']; all
+                          listed symbols if None, as cached by bitex.metadata
+        :param pool_size: int, number of websocket connections to use
+        :param engine: WSSEngine obj to run the connections on; a dedicated
+                       engine is started by start() if None
         """
+        super(GeminiWSS, self).__init__('wss://api.gemini.com/v2/marketdata',
+                                        'Gemini')
+        self._all_symbols = not endpoints
+        if not endpoints:
+            endpoints = metadata_cache.get('gemini.symbols', fetch_symbols) or []
+        self.pool_size = pool_size
+        self.engine = engine
+        self._owns_engine = False
+
+        # Symbols and connection of each pool slot, by url
+        self._lock = threading.Lock()
+        self.slots = {url: set() for url in self.feed_urls()}
+        self.connections = {}
+        for symbol in endpoints:
+            self.subscribe(symbol)
+
+    @property
+    def symbols(self):
+        with self._lock:
+            return sorted(s for symbols in self.slots.values() for s in symbols)
+
+    def feed_urls(self):
+        # The fragment only tells the pool's connections apart - it is not
+        # sent to the server
+        return ['%s#%s' % (self.addr, i) for i in range(self.pool_size)]
+
+    def _payload(self, action, symbols):
+        return json.dumps({'type': action,
+                           'subscriptions': [{'name': name,
+                                              'symbols': sorted(symbols)}
+                                             for name in self.subscriptions]})
+
+    def on_open(self, url, conn):
+        with self._lock:
+            self.connections[url] = conn
+            if self.slots[url]:
+                conn.send(self._payload('subscribe', self.slots[url]))
+
+    def on_message(self, url, raw, ts):
+        msg = json_loads(raw)
         try:
-            conn = create_connection(self.addr + endpoint, timeout=5)
-        except WebSocketTimeoutException:
-            self.restart_q.put(endpoint)
+            symbol = msg['symbol']
+        except KeyError:
+            # Heartbeats and subscription acknowledgements
+            log.debug("GeminiWSS.on_message(): %s", msg)
             return
-
-        while self.threads_running[endpoint]:
-            try:
-                msg = conn.recv()
-            except WebSocketTimeoutException:
-                self._controller_q.put(endpoint)
-
-            log.debug("%s, %s", endpoint, msg)
-            ep, pair = endpoint.split('/')
-            log.debug("_subscription_thread(): Putting data on q..")
-            try:
-                self.data_q.put((ep, pair, msg, time.time()), timeout=1)
-            except TimeoutError:
-                continue
-            finally:
-                log.debug("_subscription_thread(): Data Processed, looping back..")
-        conn.close()
-        log.debug("_subscription_thread(): Thread Loop Ended.")
+        msg_type = msg.get('type', '')
+        if msg_type == 'trade':
+            self.data_q.put(Trade(self.name, msg_type, symbol, msg, ts))
+        elif msg_type.startswith('candles'):
+            self.data_q.put(Candle(self.name, msg_type, symbol, msg, ts))
+        else:
+            self.data_q.put(BookDelta(self.name, msg_type, symbol, msg, ts))
+
+    def prepare(self):
+        if self._all_symbols and not self.symbols:
+            symbols = metadata_cache.get('gemini.symbols', fetch_symbols,
+                                         wait=True, timeout=30)
+            if not symbols:
+                raise ConnectionError("GeminiWSS: Could not fetch symbols!")
+            for symbol in symbols:
+                self.subscribe(symbol)
 
     def start(self):
         super(GeminiWSS, self).start()
-
-        log.debug("GeminiWSS.start(): launching Endpoint Threads..")
-        for endpoint in self.endpoints:
-            self.subscribe(endpoint)
+        if self.engine is None:
+            self.engine = WSSEngine()
+            self._owns_engine = True
+        self.engine.start()
+        log.debug("GeminiWSS.start(): Connecting %s symbols via %s "
+                  "connections..", len(self.symbols), self.pool_size)
+        self.engine.add(self)
 
     def stop(self):
         super(GeminiWSS, self).stop()
-        log.debug('stop(): Shutting down Endpoint threads..')
-        for endpoint in self.endpoints:
-            try:
-                self.unsubscribe(endpoint)
-            except KeyError:
-                pass
-        while not all(not self.endpoint_threads[x].is_alive() for x in self.endpoint_threads):
-            time.sleep(1)
-            log.debug('stop(): Waiting for threads to shutdown..')
-        log.debug("stop(): Shutting down complete - running Grabage Collector..")
-        self.garbage_collector()
-
-    def restart(self):
-        self.stop()
-        self.start()
-
-    def subscribe(self, endpoint):
-        log.debug("GeminiWSS.subscribe(): Starting Thread for endpoint %s",
-                  endpoint)
-        self.threads_running[endpoint] = True
-        t = Thread(target=self._subscription_thread,
-                   args=(endpoint,), name=endpoint)
-        t.daemon = True
-        t.start()
-        self.endpoint_threads[endpoint] = t
-
-    def unsubscribe(self, endpoint):
-        self.threads_running[endpoint] = False
-        try:
-            self.endpoint_threads[endpoint].join(timeout=1)
-        except TimeoutError:
-            self.endpoint_threads.pop(endpoint)
-
-        self.garbage_collector()
-
-    def garbage_collector(self):
-        for endpoint in self.endpoints:
-            try:
-                if self.endpoint_threads[endpoint].is_alive():
-                    continue
-                else:
-                    self.endpoint_threads.pop(endpoint)
-            except KeyError:
-                pass
-
-    def eval_command(self, cmd):
-        if cmd in self.endpoints:
-            self.subscribe(cmd)
-        elif cmd == 'stop':
-            self.stop()
-
-
-
+        if self.engine is None:
+            return
+        self.engine.remove(self)
+        if self._owns_engine:
+            self.engine.stop()
+            self.engine = None
+            self._owns_engine = False
+        with self._lock:
+            self.connections = {}
+
+    def subscribe(self, symbol):
+        """
+        Subscribes to the given symbol, on the connection of the pool serving
+        the fewest symbols.
+        :param symbol: str
+        :return:
+        """
+        symbol = symbol.upper()
+        with self._lock:
+            if any(symbol in symbols for symbols in self.slots.values()):
+                return
+            url = min(self.slots, key=lambda k: len(self.slots[k]))
+            self.slots[url].add(symbol)
+            conn = self.connections.get(url)
+            if conn is not None:
+                conn.send(self._payload('subscribe', [symbol]))
+
+    def unsubscribe(self, symbol):
+        """
+        Unsubscribes from the given symbol.
+        :param symbol: str
+        :return:
+        """
+        symbol = symbol.upper()
+        with self._lock:
+            for url, symbols in self.slots.items():
+                if symbol in symbols:
+                    symbols.remove(symbol)
+                    conn = self.connections.get(url)
+                    if conn is not None:
+                        conn.send(self._payload('unsubscribe', [symbol]))
+                    return
+        raise KeyError("%s is not subscribed to!" % symbol)
@@ -11,6 +11,9 @@ from websocket import create_connection, WebSocketTimeoutException
 
 # Import Homebrew
 from bitex.api.WSS.base import WSSAPI
+from bitex.api.WSS.sequence import SequenceTracker, GAP, OUT_OF_ORDER
+from bitex.api.WSS.messages import BookSnapshot, BookDelta, AccountEvent
+from bitex.utils import json_loads
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
@@ -31,6 +34,9 @@ class HitBTCWSS(WSSAPI):
 
         self.trade_command_q = Queue()
 
+        # Sequence numbers of each pair's market data
+        self.sequences = SequenceTracker(self.name)
+
     def start(self, duplex=False):
         super(HitBTCWSS, self).start()
 
@@ -63,21 +69,52 @@ class HitBTCWSS(WSSAPI):
         except Exception:
             self._controller_q.put('restart_data')
             return
+        self.on_open(self.addr, conn)
 
         while self.running:
             try:
-                data = conn.recv()
-                data = json.loads(data)
-            except WebSocketTimeoutException:
+                raw = conn.recv()
+                ts = time.time()
+                self.record(self.addr, raw, ts)
+                self.on_message(self.addr, raw, ts)
+            except (WebSocketTimeoutException, ConnectionResetError):
+                conn.close()
                 self._controller_q.put('restart_data')
                 return
-            try:
-                pair = data['MarketDataIncrementalRefresh']['symbol']
-                endpoint = 'MarketDataIncrementalRefresh'
-            except KeyError:
-                pair = data['MarketDataSnapshotFullRefresh']['symbol']
-                endpoint = 'MarketDataSnapshotFullRefresh'
-            self.data_q.put((endpoint, pair, data[endpoint], time.time()))
+
+    def on_open(self, url, conn):
+        self.sequences.clear()
+
+    def on_message(self, url, raw, ts):
+        """
+        Handles market data. Each pair's incremental updates are checked
+        against the sequence number of its last update or snapshot; on a
+        gap, ConnectionResetError is raised, since reconnecting causes the
+        server to send fresh snapshots.
+        :param url: str
+        :param raw: str, message as received
+        :param ts: timestamp, declares when data was received by the client
+        :return:
+        """
+        data = json_loads(raw)
+        try:
+            pair = data['MarketDataIncrementalRefresh']['symbol']
+            endpoint = 'MarketDataIncrementalRefresh'
+        except KeyError:
+            pair = data['MarketDataSnapshotFullRefresh']['symbol']
+            endpoint = 'MarketDataSnapshotFullRefresh'
+
+        if endpoint == 'MarketDataSnapshotFullRefresh':
+            self.sequences.reset(pair, data[endpoint]['snapshotSeqNo'])
+            msg_type = BookSnapshot
+        else:
+            result = self.sequences.check(pair, data[endpoint]['seqNo'])
+            if result == OUT_OF_ORDER:
+                return
+            elif result == GAP:
+                raise ConnectionResetError("Gap in %s's sequence" % pair)
+            msg_type = BookDelta
+        self.data_q.put(msg_type(self.name, endpoint, pair, data[endpoint], ts))
 
     def _trade_thread(self):
         try:
@@ -93,7 +130,8 @@ class HitBTCWSS(WSSAPI):
             except WebSocketTimeoutException:
                 self._controller_q.put('restart_data')
                 return
-            self.data_q.put(json.loads(data))
+            self.data_q.put(AccountEvent(self.name, 'trading', None,
+                                         json_loads(data), time.time()))
 
             try:
                 payload = self.trade_command_q.get()
@@ -0,0 +1,72 @@
+"""
+Message types put on the data queues of all websocket clients.
+
+All messages share the same fields - exchange, channel, pair, data and ts -
+and differ in their type only, so consumers can dispatch on type (or on the
+kind attribute), without inspecting the message's shape:
+
+    handlers = {Ticker: on_ticker, BookDelta: on_delta, Trade: on_trade}
+    for msg in wss.get_batch():
+        handlers.get(type(msg), ignore)(msg)
+
+channel is the exchange's name of the channel the message was received on;
+data is the exchange's payload, as decoded from the message; ts is the time
+it was received.
+Messages are namedtuples without instance dicts, hence they take no more
+memory than plain tuples, and can still be unpacked like them. Like tuples,
+they compare by value only - compare their types, too, where it matters.
+"""
+# Import Built-Ins
+import logging
+from collections import namedtuple
+
+# Import Third-Party
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+_Message = namedtuple('Message', ['exchange', 'channel', 'pair', 'data', 'ts'])
+
+
+class Message(_Message):
+    """
+    Base class of all message types.
+    """
+    __slots__ = ()
+    kind = 'message'
+
+
+class Ticker(Message):
+    __slots__ = ()
+    kind = 'ticker'
+
+
+class BookSnapshot(Message):
+    __slots__ = ()
+    kind = 'book_snapshot'
+
+
+class BookDelta(Message):
+    __slots__ = ()
+    kind = 'book_delta'
+
+
+class Trade(Message):
+    __slots__ = ()
+    kind = 'trade'
+
+
+class Candle(Message):
+    __slots__ = ()
+    kind = 'candle'
+
+
+class AccountEvent(Message):
+    __slots__ = ()
+    kind = 'account'
+
+
+MESSAGE_TYPES = (Ticker, BookSnapshot, BookDelta, Trade, Candle, AccountEvent)
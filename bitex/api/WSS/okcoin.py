@@ -10,12 +10,19 @@ import requests
 
 # Import Homebrew
 from bitex.api.WSS.base import WSSAPI
+from bitex.api.WSS.messages import Message, Ticker, BookSnapshot, Trade
+from bitex.api.WSS.messages import Candle
+from bitex.utils import json_loads
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
 
 
 class OKCoinWSS(WSSAPI):
+    # Message type by channel type, i.e. 'depth' of ok_sub_spotusd_btc_depth_60
+    _message_types = {'ticker': Ticker, 'depth': BookSnapshot, 'trades': Trade,
+                      'kline': Candle}
+
     def __init__(self):
         super(OKCoinWSS, self).__init__('wss://real.okcoin.com:10440/websocket/okcoinapi ',
                                         'OKCoin')
@@ -23,6 +30,7 @@ class OKCoinWSS(WSSAPI):
 
         self.pairs = ['BTC', 'LTC']
         self._data_thread = None
+        self._unknown_channels = set()
 
     def start(self):
         super(OKCoinWSS, self).start()
@@ -38,6 +46,19 @@ class OKCoinWSS(WSSAPI):
 
     def _process_data(self):
         self.conn = create_connection(self.addr, timeout=4)
+        self.on_open(self.addr, self.conn)
+        while self.running:
+            try:
+                raw = self.conn.recv()
+            except (WebSocketTimeoutException, ConnectionResetError):
+                self._controller_q.put('restart')
+                continue
+            ts = time.time()
+            self.record(self.addr, raw, ts)
+            self.on_message(self.addr, raw, ts)
+        self.conn = None
+
+    def on_open(self, url, conn):
         for pair in self.pairs:
             payload = [{'event': 'addChannel',
                         'channel': 'ok_sub_spotusd_%s_ticker' % pair},
@@ -48,17 +69,34 @@ class OKCoinWSS(WSSAPI):
                        {'event': 'addChannel',
                         'channel': 'ok_sub_spotusd_%s_kline_1min' % pair}]
             log.debug(payload)
-            self.conn.send(json.dumps(payload))
-        while self.running:
-            try:
-                data = json.loads(self.conn.recv())
-            except (WebSocketTimeoutException, ConnectionResetError):
-                self._controller_q.put('restart')
+            conn.send(json.dumps(payload))
+
+    def parse_channel(self, channel):
+        """
+        Returns the pair and message type of the given channel, i.e.
+        ('USDBTC', Ticker) for ok_sub_spotusd_btc_ticker. Messages of unknown
+        channels are typed Message, and logged once per channel.
+        :param channel: str
+        :return: tuple of pair (str or None) and message type
+        """
+        parts = channel.split('_')
+        pair = msg_type = None
+        if len(parts) > 4 and parts[2].startswith('spot'):
+            pair = (parts[2][len('spot'):] + parts[3]).upper()
+            msg_type = self._message_types.get(parts[4])
+        if msg_type is None:
+            if channel not in self._unknown_channels:
+                self._unknown_channels.add(channel)
+                log.warning("OKCoinWSS: Received data on unknown channel %s",
+                            channel)
+            msg_type = Message
+        return pair, msg_type
 
-            if 'data' in data:
-                pair = ''.join(data['channel'].split('spot')[1].split('_')[:2]).upper()
-                self.data_q.put((data['channel'], pair, data['data'],
-                                 time.time()))
-            else:
-                log.debug(data)
-        self.conn = None
\ No newline at end of file
+    def on_message(self, url, raw, ts):
+        data = json_loads(raw)
+        if 'data' in data:
+            channel = data['channel']
+            pair, msg_type = self.parse_channel(channel)
+            self.data_q.put(msg_type(self.name, channel, pair, data['data'], ts))
+        else:
+            log.debug(data)
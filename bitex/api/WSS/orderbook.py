@@ -0,0 +1,254 @@
+"""
+Local order books, maintained from websocket snapshots and deltas.
+
+L2Book keeps price-aggregated levels, L3Book keeps individual orders. Both
+store each side's levels in a sortedcontainers.SortedDict, hence level
+lookups and updates of existing levels take O(1), adding and removing
+levels O(log n), and the best bid and ask are found in O(log n). All
+methods are thread-safe; reads return copies of the book's data.
+"""
+# Import Built-Ins
+import logging
+import threading
+
+# Import Third-Party
+from sortedcontainers import SortedDict
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class PriceLevels:
+    """
+    One side of an order book, mapping prices to level data. Prices are kept
+    in ascending order; the best price is the highest for bids (descending)
+    and the lowest for asks.
+    Not thread-safe by itself - access is synchronized by the owning book.
+    """
+    def __init__(self, descending=False):
+        self.descending = descending
+        self.levels = SortedDict()
+
+    def __len__(self):
+        return len(self.levels)
+
+    def __contains__(self, price):
+        return price in self.levels
+
+    def __getitem__(self, price):
+        return self.levels[price]
+
+    def __setitem__(self, price, value):
+        self.levels[price] = value
+
+    def pop(self, price, default=None):
+        """
+        Removes the given price level, and returns its data.
+        :param price: float
+        :param default: returned if the level does not exist
+        :return: level data
+        """
+        return self.levels.pop(price, default)
+
+    def clear(self):
+        self.levels.clear()
+
+    @property
+    def best(self):
+        """
+        Tuple of best price and its level data, or None if empty.
+        """
+        if not self.levels:
+            return None
+        return self.levels.peekitem(-1 if self.descending else 0)
+
+    def items(self, depth=None):
+        """
+        Returns (price, level data) tuples, best price first.
+        :param depth: int, number of levels to return, or None for all
+        :return: list of tuples
+        """
+        prices = self.levels.keys()
+        if self.descending:
+            prices = prices[::-1] if depth is None else prices[:-depth - 1:-1]
+        else:
+            prices = prices[:] if depth is None else prices[:depth]
+        return [(p, self.levels[p]) for p in prices]
+
+
+class L2Book:
+    """
+    Price-aggregated order book, as provided by Bitfinex's book channel with
+    precision P0 - P4. Each level stores its price, number of orders and
+    total amount; ask amounts are negative.
+    """
+    def __init__(self, pair=None):
+        self.pair = pair
+        self.bids = PriceLevels(descending=True)
+        self.asks = PriceLevels()
+        self.ts = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '%s(pair=%s, bids=%s, asks=%s)' % (self.__class__.__name__,
+                                                   self.pair, len(self.bids),
+                                                   len(self.asks))
+
+    def update(self, data, ts=None):
+        """
+        Applies a snapshot (list of levels) or a single delta.
+        :param data: list of levels, or a single level, as
+                     [price, count, amount]
+        :param ts: timestamp, declares when data was received by the client
+        :return:
+        """
+        with self._lock:
+            if not data or isinstance(data[0], (list, tuple)):
+                self.bids.clear()
+                self.asks.clear()
+                for level in data:
+                    self._apply(*level)
+            else:
+                self._apply(*data)
+            self.ts = ts
+
+    def _apply(self, price, count, amount):
+        price, count, amount = float(price), int(count), float(amount)
+        side = self.bids if amount > 0 else self.asks
+        if count > 0:
+            side[price] = price, count, amount
+        else:
+            side.pop(price)
+
+    @property
+    def best_bid(self):
+        """
+        Best bid as [price, count, amount], or None.
+        """
+        with self._lock:
+            best = self.bids.best
+        return None if best is None else list(best[1])
+
+    @property
+    def best_ask(self):
+        """
+        Best ask as [price, count, amount], or None.
+        """
+        with self._lock:
+            best = self.asks.best
+        return None if best is None else list(best[1])
+
+    def snapshot(self, depth=None):
+        """
+        Returns a copy of the book.
+        :param depth: int, number of levels per side, or None for all
+        :return: dict of 'bids' and 'asks' (lists of [price, count, amount],
+                 best first) and 'ts'
+        """
+        with self._lock:
+            return {'bids': [list(v) for p, v in self.bids.items(depth)],
+                    'asks': [list(v) for p, v in self.asks.items(depth)],
+                    'ts': self.ts}
+
+
+class L3Book:
+    """
+    Order-level order book, as provided by Bitfinex's book channel with
+    precision R0. Orders at the same price are kept in the order they were
+    added; ask amounts are negative.
+    """
+    def __init__(self, pair=None):
+        self.pair = pair
+        self.bids = PriceLevels(descending=True)
+        self.asks = PriceLevels()
+        self.orders = {}  # Order id: (side, price)
+        self.ts = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '%s(pair=%s, orders=%s)' % (self.__class__.__name__, self.pair,
+                                           len(self.orders))
+
+    def update(self, data, ts=None):
+        """
+        Applies a snapshot (list of orders) or a single delta.
+        :param data: list of orders, or a single order, as
+                     [order_id, price, amount]
+        :param ts: timestamp, declares when data was received by the client
+        :return:
+        """
+        with self._lock:
+            if not data or isinstance(data[0], (list, tuple)):
+                self.bids.clear()
+                self.asks.clear()
+                self.orders = {}
+                for order in data:
+                    self._apply(*order)
+            else:
+                self._apply(*data)
+            self.ts = ts
+
+    def _remove(self, order_id):
+        try:
+            side, price = self.orders.pop(order_id)
+        except KeyError:
+            return
+        orders = side[price]
+        del orders[order_id]
+        if not orders:
+            side.pop(price)
+
+    def _apply(self, order_id, price, amount):
+        price, amount = float(price), float(amount)
+        side = self.bids if amount > 0 else self.asks
+        if price and self.orders.get(order_id) == (side, price):
+            # Amount changed - the order keeps its position in the queue
+            side[price][order_id] = amount
+            return
+        self._remove(order_id)
+        if price == 0:
+            return
+        if price not in side:
+            side[price] = {}
+        side[price][order_id] = amount
+        self.orders[order_id] = side, price
+
+    def _level(self, best):
+        if best is None:
+            return None
+        price, orders = best
+        return [price, len(orders), sum(orders.values())]
+
+    @property
+    def best_bid(self):
+        """
+        Best bid as aggregated [price, count, amount], or None.
+        """
+        with self._lock:
+            return self._level(self.bids.best)
+
+    @property
+    def best_ask(self):
+        """
+        Best ask as aggregated [price, count, amount], or None.
+        """
+        with self._lock:
+            return self._level(self.asks.best)
+
+    def snapshot(self, depth=None):
+        """
+        Returns a copy of the book.
+        :param depth: int, number of price levels per side, or None for all
+        :return: dict of 'bids' and 'asks' (lists of [order_id, price, amount],
+                 best price first) and 'ts'
+        """
+        def orders(side):
+            return [[order_id, price, amount]
+                    for price, level in side.items(depth)
+                    for order_id, amount in level.items()]
+
+        with self._lock:
+            return {'bids': orders(self.bids), 'asks': orders(self.asks),
+                    'ts': self.ts}
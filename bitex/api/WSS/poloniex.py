@@ -1,82 +1,206 @@
 # Import Built-Ins
-import signal
 import logging
+import asyncio
+import json
 import multiprocessing as mp
+import threading
 import time
+from functools import partial
 
 # Import Third-Party
 from autobahn.asyncio.wamp import ApplicationRunner, ApplicationSession
-from asyncio import coroutine, get_event_loop
-import requests
 
 # Import Homebrew
 from bitex.api.WSS.base import WSSAPI
+from bitex.api.WSS.messages import Ticker, BookDelta, Trade
+from bitex.metadata import metadata_cache, fetch_json
+from bitex.utils import json_loads
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
 
 
-class PoloniexSession(ApplicationSession):
-
-    @coroutine
-    def onJoin(self, *args, **kwargs):
-        channel = self.config.extra['channel']
-
-        def onTicker(*args, **kwargs):
-            self.config.extra['queue'].put((channel, (args, kwargs, time.time())))
-
-        if self.config.extra['is_killed'].is_set():
-            raise KeyboardInterrupt()
-        try:
-            yield from self.subscribe(onTicker, self.config.extra['channel'])
-
-        except Exception as e:
-            raise
+URL = 'wss://api.poloniex.com:443'
 
 
-class PlnxEndpoint(mp.Process):
-    def __init__(self, endpoint, q, **kwargs):
-        super(PlnxEndpoint, self).__init__(name='%s Endpoint Process' %
-                                                endpoint, **kwargs)
-        self.endpoint = endpoint
-        self.q = q
-        self.is_killed = mp.Event()
+def put_event(q, topic, args, kwargs, ts):
+    """
+    Puts the messages of a WAMP event on q. The ticker channel carries a pair
+    and its ticker as args; pair channels carry a list of order book updates
+    and trades, and the sequence number as keyword argument.
+    :param q: Queue obj
+    :param topic: str, channel the event was published on
+    :param args: list, positional arguments of the event
+    :param kwargs: dict, keyword arguments of the event
+    :param ts: timestamp, declares when data was received by the client
+    :return:
+    """
+    if topic == 'ticker':
+        q.put(Ticker('Poloniex', 'ticker', args[0], tuple(args[1:]), ts))
+        return
+    for event in args:
+        msg_type = Trade if event['type'] == 'newTrade' else BookDelta
+        data = dict(event['data'], type=event['type'], seq=kwargs.get('seq'))
+        q.put(msg_type('Poloniex', topic, topic, data, ts))
 
-    def run(self):
-        self.runner = ApplicationRunner("wss://api.poloniex.com:443", 'realm1',
-                                   extra={'channel': self.endpoint,
-                                          'queue': self.q,
-                                          'is_killed': self.is_killed})
-        self.runner.run(PoloniexSession)
 
-    def join(self, *args, **kwargs):
-        self.is_killed.set()
-        super(PlnxEndpoint, self).join(*args, **kwargs)
+class PoloniexSession(ApplicationSession):
+    """
+    WAMP session subscribing to all channels passed via config.extra, and
+    passing each event to config.extra['on_event'](topic, args, kwargs, ts).
+    """
+    async def onJoin(self, *args, **kwargs):
+        on_event = self.config.extra['on_event']
+
+        def make_handler(topic):
+            def handler(*args, **kwargs):
+                on_event(topic, args, kwargs, time.time())
+            return handler
+
+        for channel in self.config.extra['channels']:
+            await self.subscribe(make_handler(channel), channel)
+        log.info("PoloniexSession.onJoin(): Subscribed to %s channels",
+                 len(self.config.extra['channels']))
+
+    def onDisconnect(self):
+        log.info("PoloniexSession.onDisconnect(): Session disconnected")
+        asyncio.get_event_loop().stop()
+
+
+def run_session(channels, on_event, is_killed):
+    """
+    Runs a single WAMP session, subscribed to all given channels, on a new
+    event loop, until is_killed is set or the session disconnects.
+    :param channels: list of str
+    :param on_event: callable, called with the topic, args, kwargs and
+                     receive timestamp of each event
+    :param is_killed: threading.Event or multiprocessing.Event obj
+    :return:
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    runner = ApplicationRunner(URL, 'realm1',
+                               extra={'channels': channels,
+                                      'on_event': on_event})
+
+    async def wait_for_kill():
+        while not is_killed.is_set():
+            await asyncio.sleep(0.5)
+        loop.stop()
+
+    try:
+        loop.run_until_complete(runner.run(PoloniexSession, start_loop=False))
+        loop.create_task(wait_for_kill())
+        loop.run_forever()
+    except OSError:
+        log.exception("run_session(): Could not connect!")
+    finally:
+        loop.close()
+
+
+def fetch_endpoints():
+    """
+    Fetches the names of all pairs listed on Poloniex, plus 'ticker'.
+    :return: list of str
+    """
+    ticker = fetch_json('https://poloniex.com/public?command=returnTicker')
+    return list(ticker) + ['ticker']
 
 
 class PoloniexWSS(WSSAPI):
-    def __init__(self, endpoints=None):
+    """
+    Subscribes to the given endpoints (pairs and 'ticker') on a single WAMP
+    session. By default, the session runs in a thread of the calling process;
+    pass multiprocess=True to run it in a separate process instead, which
+    sends all data through a single multiprocessing.Queue. Events are
+    captured as JSON frames of [topic, args, kwargs], in threaded mode only.
+    """
+    def __init__(self, endpoints=None, multiprocess=False):
+        """
+        Initialize Object.
+        :param endpoints: list of channels; all pairs and 'ticker' if None,
+                          as cached by bitex.metadata
+        :param multiprocess: bool, run the session in a separate process
+        """
         super(PoloniexWSS, self).__init__(None, 'Poloniex')
-        self.data_q = mp.Queue()
-        self.connections = {}
-        if endpoints:
-            self.endpoints = endpoints
+        self.multiprocess = multiprocess
+        if multiprocess:
+            self.data_q = mp.Queue()
+            self.is_killed = mp.Event()
         else:
-            r = requests.get('https://poloniex.com/public?command=returnTicker')
-            self.endpoints = list(r.json().keys())
-            self.endpoints.append('ticker')
-
-        for endpoint in self.endpoints:
-            self.connections[endpoint] = PlnxEndpoint(endpoint, self.data_q)
+            self.is_killed = threading.Event()
+        self.session = None
+
+        self.endpoints = endpoints or metadata_cache.get('poloniex.endpoints',
+                                                        fetch_endpoints)
+
+    def configure_queue(self, *args, **kwargs):
+        if self.multiprocess:
+            raise ValueError("The queue of a multiprocess PoloniexWSS cannot "
+                             "be configured!")
+        return super(PoloniexWSS, self).configure_queue(*args, **kwargs)
+
+    def capture(self, *args, **kwargs):
+        if self.multiprocess:
+            raise ValueError("A multiprocess PoloniexWSS cannot be captured!")
+        return super(PoloniexWSS, self).capture(*args, **kwargs)
+
+    @classmethod
+    def supports_engine(cls):
+        # The WAMP session runs in a thread or process of its own
+        return False
+
+    def on_event(self, topic, args, kwargs, ts):
+        """
+        Records a WAMP event as a JSON frame of [topic, args, kwargs], if
+        capturing, and puts its messages on data_q.
+        :param topic: str
+        :param args: list
+        :param kwargs: dict
+        :param ts: timestamp, declares when data was received by the client
+        :return:
+        """
+        if self.recorder is not None:
+            self.record(URL, json.dumps([topic, args, kwargs]), ts)
+        put_event(self.data_q, topic, args, kwargs, ts)
+
+    def on_message(self, url, raw, ts):
+        """
+        Processes a WAMP event recorded by on_event(), i.e. when replayed.
+        :param url: str
+        :param raw: str, JSON frame of [topic, args, kwargs]
+        :param ts: timestamp, declares when data was received by the client
+        :return:
+        """
+        topic, args, kwargs = json_loads(raw)
+        put_event(self.data_q, topic, args, kwargs, ts)
+
+    def prepare(self):
+        if not self.endpoints:
+            self.endpoints = metadata_cache.get('poloniex.endpoints',
+                                                fetch_endpoints, wait=True,
+                                                timeout=30)
+        if not self.endpoints:
+            raise ConnectionError("PoloniexWSS: Could not fetch pairs!")
 
     def start(self):
+        self.prepare()
         super(PoloniexWSS, self).start()
-        for conn in self.connections:
-            self.connections[conn].start()
+        self.is_killed.clear()
+        if self.multiprocess:
+            worker, on_event = mp.Process, partial(put_event, self.data_q)
+        else:
+            worker, on_event = threading.Thread, self.on_event
+        self.session = worker(target=run_session,
+                              args=(self.endpoints, on_event, self.is_killed),
+                              name='Poloniex Session', daemon=True)
+        self.session.start()
 
     def stop(self):
-        for conn in self.connections:
-            self.connections[conn].join()
+        self.is_killed.set()
+        if self.session is not None:
+            self.session.join()
+            self.session = None
         super(PoloniexWSS, self).stop()
 
 
@@ -87,4 +211,4 @@ if __name__ == "__main__":
     time.sleep(5)
     wss.stop()
     while not wss.data_q.empty():
-        print(wss.data_q.get())
\ No newline at end of file
+        print(wss.data_q.get())
@@ -0,0 +1,144 @@
+"""
+Bounded data queue for websocket clients, with selectable overflow policies.
+
+BLOCK:       put() blocks until space is available (i.e. the receiver waits
+             for the consumer) - queue.Queue's behaviour.
+DROP_OLDEST: put() discards the oldest queued message to make room.
+CONFLATE:    put() replaces a still-queued message with the same key in
+             place, so only the latest message per key is kept; if the queue
+             is full, the oldest message is dropped. By default, only
+             snapshot-like messages (tickers, book snapshots and candles) are
+             conflated, by type, channel and pair - book deltas, trades and
+             account events are always kept, as dropping any of them
+             corrupts books and trade histories.
+"""
+# Import Built-Ins
+import logging
+from collections import deque
+from queue import Queue
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.WSS.messages import Ticker, BookSnapshot, Candle
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+BLOCK, DROP_OLDEST, CONFLATE = 'block', 'drop_oldest', 'conflate'
+POLICIES = (BLOCK, DROP_OLDEST, CONFLATE)
+
+
+# Message types of which only the latest per channel and pair matters
+CONFLATABLE = (Ticker, BookSnapshot, Candle)
+
+
+def conflation_key(item):
+    """
+    Default conflation key: a message's type, channel and pair, if it is of
+    one of the CONFLATABLE types; None for all other messages, which are
+    hence never conflated.
+    :param item: Message obj
+    :return: tuple or None
+    """
+    if isinstance(item, CONFLATABLE):
+        return type(item), item.channel, item.pair
+    return None
+
+
+class DataQueue(Queue):
+    """
+    queue.Queue with an overflow policy, counting dropped and conflated
+    messages.
+    """
+    def __init__(self, maxsize=0, policy=BLOCK, key=conflation_key):
+        """
+        Initialize Object.
+        :param maxsize: int, capacity; 0 for unbounded
+        :param policy: str, one of BLOCK, DROP_OLDEST or CONFLATE
+        :param key: callable, returning the hashable conflation key of a
+                    message; may return None for messages which must not be
+                    conflated
+        """
+        if policy not in POLICIES:
+            raise ValueError("policy must be one of %s, not %r!" %
+                             (POLICIES, policy))
+        self.policy = policy
+        self.key = key
+        self.dropped = 0
+        self.conflated = 0
+        super(DataQueue, self).__init__(maxsize)
+
+    # Items are stored as [key, item] entries; conflation replaces item of
+    # the entry indexed under the same key.
+
+    def _init(self, maxsize):
+        self.queue = deque()
+        self._index = {}
+
+    def _qsize(self):
+        return len(self.queue)
+
+    def _put(self, item):
+        key = self.key(item) if self.policy == CONFLATE else None
+        entry = [key, item]
+        self.queue.append(entry)
+        if key is not None:
+            self._index[key] = entry
+
+    def _get(self):
+        entry = self.queue.popleft()
+        if entry[0] is not None and self._index.get(entry[0]) is entry:
+            del self._index[entry[0]]
+        return entry[1]
+
+    def put(self, item, block=True, timeout=None):
+        if self.policy == BLOCK:
+            return super(DataQueue, self).put(item, block, timeout)
+
+        with self.not_full:
+            if self.policy == CONFLATE:
+                key = self.key(item)
+                if key is not None and key in self._index:
+                    self._index[key][1] = item
+                    self.conflated += 1
+                    return
+            if 0 < self.maxsize <= self._qsize():
+                self._get()
+                self.dropped += 1
+                self.unfinished_tasks -= 1
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def get_batch(self, max_items=None, block=True, timeout=None):
+        """
+        Removes and returns up to max_items messages at once, acquiring the
+        queue's lock only once.
+        :param max_items: int, or None for all queued messages
+        :param block: bool, wait for at least one message
+        :param timeout: float, seconds to wait at most, or None to wait
+                        indefinitely
+        :return: list of messages, oldest first; empty if none arrived in time
+        """
+        with self.not_empty:
+            if block and not self._qsize():
+                self.not_empty.wait_for(self._qsize, timeout)
+            n = self._qsize()
+            if max_items is not None:
+                n = min(n, max_items)
+            items = [self._get() for _ in range(n)]
+            if items:
+                self.not_full.notify(n)
+            return items
+
+    def stats(self):
+        """
+        Returns the queue's current size and counters.
+        :return: dict
+        """
+        with self.mutex:
+            return {'size': self._qsize(), 'maxsize': self.maxsize,
+                    'policy': self.policy, 'dropped': self.dropped,
+                    'conflated': self.conflated}
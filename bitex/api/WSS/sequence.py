@@ -0,0 +1,195 @@
+"""
+Sequence number tracking for websocket streams.
+
+SequenceTracker detects gaps and out-of-order messages per key (i.e. pair or
+channel). BookResynchronizer additionally keeps a stream of order book deltas
+consistent with REST snapshots: while a snapshot is fetched, deltas are
+buffered, and those newer than the snapshot are replayed once it arrived.
+"""
+# Import Built-Ins
+import logging
+import threading
+import time
+
+# Import Third-Party
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+# Results of SequenceTracker.check()
+IN_ORDER, OUT_OF_ORDER, GAP = 'in_order', 'out_of_order', 'gap'
+
+
+class SequenceTracker:
+    """
+    Tracks the last sequence number seen per key.
+    """
+    def __init__(self, name=''):
+        """
+        Initialize Object.
+        :param name: str, used in log messages
+        """
+        self.name = name
+        self.gaps = 0
+        self.out_of_order = 0
+        self._last = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._last
+
+    def reset(self, key, seq=None):
+        """
+        Sets the last sequence number of key; if seq is None, the key is
+        forgotten, and the next sequence number is accepted as is.
+        :param key: hashable
+        :param seq: int or None
+        :return:
+        """
+        with self._lock:
+            if seq is None:
+                self._last.pop(key, None)
+            else:
+                self._last[key] = seq
+
+    def clear(self):
+        """
+        Forgets the sequence numbers of all keys.
+        :return:
+        """
+        with self._lock:
+            self._last = {}
+
+    def check(self, key, seq):
+        """
+        Checks the given sequence number against the last one seen for key.
+        Sequence numbers of gaps are accepted as the new last sequence
+        number, while out-of-order ones are not.
+        :param key: hashable
+        :param seq: int
+        :return: str, one of IN_ORDER, OUT_OF_ORDER or GAP
+        """
+        with self._lock:
+            last = self._last.get(key)
+            if last is None or seq == last + 1:
+                self._last[key] = seq
+                return IN_ORDER
+            if seq <= last:
+                self.out_of_order += 1
+                log.warning("%s: Out-of-order message for %s: sequence %s "
+                            "after %s", self.name, key, seq, last)
+                return OUT_OF_ORDER
+            self.gaps += 1
+            self._last[key] = seq
+            log.warning("%s: Gap in sequence for %s: %s messages missing "
+                        "(%s - %s)", self.name, key, seq - last - 1, last + 1,
+                        seq - 1)
+            return GAP
+
+
+class BookResynchronizer:
+    """
+    Passes order book deltas on in sequence. On the first delta of a key,
+    and whenever a gap is detected, a fresh snapshot is fetched in a
+    background thread; deltas are buffered meanwhile. Once it is available,
+    the snapshot is passed on, followed by all buffered deltas newer than
+    the snapshot. Out-of-order deltas are dropped.
+    Callbacks are made without holding the resynchronizer's lock, hence they
+    may block, or pass further deltas in.
+    """
+    def __init__(self, fetch_snapshot, on_snapshot, on_delta, name='',
+                 retries=5, retry_delay=1.0):
+        """
+        Initialize Object.
+        :param fetch_snapshot: callable, accepting a key and returning a tuple
+                               of (sequence number, snapshot)
+        :param on_snapshot: callable, accepting key and snapshot
+        :param on_delta: callable, accepting key, sequence number and delta
+        :param name: str, used in log messages
+        :param retries: int, number of attempts to fetch a snapshot
+        :param retry_delay: float, seconds to wait between attempts
+        """
+        self.fetch_snapshot = fetch_snapshot
+        self.on_snapshot = on_snapshot
+        self.on_delta = on_delta
+        self.name = name
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.tracker = SequenceTracker(name)
+        self.resyncs = 0
+        self._buffers = {}
+        self._lock = threading.Lock()
+
+    def process(self, key, seq, delta):
+        """
+        Passes the given delta on, or buffers it while a snapshot is fetched.
+        Deltas of a key must be passed in from a single thread.
+        :param key: hashable, i.e. the pair
+        :param seq: int, the delta's sequence number
+        :param delta: data passed to on_delta
+        :return:
+        """
+        with self._lock:
+            if key in self._buffers:
+                self._buffers[key].append((seq, delta))
+                return
+            result = None
+            if key in self.tracker:
+                result = self.tracker.check(key, seq)
+            if result is None or result == GAP:
+                self._buffers[key] = [(seq, delta)]
+        if result == IN_ORDER:
+            self.on_delta(key, seq, delta)
+        elif result != OUT_OF_ORDER:
+            self._start_resync(key)
+
+    def _start_resync(self, key):
+        self.resyncs += 1
+        log.info("%s: Fetching snapshot for %s", self.name, key)
+        threading.Thread(target=self._resync, args=(key,), daemon=True,
+                         name='%s Resync Thread' % self.name).start()
+
+    def _resync(self, key):
+        for attempt in range(self.retries):
+            try:
+                seq, snapshot = self.fetch_snapshot(key)
+                break
+            except Exception:
+                log.exception("%s: Could not fetch snapshot for %s (attempt "
+                              "%s/%s)", self.name, key, attempt + 1,
+                              self.retries)
+                time.sleep(self.retry_delay)
+        else:
+            with self._lock:
+                dropped = self._buffers.pop(key, [])
+                self.tracker.reset(key)
+            log.error("%s: Giving up resync of %s, dropped %s deltas",
+                      self.name, key, len(dropped))
+            return
+
+        self.tracker.reset(key, seq)
+        # Callbacks are made without holding the lock; deltas arriving
+        # meanwhile are buffered, and replayed in turn
+        self.on_snapshot(key, snapshot)
+        while True:
+            with self._lock:
+                buffered = self._buffers[key]
+                if not buffered:
+                    del self._buffers[key]
+                    return
+                self._buffers[key] = []
+            for i, (delta_seq, delta) in enumerate(buffered):
+                if delta_seq <= seq:
+                    continue
+                result = self.tracker.check(key, delta_seq)
+                if result == GAP:
+                    # Snapshot is older than the buffered deltas; try again
+                    with self._lock:
+                        self._buffers[key] = buffered[i:] + self._buffers[key]
+                    self._start_resync(key)
+                    return
+                if result == IN_ORDER:
+                    self.on_delta(key, delta_seq, delta)
@@ -1,3 +1,3 @@
-import bitex.api.REST
-import bitex.api.WSS
+from bitex.lazy import lazy_attributes
 
+lazy_attributes(__name__, {'REST': 'bitex.api.REST', 'WSS': 'bitex.api.WSS'})
@@ -0,0 +1,145 @@
+"""
+Runs standardized interface methods concurrently across many exchanges and
+pairs, yielding results as they complete.
+"""
+
+# Import Built-Ins
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Import Third-Party
+
+# Import Homebrew
+import bitex.interfaces
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+# Names of the interfaces in bitex.interfaces, which are imported on first use
+INTERFACES = {'bitfinex': 'Bitfinex', 'bitstamp': 'Bitstamp',
+              'bittrex': 'Bittrex', 'bter': 'Bter', 'ccex': 'CCEX',
+              'coincheck': 'Coincheck', 'cryptopia': 'Cryptopia',
+              'gdax': 'GDAX', 'gemini': 'Gemini', 'hitbtc': 'HitBtc',
+              'itbit': 'ItBit', 'kraken': 'Kraken', 'okcoin': 'OKCoin',
+              'poloniex': 'Poloniex', 'quadrigacx': 'QuadrigaCX',
+              'quoine': 'Quoine', 'rocktrading': 'RockTradingLtd',
+              'vaultoro': 'Vaultoro', 'yunbi': 'Yunbi'}
+
+
+FanOutResult = namedtuple('FanOutResult', ['exchange', 'pair', 'response',
+                                           'error'])
+
+
+def _get_interface_class(name):
+    """
+    Returns the interface class of the given exchange name.
+    :param name: str, see INTERFACES
+    :raises ValueError: if the exchange is unknown
+    :return: interface class
+    """
+    try:
+        return getattr(bitex.interfaces, INTERFACES[name.lower()])
+    except KeyError:
+        raise ValueError("Unknown exchange %r! Must be one of %s" %
+                         (name, sorted(INTERFACES)))
+
+
+class _LazyInterface:
+    """
+    Creates the interface of an exchange given by name on its first call,
+    in the calling worker thread. Constructors may query the exchange (i.e.
+    Quoine's), and hence run within fan_out()'s timeout this way.
+    """
+    def __init__(self, exchange):
+        """
+        Initialize Object.
+        :param exchange: str or interface instance
+        """
+        if isinstance(exchange, str):
+            self._factory = _get_interface_class(exchange)
+            self._interface = None
+        else:
+            self._factory = None
+            self._interface = exchange
+        self._lock = threading.Lock()
+
+    def call(self, method, pair, *args, **kwargs):
+        with self._lock:
+            if self._interface is None:
+                self._interface = self._factory()
+        return getattr(self._interface, method)(pair, *args, **kwargs)
+
+
+def fan_out(method, queries, *args, timeout=None, max_workers=None, **kwargs):
+    """
+    Calls the given standardized method for each exchange and pair in queries
+    concurrently, and yields a FanOutResult for each call as soon as it
+    completes:
+
+        for res in fan_out('ticker', {'kraken': ['XXBTZEUR'],
+                                      'bitfinex': ['btcusd']}, timeout=2):
+            print(res.exchange, res.pair, res.response.formatted)
+
+    Calls which did not complete within timeout seconds of calling fan_out()
+    are yielded with a TimeoutError as their error, and are not waited for
+    any longer; hence a single slow exchange does not delay the results of
+    the others. Interfaces of exchanges given by name are created by the
+    first of their calls, and count towards its timeout.
+
+    :param method: str, name of the method to call, i.e. 'ticker'
+    :param queries: dict of exchange: list of pairs; exchanges may be given
+                    as name (see INTERFACES) or interface instance.
+    :param args: additional args passed to each method call
+    :param timeout: float, seconds after which a call is considered late
+    :param max_workers: int, maximum number of concurrent calls; defaults to
+                        the number of calls
+    :param kwargs: additional kwargs passed to each method call
+    :return: generator of FanOutResult
+    """
+    calls = []
+    for exchange, pairs in queries.items():
+        interface = _LazyInterface(exchange)
+        for pair in pairs:
+            calls.append((exchange, pair, interface))
+
+    if not calls:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(calls))
+    try:
+        started = time.time()
+        futures = {executor.submit(interface.call, method, pair, *args,
+                                   **kwargs): (exchange, pair)
+                   for exchange, pair, interface in calls}
+        pending = set(futures)
+        while pending:
+            wait_for = (None if timeout is None else
+                        max(0, started + timeout - time.time()))
+            done, pending = wait(pending, timeout=wait_for,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                exchange, pair = futures[future]
+                try:
+                    yield FanOutResult(exchange, pair, future.result(), None)
+                except Exception as e:
+                    log.debug("fan_out(): %s(%s) on %s failed: %s", method,
+                              pair, exchange, e)
+                    yield FanOutResult(exchange, pair, None, e)
+
+            if timeout is not None and time.time() >= started + timeout:
+                for future in pending:
+                    future.cancel()
+                    exchange, pair = futures[future]
+                    log.debug("fan_out(): %s(%s) on %s timed out after %ss",
+                              method, pair, exchange, timeout)
+                    yield FanOutResult(exchange, pair, None, TimeoutError(
+                        "%s(%s) on %s did not complete within %ss" %
+                        (method, pair, exchange, timeout)))
+                pending = set()
+    finally:
+        # Do not wait for stragglers
+        executor.shutdown(wait=False)
@@ -0,0 +1,410 @@
+"""
+Array-backed containers for formatted market data, returned by formatters
+when a standardized method is called with as_array set, i.e.:
+
+    book = Kraken().order_book('XXBTZEUR', as_array=True).formatted
+    book.asks.vwap(10)
+
+Passing an int instead of True stores values as fixed-point int64, with the
+given number of decimals.
+
+OrderBookSnapshot requires numpy to be installed; TradeBatch only requires it
+for TradeBatch.to_numpy().
+"""
+# Import Built-Ins
+import logging
+import calendar
+from array import array
+from bisect import bisect_left
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.lazy import lazy_import
+
+# numpy is imported on first use only
+try:
+    np = lazy_import('numpy')
+except ImportError:
+    np = None
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+def array_decimals(as_array):
+    """
+    Returns the number of decimals requested by the given as_array flag.
+    :param as_array: True for float64 values, or int number of decimals for
+                     fixed-point int64 values
+    :return: int or None
+    """
+    return None if as_array is True else int(as_array)
+
+
+def _to_array(values, decimals=None):
+    """
+    Converts the given numbers or numeric strings to a float64 array, or a
+    fixed-point int64 array scaled by 10**decimals.
+    :param values: list of str, int or float
+    :param decimals: int or None
+    :return: numpy.ndarray
+    """
+    arr = np.array(values, dtype=np.float64)
+    if decimals is None:
+        return arr
+    return np.rint(arr * 10 ** decimals).astype(np.int64)
+
+
+class BookSide:
+    """
+    One side of an order book, stored as contiguous arrays of prices and
+    sizes, ordered from the best price outwards.
+
+    If decimals is given, prices and sizes are stored as fixed-point int64
+    values, scaled by 10**decimals; the analytics methods always return
+    values in unscaled units.
+    """
+    def __init__(self, prices, sizes, descending=False, decimals=None):
+        """
+        Initialize Object.
+        :param prices: numpy.ndarray, sorted best price first
+        :param sizes: numpy.ndarray
+        :param descending: bool, True for bids, whose best price is highest
+        :param decimals: int, number of decimals of fixed-point values, or
+                         None for float64 values
+        """
+        self.prices = prices
+        self.sizes = sizes
+        self.descending = descending
+        self.decimals = decimals
+        self._cumulative_size = None
+        self._cumulative_notional = None
+
+    def __len__(self):
+        return len(self.prices)
+
+    def __repr__(self):
+        return '%s(levels=%s)' % (self.__class__.__name__, len(self))
+
+    def _unscaled(self, arr):
+        if self.decimals is None:
+            return arr
+        return arr / 10 ** self.decimals
+
+    @property
+    def best(self):
+        """
+        Best price of this side, or None if it is empty.
+        """
+        if not len(self):
+            return None
+        return self._unscaled(self.prices[0])
+
+    @property
+    def cumulative_size(self):
+        """
+        Total size available at each level, including all better levels.
+        """
+        if self._cumulative_size is None:
+            self._cumulative_size = np.cumsum(self._unscaled(self.sizes),
+                                              dtype=np.float64)
+        return self._cumulative_size
+
+    @property
+    def cumulative_notional(self):
+        """
+        Total notional (price * size) at each level, including all better
+        levels.
+        """
+        if self._cumulative_notional is None:
+            prices = self._unscaled(self.prices).astype(np.float64)
+            self._cumulative_notional = np.cumsum(
+                prices * self._unscaled(self.sizes))
+        return self._cumulative_notional
+
+    def vwap(self, size):
+        """
+        Returns the volume-weighted average price of filling the given size
+        against this side, or nan if there is not enough size available.
+        :param size: float, or array of floats
+        :return: float, or numpy.ndarray of floats
+        """
+        size = np.asarray(size, dtype=np.float64)
+        if not len(self):
+            return np.full(size.shape, np.nan)[()]
+        cum_size = self.cumulative_size
+        idx = np.searchsorted(cum_size, size)
+        level = np.minimum(idx, len(self) - 1)
+        prev = level - 1
+        filled = np.where(prev >= 0, cum_size[prev], 0.0)
+        notional = np.where(prev >= 0, self.cumulative_notional[prev], 0.0)
+        prices = self._unscaled(self.prices[level]).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = (notional + (size - filled) * prices) / size
+        return np.where(idx < len(self), result, np.nan)[()]
+
+    def size_to(self, price):
+        """
+        Returns the total size available at the given price or better.
+        :param price: float, or array of floats
+        :return: float, or numpy.ndarray of floats
+        """
+        prices = self._unscaled(self.prices)
+        price = np.asarray(price, dtype=np.float64)
+        if self.descending:
+            # Count levels priced at or above price
+            n = len(self) - np.searchsorted(prices[::-1], price, side='left')
+        else:
+            n = np.searchsorted(prices, price, side='right')
+        cum_size = np.concatenate(([0.0], self.cumulative_size))
+        return cum_size[n][()]
+
+
+class OrderBookSnapshot:
+    """
+    Order book snapshot, whose bids and asks are stored as BookSide objects.
+    """
+    def __init__(self, bids, asks, ts=None):
+        """
+        Initialize Object.
+        :param bids: BookSide, sorted by descending price
+        :param asks: BookSide, sorted by ascending price
+        :param ts: timestamp of the snapshot, if supplied by the exchange
+        """
+        self.bids = bids
+        self.asks = asks
+        self.ts = ts
+
+    def __repr__(self):
+        return '%s(bids=%s, asks=%s, ts=%s)' % (self.__class__.__name__,
+                                                 len(self.bids),
+                                                 len(self.asks), self.ts)
+
+    @classmethod
+    def from_levels(cls, bids, asks, price=0, size=1, ts=None,
+                    decimals=None):
+        """
+        Creates a snapshot from lists of levels, as returned by most
+        exchanges. Levels may be lists or dicts; price and size are the
+        index or key of the respective value in each level. Values may be
+        numbers or numeric strings.
+        :param bids: list of levels
+        :param asks: list of levels
+        :param price: int or str
+        :param size: int or str
+        :param ts: timestamp of the snapshot
+        :param decimals: int, store values as fixed-point int64 with this
+                         many decimals instead of float64
+        :return: OrderBookSnapshot()
+        """
+        if np is None:
+            raise ImportError("numpy is required to create an "
+                              "OrderBookSnapshot!")
+
+        def make_side(levels, descending):
+            prices = _to_array([l[price] for l in levels], decimals)
+            sizes = _to_array([l[size] for l in levels], decimals)
+            if len(prices) > 1:
+                diffs = np.diff(prices)
+                if (diffs > 0).any() if descending else (diffs < 0).any():
+                    order = np.argsort(-prices if descending else prices,
+                                       kind='mergesort')
+                    prices, sizes = prices[order], sizes[order]
+            return BookSide(prices, sizes, descending, decimals)
+
+        return cls(make_side(bids, True), make_side(asks, False), ts)
+
+    @property
+    def spread(self):
+        """
+        Difference between the best ask and best bid, or None if either side
+        is empty.
+        """
+        if self.bids.best is None or self.asks.best is None:
+            return None
+        return self.asks.best - self.bids.best
+
+    @property
+    def mid(self):
+        """
+        Mid price between the best bid and ask, or None if either side is
+        empty.
+        """
+        if self.bids.best is None or self.asks.best is None:
+            return None
+        return (self.asks.best + self.bids.best) / 2
+
+
+# Integer codes of trade sides, as stored in TradeBatch.sides
+BUY, SELL, UNKNOWN = 1, -1, 0
+_SIDES = {'buy': BUY, 'b': BUY, 'bid': BUY, 'sell': SELL, 's': SELL,
+          'ask': SELL}
+
+
+def side_code(side):
+    """
+    Returns the integer code of the given side string, i.e. 'buy' or 'SELL'.
+    :param side: str
+    :return: int, one of BUY, SELL or UNKNOWN
+    """
+    return _SIDES.get(str(side).lower(), UNKNOWN)
+
+
+def seconds_to_ns(value):
+    """
+    Converts a unix timestamp in seconds to nanoseconds. Numeric strings are
+    converted without loss of precision.
+    :param value: str, int or float
+    :return: int
+    """
+    if isinstance(value, str):
+        whole, _, frac = value.partition('.')
+        return int(whole) * 10 ** 9 + int(frac[:9].ljust(9, '0'))
+    return int(round(value * 10 ** 9))
+
+
+def iso_to_ns(value):
+    """
+    Converts an ISO 8601 UTC timestamp, i.e. '2017-05-26T08:21:11.123456Z' or
+    '2017-05-26 08:21:11', to unix time in nanoseconds.
+    :param value: str
+    :return: int
+    """
+    secs = calendar.timegm((int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                            int(value[11:13]), int(value[14:16]),
+                            int(value[17:19])))
+    frac = value[20:].rstrip('Z') if value[19:20] == '.' else ''
+    return secs * 10 ** 9 + int(frac[:9].ljust(9, '0'))
+
+
+class TradeBatch:
+    """
+    Columnar container of trades, sorted by timestamp. Each trade takes 25
+    bytes: its timestamp (int64, nanoseconds since epoch), price and size
+    (float64, or fixed-point int64 if decimals is given) and side (int8, one
+    of BUY, SELL or UNKNOWN).
+    """
+    def __init__(self, ts=None, prices=None, sizes=None, sides=None,
+                 decimals=None):
+        """
+        Initialize Object. Columns must be of equal length, and sorted by ts.
+        :param ts: array('q') of timestamps in nanoseconds
+        :param prices: array('d'), or array('q') if decimals is given
+        :param sizes: array('d'), or array('q') if decimals is given
+        :param sides: array('b') of side codes
+        :param decimals: int, number of decimals of fixed-point values, or
+                         None for float64 values
+        """
+        typecode = 'd' if decimals is None else 'q'
+        self.ts = ts if ts is not None else array('q')
+        self.prices = prices if prices is not None else array(typecode)
+        self.sizes = sizes if sizes is not None else array(typecode)
+        self.sides = sides if sides is not None else array('b')
+        self.decimals = decimals
+
+    @classmethod
+    def from_columns(cls, ts, prices, sizes, sides, decimals=None):
+        """
+        Creates a batch from lists of values, sorting them by timestamp if
+        necessary. Prices and sizes may be numbers or numeric strings.
+        :param ts: list of int, timestamps in nanoseconds
+        :param prices: list of str or float
+        :param sizes: list of str or float
+        :param sides: list of int side codes
+        :param decimals: int, store prices and sizes as fixed-point int64
+                         with this many decimals instead of float64
+        :return: TradeBatch()
+        """
+        if decimals is None:
+            typecode, convert = 'd', float
+        else:
+            scale = 10 ** decimals
+            typecode = 'q'
+
+            def convert(value):
+                return int(round(float(value) * scale))
+
+        if any(ts[i] > ts[i + 1] for i in range(len(ts) - 1)):
+            order = sorted(range(len(ts)), key=ts.__getitem__)
+            ts = [ts[i] for i in order]
+            prices = [prices[i] for i in order]
+            sizes = [sizes[i] for i in order]
+            sides = [sides[i] for i in order]
+
+        return cls(array('q', ts), array(typecode, map(convert, prices)),
+                   array(typecode, map(convert, sizes)), array('b', sides),
+                   decimals)
+
+    @classmethod
+    def concat(cls, batches):
+        """
+        Concatenates the given batches into a new batch, re-sorting it if
+        the batches overlap in time.
+        :param batches: list of TradeBatch, with identical decimals
+        :return: TradeBatch()
+        """
+        batches = [b for b in batches if len(b)]
+        if not batches:
+            return cls()
+        decimals = batches[0].decimals
+        if any(b.decimals != decimals for b in batches):
+            raise ValueError("Cannot concatenate TradeBatches with different "
+                             "decimals!")
+        result = cls(decimals=decimals)
+        for batch in batches:
+            result.ts.extend(batch.ts)
+            result.prices.extend(batch.prices)
+            result.sizes.extend(batch.sizes)
+            result.sides.extend(batch.sides)
+
+        if any(a.ts[-1] > b.ts[0] for a, b in zip(batches, batches[1:])):
+            # Permute the columns in place of rebuilding them, which would
+            # convert fixed-point values a second time
+            order = sorted(range(len(result)), key=result.ts.__getitem__)
+            for name in ('ts', 'prices', 'sizes', 'sides'):
+                column = getattr(result, name)
+                setattr(result, name,
+                        array(column.typecode, (column[i] for i in order)))
+        return result
+
+    def __len__(self):
+        return len(self.ts)
+
+    def __repr__(self):
+        return '%s(trades=%s)' % (self.__class__.__name__, len(self))
+
+    def __iter__(self):
+        return zip(self.ts, self.prices, self.sizes, self.sides)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.__class__(self.ts[item], self.prices[item],
+                                  self.sizes[item], self.sides[item],
+                                  self.decimals)
+        return self.ts[item], self.prices[item], self.sizes[item], self.sides[item]
+
+    def between(self, start=None, end=None):
+        """
+        Returns the trades with start <= ts < end.
+        :param start: int, nanoseconds, or None for no lower bound
+        :param end: int, nanoseconds, or None for no upper bound
+        :return: TradeBatch()
+        """
+        i = 0 if start is None else bisect_left(self.ts, start)
+        j = len(self) if end is None else bisect_left(self.ts, end)
+        return self[i:j]
+
+    def to_numpy(self):
+        """
+        Returns the batch's columns as numpy arrays, which share memory with
+        this batch.
+        :return: dict of column name: numpy.ndarray
+        """
+        if np is None:
+            raise ImportError("numpy is required for TradeBatch.to_numpy()!")
+        values = np.float64 if self.decimals is None else np.int64
+        return {'ts': np.frombuffer(self.ts, dtype=np.int64),
+                'price': np.frombuffer(self.prices, dtype=values),
+                'size': np.frombuffer(self.sizes, dtype=values),
+                'side': np.frombuffer(self.sides, dtype=np.int8)}
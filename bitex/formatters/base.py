@@ -53,6 +53,8 @@ class Formatter:
              'asks': [['1480941691', '0.015', '1'],
                       ['1480941650', '0.016', '0.67'],
                       ['1480941678', '0.017', '23']]}
+        If kwargs['as_array'] is set, formatters supporting it return a
+        bitex.formatters.arrays.OrderBookSnapshot instead.
         :param data: requests.response() obj
         :param args:
         :param kwargs:
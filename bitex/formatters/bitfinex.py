@@ -5,6 +5,8 @@ import logging
 
 # Import Homebrew
 from bitex.formatters.base import Formatter
+from bitex.formatters.arrays import OrderBookSnapshot, TradeBatch, array_decimals
+from bitex.formatters.arrays import side_code, seconds_to_ns
 
 
 log = logging.getLogger(__name__)
@@ -31,3 +33,23 @@ class BtfxFormatter(Formatter):
     @staticmethod
     def order_status(data, *args, **kwargs):
         return data['is_live']
+
+    @staticmethod
+    def order_book(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            return OrderBookSnapshot.from_levels(
+                data['bids'], data['asks'], price='price',
+                size='amount', decimals=array_decimals(as_array))
+        return data
+
+    @staticmethod
+    def trades(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            return TradeBatch.from_columns(
+                [seconds_to_ns(t['timestamp']) for t in data],
+                [t['price'] for t in data], [t['amount'] for t in data],
+                [side_code(t['type']) for t in data],
+                decimals=array_decimals(as_array))
+        return data
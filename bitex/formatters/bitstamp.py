@@ -5,6 +5,8 @@ import logging
 
 # Import Homebrew
 from bitex.formatters.base import Formatter
+from bitex.formatters.arrays import OrderBookSnapshot, TradeBatch, array_decimals
+from bitex.formatters.arrays import BUY, SELL, seconds_to_ns
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
@@ -17,4 +19,23 @@ class BtstFormatter(Formatter):
         return (data['bid'], data['ask'], data['high'], data['low'], data['open'],
                 None, data['last'], data['volume'], data['timestamp'])
 
+    @staticmethod
+    def order_book(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            return OrderBookSnapshot.from_levels(
+                data['bids'], data['asks'], ts=data.get('timestamp'),
+                decimals=array_decimals(as_array))
+        return data
 
+    @staticmethod
+    def trades(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            # Bitstamp encodes the side as 0 (buy) or 1 (sell)
+            return TradeBatch.from_columns(
+                [seconds_to_ns(str(t['date'])) for t in data],
+                [t['price'] for t in data], [t['amount'] for t in data],
+                [BUY if int(t['type']) == 0 else SELL for t in data],
+                decimals=array_decimals(as_array))
+        return data
@@ -5,6 +5,8 @@ import logging
 
 # Import Homebrew
 from bitex.formatters.base import Formatter
+from bitex.formatters.arrays import OrderBookSnapshot, TradeBatch, array_decimals
+from bitex.formatters.arrays import side_code, iso_to_ns
 
 log = logging.getLogger(__name__)
 
@@ -26,11 +28,35 @@ class BtrxFormatter(Formatter):
 
     @staticmethod
     def order_book(data, *args, **kwargs):
-        if data['success']:
-            return data['result']
-        else:
+        if not data['success']:
             return None
+        book = data['result']
+
+        as_array = kwargs.get('as_array')
+        if as_array:
+            if not isinstance(book, dict):
+                # Only one side was requested
+                side = args[2] if len(args) > 2 else kwargs.get('side')
+                book = {side: book}
+            return OrderBookSnapshot.from_levels(
+                book.get('buy', []), book.get('sell', []), price='Rate',
+                size='Quantity', decimals=array_decimals(as_array))
+        return book
 
     @staticmethod
     def cancel(data, *args, **kwargs):
         return True if data['success'] else False
+
+    @staticmethod
+    def trades(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            if not data['success']:
+                return None
+            trades = data['result']
+            return TradeBatch.from_columns(
+                [iso_to_ns(t['TimeStamp']) for t in trades],
+                [t['Price'] for t in trades], [t['Quantity'] for t in trades],
+                [side_code(t['OrderType']) for t in trades],
+                decimals=array_decimals(as_array))
+        return data
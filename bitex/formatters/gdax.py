@@ -5,6 +5,8 @@ import logging
 
 # Import Homebrew
 from bitex.formatters.base import Formatter
+from bitex.formatters.arrays import OrderBookSnapshot, TradeBatch, array_decimals
+from bitex.formatters.arrays import side_code, iso_to_ns
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
@@ -15,4 +17,22 @@ class GdaxFormatter(Formatter):
     @staticmethod
     def ticker(data, *args, **kwargs):
         return (data['bid'], data['ask'], None, None, None, None, data['price'],
-                data['volume'], data['time'])
\ No newline at end of file
+                data['volume'], data['time'])
+
+    @staticmethod
+    def order_book(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            return OrderBookSnapshot.from_levels(
+                data['bids'], data['asks'], decimals=array_decimals(as_array))
+        return data
+
+    @staticmethod
+    def trades(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            return TradeBatch.from_columns(
+                [iso_to_ns(t['time']) for t in data], [t['price'] for t in data],
+                [t['size'] for t in data], [side_code(t['side']) for t in data],
+                decimals=array_decimals(as_array))
+        return data
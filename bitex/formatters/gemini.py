@@ -5,6 +5,8 @@ import logging
 
 # Import Homebrew
 from bitex.formatters.base import Formatter
+from bitex.formatters.arrays import OrderBookSnapshot, TradeBatch, array_decimals
+from bitex.formatters.arrays import side_code
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
@@ -15,4 +17,24 @@ class GmniFormatter(Formatter):
     @staticmethod
     def ticker(data, *args, **kwargs):
         return (data['bid'], data['ask'], None, None, None, None, data['last'],
-                data['volume'][args[0][:3].upper()], data['volume']['time'])
\ No newline at end of file
+                data['volume'][args[0][:3].upper()], data['volume']['time'])
+
+    @staticmethod
+    def order_book(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            return OrderBookSnapshot.from_levels(
+                data['bids'], data['asks'], price='price',
+                size='amount', decimals=array_decimals(as_array))
+        return data
+
+    @staticmethod
+    def trades(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            return TradeBatch.from_columns(
+                [t['timestampms'] * 10 ** 6 for t in data],
+                [t['price'] for t in data], [t['amount'] for t in data],
+                [side_code(t['type']) for t in data],
+                decimals=array_decimals(as_array))
+        return data
@@ -1,78 +1,116 @@
 # Import Built-ins
 import logging
+from functools import lru_cache
 
 # Import Third-Party
 
 # Import Homebrew
 from bitex.formatters.base import Formatter
+from bitex.formatters.arrays import OrderBookSnapshot, TradeBatch, array_decimals
+from bitex.formatters.arrays import side_code, seconds_to_ns
+from bitex.pairs import registry
 
 
 log = logging.getLogger(__name__)
 
 
+# Pairs Kraken lists as they are, see https://api.kraken.com/0/public/AssetPairs
+FORMAT_EXCEPTIONS = frozenset(['BCHEUR', 'BCHUSD', 'BCHXBT', 'DASHEUR',
+                               'DASHUSD', 'DASHXBT', 'EOSETH', 'EOSXBT',
+                               'GNOETH', 'GNOXBT', 'USDTZUSD'])
+FOREX = frozenset(['EUR', 'USD', 'GBP', 'JPY', 'CAD'])
+
+
+@lru_cache(maxsize=1024)
+def legacy_format_pair(input_pair):
+    """
+    Formats pairs unknown to the registry by string rules. The API expects
+    one of two formats:
+    XBTXLT
+    or
+    XXBTXLTC
+
+    Where crypto currencies have an X prepended, and fiat currencies have
+    a Z prepended. Since the API returns the 8 character format, that's what
+    we will format into as well.
+
+    We expect 6 or 8 character strings, but do not explicitly check for it.
+    Should the string be of uneven length, we'll split the pair in the middle
+    like so:
+    BTC-LTC -> BTC, LTC.
+
+    Furthermore, since Kraken uses 'XBT' as Bitcoins symbol, we look for, and
+    replace occurrences of 'btc' with 'XBT'.
+
+    Pairs in FORMAT_EXCEPTIONS are returned in upper case, as they are.
+
+    :param input_pair: str
+    :return: str
+    """
+    if input_pair.upper() in FORMAT_EXCEPTIONS:
+        return input_pair.upper()
+
+    if len(input_pair) % 2 == 0:
+        base_cur, quote_cur = input_pair[:len(input_pair)//2], input_pair[len(input_pair)//2:]
+    else:
+        base_cur, quote_cur = input_pair.split(input_pair[len(input_pair)//2])
+
+    def add_prefix(input_string):
+        input_string = input_string.lower()
+        if any(x in input_string for x in ['usd', 'eur', 'jpy', 'gbp', 'cad']):
+            # appears to be fiat currency
+            if not input_string.startswith('z'):
+                input_string = 'z' + input_string
+
+        else:
+            # Appears to be Crypto currency
+            if 'btc' in input_string:
+                input_string = input_string.replace('btc', 'xbt')
+
+            if not input_string.startswith('x') or len(input_string) == 3:
+                input_string = 'x' + input_string
+        return input_string
+
+    base_cur = add_prefix(base_cur)
+    quote_cur = add_prefix(quote_cur)
+
+    return (base_cur + quote_cur).upper()
+
+
+@lru_cache(maxsize=1024)
+def legacy_book_key(pair):
+    """
+    Returns the key of the given pair's book in Depth responses, for pairs
+    unknown to the registry.
+    :param pair: str
+    :return: str
+    """
+    if len(pair) == 6 and pair.upper() not in FORMAT_EXCEPTIONS:
+        base_cur, quote_cur = pair[:3], pair[3:]
+        base_cur = ('Z' if base_cur.upper() in FOREX else 'X') + base_cur
+        quote_cur = ('Z' if quote_cur.upper() in FOREX else 'X') + quote_cur
+        return base_cur + quote_cur
+    return pair
+
+
 class KrknFormatter(Formatter):
 
     @staticmethod
     def format_pair(input_pair):
         """
-        Formats input to conform with kraken pair format. The API expects one of
-        two formats:
-        XBTXLT
-        or
-        XXBTXLTC
-
-        Where crypto currencies have an X prepended, and fiat currencies have
-        a Z prepended. Since the API returns the 8 character format, that's what
-        we will format into as well.
-
-        We expect 6 or 8 character strings, but do not explicitly check for it.
-        Should the string be of uneven length, we'll split the pair in the middle
-        like so:
-        BTC-LTC -> BTC, LTC.
-
-        Furthermore, since Kraken uses 'XBT' as Bitcoins symbol, we look for, and
-        replace occurrences of 'btc' with 'XBT'.
-
-        In addition there are some exceptions from this rules. Kraken is using
-        the pairs 'BCHEUR', 'BCHUSD', 'BCHXBT', 'DASHEUR', 'DASHUSD', 'DASHXBT',
-        'EOSETH', 'EOSXBT', 'GNOETH', 'GNOXBT' and 'USDTZUSD' as they are.
-        If the input matches one of this pairs, we just return the uppercase
-        representation of it.
+        Formats input to conform with kraken pair format, i.e. 'XXBTZUSD'.
+
+        Pairs listed in Kraken's AssetPairs are looked up in the Kraken
+        bitex.pairs.registry(), which accepts their native symbols and
+        altnames, as well as their currencies joined by nothing, '_', '-' or
+        '/' - i.e. 'btcusd', 'XBT_USD' or 'BTC/USD'.
+
+        Unlisted pairs are formatted by legacy_format_pair().
 
         :param input_pair: str
         :return: str
         """
-        # There are some exceptions from the general formatting rule
-        # see https://api.kraken.com/0/public/AssetPairs
-        format_exceptions = ['BCHEUR', 'BCHUSD', 'BCHXBT', 'DASHEUR', 'DASHUSD', 'DASHXBT', 'EOSETH', 'EOSXBT', 'GNOETH', 'GNOXBT', 'USDTZUSD']
-        if input_pair.upper() in format_exceptions:
-            return input_pair.upper()
-
-        if len(input_pair) % 2 == 0:
-            base_cur, quote_cur = input_pair[:len(input_pair)//2], input_pair[len(input_pair)//2:]
-        else:
-            base_cur, quote_cur = input_pair.split(input_pair[len(input_pair)//2])
-
-        def add_prefix(input_string):
-            input_string = input_string.lower()
-            if any(x in input_string for x in ['usd', 'eur', 'jpy', 'gbp', 'cad']):
-                # appears to be fiat currency
-                if not input_string.startswith('z'):
-                    input_string = 'z' + input_string
-
-            else:
-                # Appears to be Crypto currency
-                if 'btc' in input_string:
-                    input_string = input_string.replace('btc', 'xbt')
-
-                if not input_string.startswith('x') or len(input_string) == 3:
-                    input_string = 'x' + input_string
-            return input_string
-
-        base_cur = add_prefix(base_cur)
-        quote_cur = add_prefix(quote_cur)
-
-        return (base_cur + quote_cur).upper()
+        return registry('Kraken').get(input_pair) or legacy_format_pair(input_pair)
 
     @staticmethod
     def ticker(data, *args, **kwargs):
@@ -96,27 +134,14 @@ class KrknFormatter(Formatter):
     @staticmethod
     def order_book(data, *args, **kwargs):
         pair = args[1]
+        book = data['result'][registry('Kraken').get(pair) or
+                              legacy_book_key(pair)]
 
-        # There are some exceptions from the general formatting rule
-        # see https://api.kraken.com/0/public/AssetPairs
-        format_exceptions = ['BCHEUR', 'BCHUSD', 'BCHXBT', 'DASHEUR', 'DASHUSD', 'DASHXBT', 'EOSETH', 'EOSXBT', 'GNOETH', 'GNOXBT', 'USDTZUSD']
-
-        forex = ['EUR', 'USD', 'GBP', 'JPY', 'CAD']
-        if len(pair) == 6 and pair.upper() not in format_exceptions:
-            base_cur = pair[:3]
-            quote_cur = pair[3:]
-            if base_cur.upper() in forex:
-                base_cur = 'Z' + base_cur
-            else:
-                base_cur = 'X' + base_cur
-
-            if quote_cur.upper() in forex:
-                quote_cur = 'Z' + quote_cur
-            else:
-                quote_cur = 'X' + quote_cur
-            return data['result'][base_cur+quote_cur]
-        else:
-            return data['result'][pair]
+        as_array = kwargs.get('as_array')
+        if as_array:
+            return OrderBookSnapshot.from_levels(
+                book['bids'], book['asks'], decimals=array_decimals(as_array))
+        return book
 
     @staticmethod
     def cancel(data, *args, **kwargs):
@@ -124,3 +149,14 @@ class KrknFormatter(Formatter):
             return True
         else:
             return False
+
+    @staticmethod
+    def trades(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            trades = next(v for k, v in data['result'].items() if k != 'last')
+            return TradeBatch.from_columns(
+                [seconds_to_ns(t[2]) for t in trades], [t[0] for t in trades],
+                [t[1] for t in trades], [side_code(t[3]) for t in trades],
+                decimals=array_decimals(as_array))
+        return data
@@ -5,6 +5,8 @@ import logging
 
 # Import Homebrew
 from bitex.formatters.base import Formatter
+from bitex.formatters.arrays import OrderBookSnapshot, TradeBatch, array_decimals
+from bitex.formatters.arrays import side_code, iso_to_ns
 
 
 log = logging.getLogger(__name__)
@@ -28,3 +30,21 @@ class PlnxFormatter(Formatter):
     @staticmethod
     def cancel(data, *args, **kwargs):
         return True if data['success'] else False
+
+    @staticmethod
+    def order_book(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            return OrderBookSnapshot.from_levels(
+                data['bids'], data['asks'], decimals=array_decimals(as_array))
+        return data
+
+    @staticmethod
+    def trades(data, *args, **kwargs):
+        as_array = kwargs.get('as_array')
+        if as_array:
+            return TradeBatch.from_columns(
+                [iso_to_ns(t['date']) for t in data], [t['rate'] for t in data],
+                [t['amount'] for t in data], [side_code(t['type']) for t in data],
+                decimals=array_decimals(as_array))
+        return data
@@ -0,0 +1,113 @@
+"""
+asyncio versions of all interfaces in bitex.interfaces.
+
+Each class features the same methods as its blocking counterpart, which
+return coroutines instead of APIResponse objects:
+
+    async with AsyncKraken() as k:
+        resp = await k.ticker('XXBTZEUR')
+        ticker = resp.formatted
+
+Requires aiohttp to be installed.
+"""
+
+# Import Built-Ins
+import logging
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.REST.aio import AsyncAPIClient
+from bitex.api.REST.api import APIClient
+from bitex.api.REST import QuoineREST
+from bitex.interfaces import Kraken, Bitfinex, Bitstamp, CCEX, Coincheck
+from bitex.interfaces import Cryptopia, Gemini, ItBit, OKCoin, RockTradingLtd
+from bitex.interfaces import Yunbi, Bittrex, Poloniex, Quoine, QuadrigaCX
+from bitex.interfaces import Vaultoro, HitBtc, Bter, GDAX
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class AsyncBitfinex(AsyncAPIClient, Bitfinex):
+    pass
+
+
+class AsyncBitstamp(AsyncAPIClient, Bitstamp):
+    pass
+
+
+class AsyncBittrex(AsyncAPIClient, Bittrex):
+    pass
+
+
+class AsyncBter(AsyncAPIClient, Bter):
+    pass
+
+
+class AsyncCCEX(AsyncAPIClient, CCEX):
+    pass
+
+
+class AsyncCoincheck(AsyncAPIClient, Coincheck):
+    pass
+
+
+class AsyncCryptopia(AsyncAPIClient, Cryptopia):
+    pass
+
+
+class AsyncGDAX(AsyncAPIClient, GDAX):
+    pass
+
+
+class AsyncGemini(AsyncAPIClient, Gemini):
+    pass
+
+
+class AsyncHitBtc(AsyncAPIClient, HitBtc):
+    pass
+
+
+class AsyncItBit(AsyncAPIClient, ItBit):
+    pass
+
+
+class AsyncKraken(AsyncAPIClient, Kraken):
+    pass
+
+
+class AsyncOKCoin(AsyncAPIClient, OKCoin):
+    pass
+
+
+class AsyncPoloniex(AsyncAPIClient, Poloniex):
+    pass
+
+
+class AsyncQuadrigaCX(AsyncAPIClient, QuadrigaCX):
+    pass
+
+
+class AsyncQuoine(AsyncAPIClient, Quoine):
+    def __init__(self, key='', secret='', key_file=''):
+        QuoineREST.__init__(self, key, secret)
+        if key_file:
+            self.load_key(key_file)
+
+        # The product ids are required to build the standardized methods'
+        # queries, hence they're fetched using the blocking client once.
+        self.pairs = {d['currency_pair_code']: d['id']
+                      for d in APIClient.query(self, 'GET', 'products').json()}
+
+
+class AsyncRockTradingLtd(AsyncAPIClient, RockTradingLtd):
+    pass
+
+
+class AsyncVaultoro(AsyncAPIClient, Vaultoro):
+    pass
+
+
+class AsyncYunbi(AsyncAPIClient, Yunbi):
+    pass
@@ -9,7 +9,6 @@ import logging
 
 # Import Homebrew
 from bitex.api.REST import BitfinexREST
-from bitex.api.WSS.bitfinex import BitfinexWSS
 from bitex.utils import return_api_response
 from bitex.formatters.bitfinex import BtfxFormatter as fmt
 # Init Logging Facilities
@@ -22,6 +21,7 @@ class Bitfinex(BitfinexREST):
         if key_file:
             self.load_key(key_file)
         if websocket:
+            from bitex.api.WSS.bitfinex import BitfinexWSS
             self.wss = BitfinexWSS()
             self.wss.start()
         else:
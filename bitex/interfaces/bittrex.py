@@ -10,6 +10,7 @@ import logging
 # Import Homebrew
 from bitex.api.REST import BittrexREST
 from bitex.utils import return_api_response
+from bitex.api.REST.stream import iter_order_book
 from bitex.formatters.bittrex import BtrxFormatter as fmt
 # Init Logging Facilities
 log = logging.getLogger(__name__)
@@ -43,6 +44,20 @@ class Bittrex(BittrexREST):
         q.update(kwargs)
         return self.public_query('getorderbook', params=q)
 
+    def stream_order_book(self, pair, depth=None, **kwargs):
+        """
+        Streams both sides of the order book, yielding its levels as they are
+        received.
+        :param pair: str
+        :param depth: int, number of levels to yield per side, or None for all
+        :param kwargs: params for getorderbook
+        :return: generator of tuples of (side, {'Quantity': .., 'Rate': ..})
+        """
+        q = {'market': pair, 'type': 'both'}
+        q.update(kwargs)
+        r = self.public_query('getorderbook', params=q, stream=True)
+        return iter_order_book(r, {'buy': 'bids', 'sell': 'asks'}, depth)
+
     @return_api_response(fmt.trades)
     def trades(self, pair, **kwargs):
         q = {'market': pair}
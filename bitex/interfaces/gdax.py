@@ -9,7 +9,6 @@ import logging
 
 # Import Homebrew
 from bitex.api.REST import GDAXRest
-from bitex.api.WSS.gdax import GDAXWSS
 from bitex.utils import return_api_response
 from bitex.formatters.gdax import GdaxFormatter as fmt
 
@@ -23,6 +22,7 @@ class GDAX(GDAXRest):
         if key_file:
             self.load_key(key_file)
         if websocket:
+            from bitex.api.WSS.gdax import GDAXWSS
             self.wss = GDAXWSS()
             self.wss.start()
         else:
@@ -9,7 +9,6 @@ import logging
 
 # Import Homebrew
 from bitex.api.REST import GeminiREST
-from bitex.api.WSS.gemini import GeminiWSS
 from bitex.utils import return_api_response
 from bitex.formatters.gemini import GmniFormatter as fmt
 
@@ -23,6 +22,7 @@ class Gemini(GeminiREST):
         if key_file:
             self.load_key(key_file)
         if websocket:
+            from bitex.api.WSS.gemini import GeminiWSS
             self.wss = GeminiWSS()
             self.wss.start()
         else:
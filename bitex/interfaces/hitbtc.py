@@ -9,7 +9,6 @@ import time
 
 # Import Homebrew
 from bitex.api.REST import HitBTCREST
-from bitex.api.WSS.hitbtc import HitBTCWSS
 from bitex.utils import return_api_response
 from bitex.formatters.hitbtc import HitBtcFormatter as fmt
 
@@ -23,6 +22,7 @@ class HitBtc(HitBTCREST):
         if key_file:
             self.load_key(key_file)
         if websocket:
+            from bitex.api.WSS.hitbtc import HitBTCWSS
             self.wss = HitBTCWSS()
             self.wss.start()
         else:
@@ -10,7 +10,9 @@ import logging
 # Import Homebrew
 from bitex.api.REST import KrakenREST
 from bitex.utils import return_api_response
+from bitex.api.REST.stream import iter_order_book
 from bitex.formatters.kraken import KrknFormatter as fmt
+from bitex.pairs import registry
 # Init Logging Facilities
 log = logging.getLogger(__name__)
 
@@ -22,7 +24,9 @@ class Kraken(KrakenREST):
             self.load_key(key_file)
 
     def make_params(self, *pairs, **kwargs):
-        q = {'pair': ','.join(pairs)}
+        # Listed pairs are passed as Kraken's symbols, others as they are
+        pair_registry = registry('Kraken')
+        q = {'pair': ','.join(pair_registry.get(pair, pair) for pair in pairs)}
         q.update(kwargs)
         return q
 
@@ -48,6 +52,18 @@ class Kraken(KrakenREST):
         q = self.make_params(pair, **kwargs)
         return self.public_query('Depth', params=q)
 
+    def stream_order_book(self, pair, depth=None, **kwargs):
+        """
+        Streams the order book, yielding its levels as they are received.
+        :param pair: str
+        :param depth: int, number of levels to yield per side, or None for all
+        :param kwargs: params for Depth, i.e. count
+        :return: generator of tuples of (side, [price, volume, timestamp])
+        """
+        q = self.make_params(pair, **kwargs)
+        r = self.public_query('Depth', params=q, stream=True)
+        return iter_order_book(r, {'bids': 'bids', 'asks': 'asks'}, depth)
+
     @return_api_response(fmt.trades)
     def trades(self, pair, **kwargs):
         q = self.make_params(pair, **kwargs)
@@ -9,8 +9,8 @@ import logging
 
 # Import Homebrew
 from bitex.api.REST import PoloniexREST
-from bitex.api.WSS.poloniex import PoloniexWSS
 from bitex.utils import return_api_response
+from bitex.api.REST.stream import iter_order_book
 from bitex.formatters.poloniex import PlnxFormatter as fmt
 # Init Logging Facilities
 log = logging.getLogger(__name__)
@@ -22,6 +22,7 @@ class Poloniex(PoloniexREST):
         if key_file:
             self.load_key(key_file)
         if websocket:
+            from bitex.api.WSS.poloniex import PoloniexWSS
             self.wss = PoloniexWSS()
             self.wss.start()
         else:
@@ -47,6 +48,18 @@ class Poloniex(PoloniexREST):
         kwargs['currencyPair'] = pair
         return self.public_query('returnOrderBook', params=kwargs)
 
+    def stream_order_book(self, pair, depth=None, **kwargs):
+        """
+        Streams the order book, yielding its levels as they are received.
+        :param pair: str
+        :param depth: int, number of levels to yield per side, or None for all
+        :param kwargs: params for returnOrderBook
+        :return: generator of tuples of (side, [price, size])
+        """
+        kwargs['currencyPair'] = pair
+        r = self.public_query('returnOrderBook', params=kwargs, stream=True)
+        return iter_order_book(r, {'bids': 'bids', 'asks': 'asks'}, depth)
+
     @return_api_response(fmt.trades)
     def trades(self, pair, **kwargs):
         kwargs['currencyPair'] = pair
@@ -35,9 +35,9 @@ class Yunbi(YunbiREST):
     @return_api_response(fmt.ticker)
     def ticker(self, pair=None, **kwargs):
         if pair:
-            return self.public_query('tickers/%s' % pair, param=kwargs)
+            return self.public_query('tickers/%s' % pair, params=kwargs)
         else:
-            return self.public_query('tickers', param=kwargs)
+            return self.public_query('tickers', params=kwargs)
 
     @return_api_response(fmt.order_book)
     def order_book(self, pair, **kwargs):
@@ -0,0 +1,84 @@
+"""
+Helpers to defer imports until first use, keeping `import bitex` cheap:
+packages list their public names via lazy_attributes(), which are imported
+from their submodules on first access; lazy_import() returns a stand-in for a
+module, which imports it on first attribute access.
+"""
+# Import Built-Ins
+import logging
+import sys
+from importlib import import_module
+from importlib.util import find_spec
+from types import ModuleType
+
+# Import Third-Party
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class LazyModule(ModuleType):
+    """
+    Module class of packages using lazy_attributes(); resolves missing
+    attributes via the package's _lazy_attributes mapping.
+    """
+    def __getattr__(self, name):
+        try:
+            module_name = self.__dict__['_lazy_attributes'][name]
+        except KeyError:
+            raise AttributeError("module %r has no attribute %r" %
+                                 (self.__name__, name))
+        module = import_module(module_name)
+        if module_name == '%s.%s' % (self.__name__, name):
+            value = module  # A subpackage or submodule
+        else:
+            value = getattr(module, name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(super(LazyModule, self).__dir__()) |
+                      set(self.__dict__['_lazy_attributes']))
+
+
+def lazy_attributes(package_name, attributes):
+    """
+    Makes the given attributes of a package available on first access.
+    Call this from the package's __init__.py:
+
+        lazy_attributes(__name__, {'Kraken': 'bitex.interfaces.kraken'})
+
+    :param package_name: str, __name__ of the package
+    :param attributes: dict of attribute name: name of the module to import it
+                       from; if the module is the attribute itself (i.e. a
+                       subpackage), it is returned as is
+    :return:
+    """
+    module = sys.modules[package_name]
+    module.__class__ = LazyModule
+    module._lazy_attributes = attributes
+    module.__all__ = sorted(attributes)
+
+
+class _ModuleProxy(ModuleType):
+    def __getattr__(self, name):
+        module = import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, name)
+
+
+def lazy_import(module_name):
+    """
+    Returns a stand-in for the given module, which is imported on first
+    attribute access.
+    :param module_name: str
+    :raises ImportError: if the module is not installed
+    :return: module obj
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    if find_spec(module_name) is None:
+        raise ImportError("No module named %r" % module_name)
+    return _ModuleProxy(module_name)
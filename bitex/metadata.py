@@ -0,0 +1,168 @@
+"""
+Cache for exchange metadata, i.e. lists of symbols, which changes rarely
+but is slow to fetch.
+
+Values are kept in memory and persisted to a JSON file, hence they survive
+restarts. get() never blocks on the network, unless told to wait for a value
+that is not cached at all: expired values are returned as they are, while
+being refreshed in a background thread.
+"""
+# Import Built-Ins
+import logging
+import json
+import os
+import tempfile
+import threading
+import time
+
+# Import Third-Party
+import requests
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+def default_cache_path():
+    """
+    Returns the path of the cache file: $BITEX_CACHE_DIR/metadata.json, or
+    ~/.cache/bitex/metadata.json.
+    :return: str
+    """
+    directory = os.environ.get('BITEX_CACHE_DIR',
+                               os.path.join(os.path.expanduser('~'), '.cache',
+                                            'bitex'))
+    return os.path.join(directory, 'metadata.json')
+
+
+class MetadataCache:
+    """
+    Thread-safe cache of JSON-serializable values, with a TTL and on-disk
+    persistence.
+    """
+    def __init__(self, path=None, ttl=24 * 3600):
+        """
+        Initialize Object.
+        :param path: str, path of the cache file; default_cache_path() if None,
+                     False to disable persistence
+        :param ttl: float, number of seconds after which values are refreshed
+        """
+        self.path = default_cache_path() if path is None else path
+        self.ttl = ttl
+        self._entries = None  # Dict of key: (timestamp, value)
+        self._refreshing = {}  # Dict of key: threading.Event
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if not self.path:
+            return
+        try:
+            with open(self.path) as f:
+                self._entries = {k: tuple(v) for k, v in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            log.exception("MetadataCache: Could not read %s", self.path)
+
+    def _save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            log.exception("MetadataCache: Could not write %s", self.path)
+
+    def get(self, key, fetch, wait=False, timeout=None):
+        """
+        Returns the cached value of key. If it is missing or expired, it is
+        refreshed in a background thread, by calling fetch().
+        :param key: str
+        :param fetch: callable, returning the key's current value
+        :param wait: bool, wait for the refresh if key is not cached at all
+        :param timeout: float, seconds to wait at most
+        :return: cached value, or None
+        """
+        with self._lock:
+            self._load()
+            ts, value = self._entries.get(key, (None, None))
+            if ts is not None and time.time() - ts < self.ttl:
+                return value
+            refreshed = self._refreshing.get(key)
+            if refreshed is None:
+                refreshed = self._refreshing[key] = threading.Event()
+                threading.Thread(target=self._refresh, args=(key, fetch),
+                                 daemon=True,
+                                 name='Metadata Refresh %s' % key).start()
+        if ts is None and wait:
+            refreshed.wait(timeout)
+            with self._lock:
+                ts, value = self._entries.get(key, (None, None))
+        return value
+
+    def peek(self, key):
+        """
+        Returns the cached value of key, however old, without refreshing it.
+        :param key: str
+        :return: cached value, or None
+        """
+        with self._lock:
+            self._load()
+            return self._entries.get(key, (None, None))[1]
+
+    def _refresh(self, key, fetch):
+        try:
+            value = fetch()
+        except Exception:
+            log.exception("MetadataCache: Could not refresh %s", key)
+            value = None
+        with self._lock:
+            if value is not None:
+                self._entries[key] = (time.time(), value)
+                self._save()
+            self._refreshing.pop(key).set()
+
+    def set(self, key, value):
+        """
+        Stores value under key.
+        :param key: str
+        :param value: JSON-serializable obj
+        :return:
+        """
+        with self._lock:
+            self._load()
+            self._entries[key] = (time.time(), value)
+            self._save()
+
+    def clear(self):
+        """
+        Removes all values, including the cache file's.
+        :return:
+        """
+        with self._lock:
+            self._entries = {}
+            self._save()
+
+
+# Cache shared by all clients
+metadata_cache = MetadataCache()
+
+
+def fetch_json(url, timeout=10):
+    """
+    Fetches the given url and returns its decoded json body.
+    :param url: str
+    :param timeout: float, seconds
+    :return: decoded json
+    """
+    r = requests.get(url, timeout=timeout)
+    r.raise_for_status()
+    return r.json()
@@ -0,0 +1,319 @@
+"""
+Registry of the pairs listed on an exchange, with precomputed lookup tables.
+
+Each PairRegistry maps all common spellings of a pair - the exchange's native
+symbol, its alternative names, and the canonical base and quote currencies,
+joined by nothing, '_', '-' or '/' - to the native symbol, and native symbols
+to their canonical names, tick sizes and lot sizes. All string handling is
+done once, when the registry is built; lookups are single dict accesses:
+
+    >>> kraken = registry('Kraken')
+    >>> kraken.native('btc_usd'), kraken.canonical('XXBTZUSD')
+    ('XXBTZUSD', 'BTCUSD')
+
+Registries are built from the exchange's pair listing as cached by
+bitex.metadata, which fetches it in the background if it is missing or
+expired; until it arrives, a bundled snapshot of it is used. Registries are
+rebuilt once a fetched listing arrives. registry(exchange, refresh=True)
+fetches the current listing and waits for it.
+"""
+# Import Built-Ins
+import logging
+import threading
+import time
+from collections import namedtuple
+from decimal import Decimal
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.metadata import metadata_cache, fetch_json
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+Pair = namedtuple('Pair', ['native', 'base', 'quote', 'tick_size', 'lot_size'])
+
+# Separators of canonical pair spellings
+SEPARATORS = ('', '_', '-', '/')
+
+
+def decimal_step(decimals):
+    """
+    Returns the smallest step of a number with the given decimals.
+    :param decimals: int
+    :return: Decimal
+    """
+    return Decimal(1).scaleb(-int(decimals))
+
+
+class PairRegistry:
+    """
+    Lookup tables of the pairs listed on an exchange.
+    """
+    def __init__(self, exchange, pairs, aliases=None):
+        """
+        Initialize Object.
+        :param exchange: str
+        :param pairs: iterable of Pair objs, with canonical base and quote
+                      currencies
+        :param aliases: dict of native symbol: list of further names of it
+        """
+        self.exchange = exchange
+        self.pairs = {}
+        self._natives = {}
+        self._canonical = {}
+        aliases = aliases or {}
+        for pair in pairs:
+            self.pairs[pair.native] = pair
+            self._canonical[pair.native] = pair.base + pair.quote
+            names = [pair.base + sep + pair.quote for sep in SEPARATORS]
+            names.extend(aliases.get(pair.native, ()))
+            names.append(pair.native)
+            for name in names:
+                self._natives[name.upper()] = pair.native
+
+    def __contains__(self, pair):
+        return pair.upper() in self._natives
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def native(self, pair):
+        """
+        Returns the exchange's symbol of the given pair.
+        :param pair: str, in any spelling known to the registry
+        :raises KeyError: if the pair is not listed
+        :return: str
+        """
+        return self._natives[pair.upper()]
+
+    def get(self, pair, default=None):
+        """
+        Returns the exchange's symbol of the given pair, or default if it is
+        not listed.
+        :param pair: str
+        :param default: obj
+        :return: str
+        """
+        return self._natives.get(pair.upper(), default)
+
+    def canonical(self, pair):
+        """
+        Returns the canonical name of the given pair, i.e. 'BTCUSD'.
+        :param pair: str
+        :raises KeyError: if the pair is not listed
+        :return: str
+        """
+        return self._canonical[self.native(pair)]
+
+    def tick_size(self, pair):
+        """
+        :param pair: str
+        :raises KeyError: if the pair is not listed
+        :return: Decimal, smallest price increment of the pair
+        """
+        return self.pairs[self.native(pair)].tick_size
+
+    def lot_size(self, pair):
+        """
+        :param pair: str
+        :raises KeyError: if the pair is not listed
+        :return: Decimal, smallest size increment of the pair
+        """
+        return self.pairs[self.native(pair)].lot_size
+
+
+##
+# Kraken
+##
+
+# Kraken's names of currencies, after stripping their X / Z prefixes, which
+# differ from everyone else's
+KRAKEN_CURRENCIES = {'XBT': 'BTC', 'XDG': 'DOGE'}
+
+# Snapshot of Kraken's AssetPairs, as native: [altname, base, quote,
+# pair_decimals, lot_decimals]
+KRAKEN_ASSET_PAIRS = {
+    'BCHEUR': ['BCHEUR', 'BCH', 'ZEUR', 1, 8],
+    'BCHUSD': ['BCHUSD', 'BCH', 'ZUSD', 1, 8],
+    'BCHXBT': ['BCHXBT', 'BCH', 'XXBT', 5, 8],
+    'DASHEUR': ['DASHEUR', 'DASH', 'ZEUR', 2, 8],
+    'DASHUSD': ['DASHUSD', 'DASH', 'ZUSD', 2, 8],
+    'DASHXBT': ['DASHXBT', 'DASH', 'XXBT', 5, 8],
+    'EOSETH': ['EOSETH', 'EOS', 'XETH', 6, 8],
+    'EOSXBT': ['EOSXBT', 'EOS', 'XXBT', 7, 8],
+    'GNOETH': ['GNOETH', 'GNO', 'XETH', 5, 8],
+    'GNOXBT': ['GNOXBT', 'GNO', 'XXBT', 5, 8],
+    'USDTZUSD': ['USDTUSD', 'USDT', 'ZUSD', 4, 8],
+    'XETCXETH': ['ETCETH', 'XETC', 'XETH', 5, 8],
+    'XETCXXBT': ['ETCXBT', 'XETC', 'XXBT', 6, 8],
+    'XETCZEUR': ['ETCEUR', 'XETC', 'ZEUR', 3, 8],
+    'XETCZUSD': ['ETCUSD', 'XETC', 'ZUSD', 3, 8],
+    'XETHXXBT': ['ETHXBT', 'XETH', 'XXBT', 5, 8],
+    'XETHZCAD': ['ETHCAD', 'XETH', 'ZCAD', 2, 8],
+    'XETHZEUR': ['ETHEUR', 'XETH', 'ZEUR', 2, 8],
+    'XETHZGBP': ['ETHGBP', 'XETH', 'ZGBP', 2, 8],
+    'XETHZJPY': ['ETHJPY', 'XETH', 'ZJPY', 0, 8],
+    'XETHZUSD': ['ETHUSD', 'XETH', 'ZUSD', 2, 8],
+    'XICNXETH': ['ICNETH', 'XICN', 'XETH', 6, 8],
+    'XICNXXBT': ['ICNXBT', 'XICN', 'XXBT', 6, 8],
+    'XLTCXXBT': ['LTCXBT', 'XLTC', 'XXBT', 6, 8],
+    'XLTCZEUR': ['LTCEUR', 'XLTC', 'ZEUR', 2, 8],
+    'XLTCZUSD': ['LTCUSD', 'XLTC', 'ZUSD', 2, 8],
+    'XMLNXETH': ['MLNETH', 'XMLN', 'XETH', 6, 8],
+    'XMLNXXBT': ['MLNXBT', 'XMLN', 'XXBT', 6, 8],
+    'XREPXETH': ['REPETH', 'XREP', 'XETH', 5, 8],
+    'XREPXXBT': ['REPXBT', 'XREP', 'XXBT', 6, 8],
+    'XREPZEUR': ['REPEUR', 'XREP', 'ZEUR', 3, 8],
+    'XXBTZCAD': ['XBTCAD', 'XXBT', 'ZCAD', 1, 8],
+    'XXBTZEUR': ['XBTEUR', 'XXBT', 'ZEUR', 1, 8],
+    'XXBTZGBP': ['XBTGBP', 'XXBT', 'ZGBP', 1, 8],
+    'XXBTZJPY': ['XBTJPY', 'XXBT', 'ZJPY', 0, 8],
+    'XXBTZUSD': ['XBTUSD', 'XXBT', 'ZUSD', 1, 8],
+    'XXDGXXBT': ['XDGXBT', 'XXDG', 'XXBT', 8, 8],
+    'XXLMXXBT': ['XLMXBT', 'XXLM', 'XXBT', 8, 8],
+    'XXMRXXBT': ['XMRXBT', 'XXMR', 'XXBT', 6, 8],
+    'XXMRZEUR': ['XMREUR', 'XXMR', 'ZEUR', 2, 8],
+    'XXMRZUSD': ['XMRUSD', 'XXMR', 'ZUSD', 2, 8],
+    'XXRPXXBT': ['XRPXBT', 'XXRP', 'XXBT', 8, 8],
+    'XXRPZEUR': ['XRPEUR', 'XXRP', 'ZEUR', 5, 8],
+    'XXRPZUSD': ['XRPUSD', 'XXRP', 'ZUSD', 5, 8],
+    'XZECXXBT': ['ZECXBT', 'XZEC', 'XXBT', 5, 8],
+    'XZECZEUR': ['ZECEUR', 'XZEC', 'ZEUR', 2, 8],
+    'XZECZUSD': ['ZECUSD', 'XZEC', 'ZUSD', 2, 8]}
+
+
+def fetch_kraken_asset_pairs():
+    """
+    Fetches Kraken's AssetPairs, in the format of KRAKEN_ASSET_PAIRS.
+    :return: dict
+    """
+    r = fetch_json('https://api.kraken.com/0/public/AssetPairs')
+    # Dark pool pairs ('.d' suffix) share altnames with their regular pairs
+    return {native: [p['altname'], p['base'], p['quote'], p['pair_decimals'],
+                     p['lot_decimals']]
+            for native, p in r['result'].items() if not native.endswith('.d')}
+
+
+def strip_kraken_prefix(name):
+    """
+    Strips the X (crypto) or Z (fiat) prefix of a Kraken currency, if any,
+    i.e. 'XBT' for 'XXBT'.
+    :param name: str
+    :return: str
+    """
+    if len(name) == 4 and name[0] in 'XZ':
+        return name[1:]
+    return name
+
+
+def kraken_currency(name):
+    """
+    Returns the canonical name of a Kraken currency, i.e. 'BTC' for 'XXBT'.
+    :param name: str
+    :return: str
+    """
+    name = strip_kraken_prefix(name)
+    return KRAKEN_CURRENCIES.get(name, name)
+
+
+def kraken_registry(asset_pairs):
+    """
+    Builds a PairRegistry from Kraken's AssetPairs.
+    :param asset_pairs: dict, in the format of KRAKEN_ASSET_PAIRS
+    :return: PairRegistry obj
+    """
+    pairs, aliases = [], {}
+    for native, (altname, base, quote, pair_decimals,
+                 lot_decimals) in asset_pairs.items():
+        pairs.append(Pair(native, kraken_currency(base), kraken_currency(quote),
+                          decimal_step(pair_decimals),
+                          decimal_step(lot_decimals)))
+        # Kraken's own currency names, without prefixes - i.e. 'XBT_USD'
+        kraken_base = strip_kraken_prefix(base)
+        kraken_quote = strip_kraken_prefix(quote)
+        aliases[native] = [altname] + [kraken_base + sep + kraken_quote
+                                       for sep in SEPARATORS]
+    return PairRegistry('Kraken', pairs, aliases)
+
+
+##
+# Registries by exchange
+##
+
+# Dict of exchange: (metadata cache key, fetch function, snapshot, builder)
+SOURCES = {'Kraken': ('kraken.asset_pairs', fetch_kraken_asset_pairs,
+                      KRAKEN_ASSET_PAIRS, kraken_registry)}
+
+# Seconds between checks of whether a registry's listing needs a refresh
+CHECK_INTERVAL = 60
+
+_registries = {}  # Dict of exchange: (listing, PairRegistry)
+_checked = {}  # Dict of exchange: time.monotonic() of the last check
+_lock = threading.Lock()
+
+
+def _build(exchange, listing):
+    """
+    Builds the registry of the given exchange from listing, unless the
+    current one was built from it already.
+    :param exchange: str
+    :param listing: listing of pairs, as returned by the exchange's fetch
+                    function
+    :return: PairRegistry obj
+    """
+    with _lock:
+        built = _registries.get(exchange)
+        if built is None or built[0] is not listing:
+            built = _registries[exchange] = (listing,
+                                             SOURCES[exchange][3](listing))
+            log.debug("registry(): Loaded %s pairs of %s", len(listing),
+                      exchange)
+        return built[1]
+
+
+def _fetch(exchange):
+    """
+    Fetches the exchange's listing, and rebuilds its registry from it.
+    :param exchange: str
+    :return: listing
+    """
+    listing = SOURCES[exchange][1]()
+    if listing is not None:
+        _build(exchange, listing)
+    return listing
+
+
+def registry(exchange, refresh=False):
+    """
+    Returns the PairRegistry of the given exchange, building it on first use.
+    At most every CHECK_INTERVAL seconds, its listing is looked up in the
+    metadata cache, which refreshes it in the background if it is missing or
+    expired; the registry is rebuilt once the fetched listing arrives.
+    :param exchange: str, i.e. 'Kraken'
+    :param refresh: bool, rebuild it from the exchange's current listing,
+                    waiting for it to be fetched
+    :raises KeyError: if there is no registry for the exchange
+    :return: PairRegistry obj
+    """
+    now = time.monotonic()
+    built = _registries.get(exchange)
+    if (not refresh and built is not None and
+            now - _checked.get(exchange, now) < CHECK_INTERVAL):
+        return built[1]
+    key, fetch, snapshot, _ = SOURCES[exchange]
+    _checked[exchange] = now
+    if refresh:
+        listing = fetch()
+        metadata_cache.set(key, listing)
+    else:
+        listing = metadata_cache.get(key, lambda: _fetch(exchange))
+        if listing is None:
+            # Not fetched yet - keep the current registry, which may have
+            # been built from an earlier fetched listing
+            if built is not None:
+                return built[1]
+            listing = snapshot
+    return _build(exchange, listing)
@@ -6,6 +6,8 @@ Provides utility functions used across more than one module or sub module.
 # Import Built-Ins
 import logging
 import json
+import re
+from importlib import import_module
 from functools import wraps
 
 # Import Third-Party
@@ -17,24 +19,132 @@ import requests
 log = logging.getLogger(__name__)
 
 
+# JSON decoder backends, in order of preference
+JSON_BACKENDS = ('orjson', 'simdjson', 'ujson', 'json')
+
+_json_loads = json.loads
+json_backend = 'json'
+
+# Strings holding a JSON number - integer, decimal or exponent form - as
+# which most exchanges send prices and sizes
+NUMERIC_STRING = re.compile(r'-?(0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?$')
+
+
+def _make_stdlib_loads(parse_float):
+    decode = json.JSONDecoder(parse_float=parse_float).decode
+
+    def loads(s):
+        if isinstance(s, (bytes, bytearray)):
+            s = s.decode('utf-8')
+        return decode(s)
+    return loads
+
+
+def _make_numeric_string_parser(loads, parse_number):
+    """
+    Wraps the given loads function, passing all strings of the decoded
+    document which hold a JSON number to parse_number.
+    :param loads: callable, decoding a str or bytes JSON document
+    :param parse_number: callable, taking the number as str
+    :return: callable
+    """
+    match = NUMERIC_STRING.match
+
+    def convert(obj):
+        if isinstance(obj, dict):
+            return {key: convert(value) for key, value in obj.items()}
+        elif isinstance(obj, list):
+            return [convert(value) for value in obj]
+        elif isinstance(obj, str) and match(obj):
+            return parse_number(obj)
+        return obj
+
+    def parsing_loads(s):
+        return convert(loads(s))
+    return parsing_loads
+
+
+def set_json_decoder(backend=None, parse_float=None,
+                     parse_numeric_strings=None):
+    """
+    Sets the JSON decoder used by json_loads(), which all REST responses and
+    websocket clients use to decode their data.
+    By default, the fastest installed backend is selected.
+    :param backend: str, one of JSON_BACKENDS, or None to auto-select
+    :param parse_float: callable used to parse JSON floats, i.e.
+                        decimal.Decimal; None parses them to float. Only the
+                        'json' backend passes floats on as written, hence it
+                        is selected for any parse_float other than float.
+    :param parse_numeric_strings: callable used to parse strings holding a
+                                  JSON number, i.e. decimal.Decimal or
+                                  float - most exchanges send prices and
+                                  sizes as such. Integer, decimal and
+                                  exponent forms ("1", "0.1", "1e5") are all
+                                  converted, including numeric ids sent as
+                                  strings. None leaves strings as they are.
+                                  Supported by every backend.
+    :return: str, name of the selected backend
+    """
+    global _json_loads, json_backend
+    candidates = JSON_BACKENDS if backend is None else (backend,)
+    if parse_float not in (None, float):
+        # Other backends parse floats to float, losing precision
+        if backend not in (None, 'json'):
+            log.warning("set_json_decoder(): %s would round floats before "
+                        "passing them to parse_float, using json instead",
+                        backend)
+        candidates = ('json',)
+    for name in candidates:
+        if name not in JSON_BACKENDS:
+            raise ValueError("Unknown JSON backend %r! Must be one of %s" %
+                             (name, JSON_BACKENDS))
+        if name == 'json':
+            loads = _make_stdlib_loads(parse_float)
+        else:
+            try:
+                loads = import_module(name).loads
+            except ImportError:
+                if backend is not None:
+                    raise
+                continue
+        json_backend = name
+        break
+    if parse_numeric_strings is not None:
+        loads = _make_numeric_string_parser(loads, parse_numeric_strings)
+    _json_loads = loads
+    log.debug("set_json_decoder(): Decoding JSON using %s", json_backend)
+    return json_backend
+
+
+def json_loads(s):
+    """
+    Decodes the given JSON document using the decoder configured via
+    set_json_decoder().
+    :param s: str or bytes
+    :return: decoded json
+    """
+    return _json_loads(s)
+
+
+set_json_decoder()
+
+
 def return_api_response(formatter=None):
     """
-    Decorator, which Applies the referenced formatter (if available) to the
-    function output and adds it to the APIResponse Object's `formatted`
-    attribute.
+    Decorator, which sets the referenced formatter (if available) on the
+    function output; it is applied to the json data once the APIResponse
+    Object's `formatted` attribute is accessed.
+    If the decorated function returns an awaitable (i.e. when called on an
+    asynchronous client), a coroutine is returned instead, which processes the
+    response once awaited.
+    The decorated function accepts an additional `as_array` kwarg, which is
+    passed on to the formatter only, requesting array-backed output (see
+    bitex.formatters.arrays).
     :param formatter: bitex.formatters.Formatter() obj
     :return: bitex.api.response.APIResponse()
     """
     def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            try:
-                r = func(*args, **kwargs)
-            except Exception:
-                log.exception("return_api_response(): Error during call to %s(%s, %s)",
-                              func.__name__, args, kwargs)
-                raise
-
+        def process(r, *args, **kwargs):
             # Check Status
             try:
                 r.raise_for_status()
@@ -42,27 +152,38 @@ def return_api_response(formatter=None):
                 log.exception("return_api_response: HTTPError for url %s",
                               r.request.url)
 
-            #  Verify json data
+            # Format lazily, once r.formatted is accessed
+            if formatter is not None:
+                r.set_formatter(formatter, *args, **kwargs)
+
+            return r
+
+        async def process_awaitable(awaitable, *args, **kwargs):
             try:
-                data = r.json()
-            except json.JSONDecodeError:
-                log.error('return_api_response: Error while parsing json. '
-                          'Request url was: %s, result is: '
-                          '%s', r.request.url, r.text)
-                data = None
+                r = await awaitable
             except Exception:
-                log.exception("return_api_response(): Unexpected error while parsing "
-                              "json from %s", r.request.url)
+                log.exception("return_api_response(): Error during call to %s(%s, %s)",
+                              func.__name__, args, kwargs)
                 raise
+            return process(r, *args, **kwargs)
 
-            # Format, if available
-            if formatter is not None and data:
-                try:
-                    r.formatted = formatter(data, *args, **kwargs)
-                except Exception:
-                    log.exception("Error while applying formatter!")
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Formatter option, which must not be sent to the exchange
+            as_array = kwargs.pop('as_array', False)
+            try:
+                r = func(*args, **kwargs)
+            except Exception:
+                log.exception("return_api_response(): Error during call to %s(%s, %s)",
+                              func.__name__, args, kwargs)
+                raise
 
-            return r
+            if as_array:
+                kwargs['as_array'] = as_array
+            if hasattr(r, '__await__'):
+                # Returned by an asynchronous client - process once awaited
+                return process_awaitable(r, *args, **kwargs)
+            return process(r, *args, **kwargs)
 
         return wrapper
     return decorator
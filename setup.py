@@ -8,7 +8,9 @@ setup(name='BitEx', version=VERSION, author='Nils Diefenbach',
       url="https://github.com/nlsdfnbch/bitex.git",
       test_suite='nose.collector', tests_require=['nose'],
       packages=find_packages(exclude=['contrib', 'docs', 'tests*', 'travis']),
-      install_requires=['requests', 'websocket-client', 'autobahn', 'pusherclient'],
+      install_requires=['requests', 'websocket-client', 'autobahn', 'pusherclient',
+                        'sortedcontainers'],
+      extras_require={'aio': ['aiohttp'], 'numpy': ['numpy']},
       description='Python3-based API Framework for Crypto Exchanges',
       license='MIT',  classifiers=['Development Status :: 4 - Beta',
                                    'Intended Audience :: Developers'],
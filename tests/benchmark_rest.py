@@ -0,0 +1,145 @@
+"""
+Measures the throughput and latency of APIClient.query() against local
+MockExchange servers - i.e. bitex's own overhead, plus a local round trip.
+
+    python tests/benchmark_rest.py --requests 2000 --concurrency 4
+"""
+# Import Built-Ins
+import logging
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.REST import KrakenREST, BitfinexREST, BitstampREST, BittrexREST
+from bitex.api.REST import GDAXRest, GeminiREST, PoloniexREST, BterREST
+from bitex.api.REST import CCEXRest, CoincheckREST, CryptopiaREST, HitBTCREST
+from bitex.api.REST import ItbitREST, OKCoinREST, QuadrigaCXREST, QuoineREST
+from bitex.api.REST import RockTradingREST, VaultoroREST, YunbiREST
+from mock_exchange import MockExchange, INVALID_SIGNERS
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+# Dict of exchange: (client class, public query, private query), queries as
+# args of APIClient.query()
+QUERIES = {
+    'Kraken': (KrakenREST, ('GET', 'public/Ticker', False),
+               ('POST', 'private/Balance', True)),
+    'Bitfinex': (BitfinexREST, ('GET', 'pubticker/btcusd', False),
+                 ('POST', 'balances', True)),
+    'Bitstamp': (BitstampREST, ('GET', 'v2/ticker/btcusd/', False),
+                 ('POST', 'v2/balance/', True)),
+    'Bittrex': (BittrexREST, ('GET', 'public/getmarketsummary', False),
+                ('GET', 'account/getbalances', True)),
+    'GDAX': (GDAXRest, ('GET', 'products/BTC-USD/ticker', False),
+             ('GET', 'accounts', True)),
+    'Gemini': (GeminiREST, ('GET', 'pubticker/btcusd', False),
+               ('POST', 'balances', True)),
+    'Poloniex': (PoloniexREST, ('GET', 'public?command=returnTicker', False),
+                 ('POST', 'tradingApi', True)),
+    'Bter': (BterREST, ('GET', 'ticker/btc_cny', False),
+             ('POST', 'private/getfunds', True)),
+    'CCEX': (CCEXRest, ('GET', 'ltc-btc.json', False),
+             ('GET', 'api.html?a=getbalance', True)),
+    'Coincheck': (CoincheckREST, ('GET', 'ticker', False),
+                  ('GET', 'accounts/balance', True)),
+    'Cryptopia': (CryptopiaREST, ('GET', 'GetMarket/LTC_BTC', False),
+                  ('POST', 'GetBalance', True)),
+    'HitBTC': (HitBTCREST, ('GET', 'public/BTCUSD/ticker', False),
+               ('GET', 'trading/balance', True)),
+    'ItBit': (ItbitREST, ('GET', 'markets/XBTUSD/ticker', False),
+              ('GET', 'wallets', True)),
+    'OKCoin': (OKCoinREST, ('GET', 'ticker.do', False),
+               ('POST', 'userinfo.do', True)),
+    'QuadrigaCX': (QuadrigaCXREST, ('GET', 'ticker', False),
+                   ('POST', 'balance', True)),
+    'Quoine': (QuoineREST, ('GET', 'products/1', False),
+               ('GET', 'accounts/balance', True)),
+    'RockTrading': (RockTradingREST, ('GET', 'funds/BTCEUR/ticker', False),
+                    ('GET', 'balances', True)),
+    'Vaultoro': (VaultoroREST, ('GET', 'markets', False),
+                 ('GET', '1/balance', True)),
+    'Yunbi': (YunbiREST, ('GET', 'tickers/btccny.json', False),
+              ('GET', 'members/me.json', True))}
+
+
+def percentile(sorted_values, q):
+    """
+    Returns the q-th percentile of the given, sorted values.
+    :param sorted_values: list of float
+    :param q: float, between 0 and 100
+    :return: float
+    """
+    index = min(len(sorted_values) - 1,
+                int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def benchmark(exchange, requests=1000, concurrency=1, private=False,
+              latency=0.0):
+    """
+    Sends the given number of queries to a MockExchange and measures them.
+    :param exchange: str, one of QUERIES
+    :param requests: int, number of queries to send
+    :param concurrency: int, number of threads sending queries
+    :param private: bool, send signed queries instead of public ones
+    :param latency: float, seconds the server delays each response by
+    :return: dict of requests, errors, seconds, rate (requests / second) and
+             p50 and p99 latencies (seconds)
+    """
+    client_class, public_query, private_query = QUERIES[exchange]
+    method, endpoint, authenticate = private_query if private else public_query
+    with MockExchange(exchange, latency=latency) as server:
+        client = server.connect(client_class())
+        client.query(method, endpoint, authenticate)  # Open a connection
+
+        def timed_query(_):
+            started = time.perf_counter()
+            r = client.query(method, endpoint, authenticate)
+            return time.perf_counter() - started, r.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(timed_query, range(requests)))
+        seconds = time.perf_counter() - started
+
+    latencies = sorted(t for t, _ in results)
+    return {'requests': requests,
+            'errors': sum(1 for _, status in results if status != 200),
+            'seconds': seconds, 'rate': requests / seconds,
+            'p50': percentile(latencies, 50), 'p99': percentile(latencies, 99)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('exchanges', nargs='*', default=sorted(QUERIES))
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--latency', type=float, default=0.0)
+    args = parser.parse_args()
+
+    print('%-10s %-8s %8s %10s %10s %10s' % ('exchange', 'query', 'errors',
+                                             'req/s', 'p50 ms', 'p99 ms'))
+    for exchange in args.exchanges:
+        for private in (False, True):
+            if private and exchange in INVALID_SIGNERS:
+                print('%-10s %-8s skipped, %s' % (exchange, 'private',
+                                                  INVALID_SIGNERS[exchange]))
+                continue
+            try:
+                stats = benchmark(exchange, args.requests, args.concurrency,
+                                  private, args.latency)
+            except SystemError as e:  # i.e. QuoineREST without PyJWT
+                print('%-10s %-8s skipped, %s' % (exchange, '', e))
+                break
+            print('%-10s %-8s %8d %10.0f %10.2f %10.2f' % (
+                exchange, 'private' if private else 'public', stats['errors'],
+                stats['rate'], stats['p50'] * 1000, stats['p99'] * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,1045 @@
+"""
+Local stand-in for exchange REST APIs, for offline tests and benchmarks.
+
+A MockExchange serves one exchange's public and private endpoints, as called
+by its interface, on a local port. Public endpoints return generated tickers,
+order books and trades; private endpoints check the request's signature,
+as created by the client's sign(), and answer with an exchange-style error
+if it is invalid. Emulations verify the signature scheme each exchange
+documents, not whatever the client creates; clients failing this are listed in
+INVALID_SIGNERS. Latency and errors can be injected:
+
+    with MockExchange('Kraken', latency=0.01, error_rate=0.05) as exchange:
+        kraken = exchange.connect(Kraken())
+        kraken.ticker('XBTUSD')
+        kraken.balance()
+"""
+# Import Built-Ins
+import logging
+import base64
+import hashlib
+import hmac
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, quote_plus, urlsplit
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.REST.session import get_session
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+KEY = 'mock-key'
+# Kraken and GDAX expect base64 encoded secrets
+SECRET = base64.b64encode(b'mock-exchange-secret').decode('utf-8')
+USER_ID = 'mock-user'
+PASSPHRASE = 'mock-passphrase'
+
+
+class MockRequest:
+    """
+    A request as received by the mock server.
+    """
+    def __init__(self, method, target, headers, body, host):
+        self.method = method
+        self.target = target
+        split = urlsplit(target)
+        self.path = split.path
+        self.query = {k: v[0] for k, v in parse_qs(split.query).items()}
+        self.headers = headers
+        self.body = body
+        self.url = 'http://%s%s' % (host, target)
+
+    @property
+    def form(self):
+        return {k: v[0] for k, v in
+                parse_qs(self.body.decode('utf-8')).items()}
+
+    @property
+    def json(self):
+        return json.loads(self.body.decode('utf-8')) if self.body else {}
+
+
+def sign_hex(secret, message, digest):
+    return hmac.new(secret, message, digest).hexdigest()
+
+
+def sign_b64(secret, message, digest):
+    secret = base64.b64decode(secret)
+    return base64.b64encode(hmac.new(secret, message, digest).digest())
+
+
+def verify_jwt(token, secret):
+    """
+    Returns the payload of the given HS256 JSON Web Token, or None if its
+    signature is invalid.
+    """
+    try:
+        header, payload, signature = token.split('.')
+    except ValueError:
+        return None
+    expected = base64.urlsafe_b64encode(hmac.new(
+        secret, (header + '.' + payload).encode('utf-8'),
+        hashlib.sha256).digest()).rstrip(b'=').decode('utf-8')
+    if not hmac.compare_digest(expected, signature):
+        return None
+    payload += '=' * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload).decode('utf-8'))
+
+
+def levels(price, step, count, rng):
+    return [[round(price + step * i, 2), round(rng.uniform(0.01, 5), 8)]
+            for i in range(count)]
+
+
+##
+# Exchange Emulations
+##
+
+class Emulation:
+    """
+    Base class of exchange emulations: routes requests to public endpoints
+    by regex, and treats all requests carrying a signature as private.
+    """
+    # List of (regex matched against the request target, name of method)
+    routes = []
+
+    def __init__(self, rng):
+        self.rng = rng
+        self._routes = [(re.compile(pattern), getattr(self, name))
+                        for pattern, name in self.routes]
+
+    def signed(self, request):
+        """
+        Returns whether the request is meant to be authenticated.
+        """
+        raise NotImplementedError()
+
+    def verify(self, request):
+        """
+        Returns whether the request's signature is valid.
+        """
+        raise NotImplementedError()
+
+    def route(self, request):
+        """
+        Returns the status and body answering the request.
+        """
+        if self.signed(request):
+            if not self.verify(request):
+                return 401, self.error('Invalid signature')
+            return 200, self.private(request)
+        for pattern, handler in self._routes:
+            if pattern.search(request.target):
+                return 200, handler(request)
+        return 404, self.error('Unknown endpoint %s' % request.target)
+
+    def book(self, depth=50):
+        mid = self.rng.uniform(1000, 10000)
+        return (levels(mid - 0.5, -0.5, depth, self.rng),
+                levels(mid + 0.5, 0.5, depth, self.rng))
+
+    def error(self, message):
+        return {'error': message}
+
+    def private(self, request):
+        return {}
+
+
+class KrakenEmulation(Emulation):
+    routes = [('/public/Time', 'time'), ('/public/Ticker', 'ticker'),
+              ('/public/Depth', 'depth'), ('/public/Trades', 'trades')]
+
+    def signed(self, request):
+        return 'API-Sign' in request.headers
+
+    def verify(self, request):
+        nonce = request.form.get('nonce', '')
+        message = (request.path.encode('utf-8') +
+                   hashlib.sha256(nonce.encode('utf-8') +
+                                  request.body).digest())
+        return (request.headers.get('API-Key') == KEY and
+                request.headers['API-Sign'].encode('utf-8') ==
+                sign_b64(SECRET, message, hashlib.sha512))
+
+    def error(self, message):
+        return {'error': ['EAPI:%s' % message]}
+
+    def time(self, request):
+        return {'error': [], 'result': {'unixtime': int(time.time())}}
+
+    def ticker(self, request):
+        pair = request.query.get('pair', 'XXBTZUSD')
+        p = self.rng.uniform(1000, 10000)
+        return {'error': [], 'result': {pair: {
+            'a': [str(p + 1), '1', '1.0'], 'b': [str(p), '1', '1.0'],
+            'c': [str(p), '0.1'], 'v': ['100', '1000'], 'p': [str(p), str(p)],
+            't': [10, 100], 'l': [str(p - 50), str(p - 100)],
+            'h': [str(p + 50), str(p + 100)], 'o': str(p)}}}
+
+    def depth(self, request):
+        pair = request.query.get('pair', 'XXBTZUSD')
+        bids, asks = self.book()
+        ts = int(time.time())
+        return {'error': [], 'result': {pair: {
+            'bids': [[str(p), str(s), ts] for p, s in bids],
+            'asks': [[str(p), str(s), ts] for p, s in asks]}}}
+
+    def trades(self, request):
+        pair = request.query.get('pair', 'XXBTZUSD')
+        bids, asks = self.book(10)
+        return {'error': [], 'result': {
+            pair: [[str(p), str(s), time.time(), 'b', 'l', '']
+                   for p, s in bids], 'last': str(int(time.time() * 1e9))}}
+
+    def private(self, request):
+        return {'error': [], 'result': {}}
+
+
+class BitfinexEmulation(Emulation):
+    routes = [('/pubticker/', 'ticker'), ('/book/', 'order_book'),
+              ('/trades/', 'trades')]
+    headers = ('X-BFX-APIKEY', 'X-BFX-PAYLOAD', 'X-BFX-SIGNATURE')
+
+    def signed(self, request):
+        return self.headers[2] in request.headers
+
+    def verify(self, request):
+        key, payload, signature = (request.headers.get(h, '')
+                                   for h in self.headers)
+        return (key == KEY and 'nonce' in json.loads(
+                    base64.b64decode(payload).decode('utf-8')) and
+                signature == sign_hex(SECRET.encode('utf-8'),
+                                      payload.encode('utf-8'),
+                                      hashlib.sha384))
+
+    def error(self, message):
+        return {'message': message}
+
+    def ticker(self, request):
+        p = self.rng.uniform(1000, 10000)
+        return {'mid': str(p), 'bid': str(p - 0.5), 'ask': str(p + 0.5),
+                'last_price': str(p), 'low': str(p - 100),
+                'high': str(p + 100), 'volume': '1000',
+                'timestamp': str(time.time())}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        ts = str(time.time())
+        return {side: [{'price': str(p), 'amount': str(s), 'timestamp': ts}
+                       for p, s in quotes]
+                for side, quotes in (('bids', bids), ('asks', asks))}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return [{'timestamp': int(time.time()), 'tid': i, 'price': str(p),
+                 'amount': str(s), 'exchange': 'bitfinex', 'type': 'buy'}
+                for i, (p, s) in enumerate(bids)]
+
+
+class GeminiEmulation(BitfinexEmulation):
+    headers = ('X-GEMINI-APIKEY', 'X-GEMINI-PAYLOAD', 'X-GEMINI-SIGNATURE')
+
+    def error(self, message):
+        return {'result': 'error', 'reason': 'InvalidSignature',
+                'message': message}
+
+    def ticker(self, request):
+        p = self.rng.uniform(1000, 10000)
+        return {'bid': str(p - 0.5), 'ask': str(p + 0.5), 'last': str(p),
+                'volume': {'BTC': '1000', 'USD': str(1000 * p),
+                           'timestamp': int(time.time() * 1000)}}
+
+
+class BitstampEmulation(Emulation):
+    routes = [('/ticker/', 'ticker'), ('/order_book/', 'order_book'),
+              ('/transactions/', 'trades')]
+
+    def signed(self, request):
+        return request.method == 'POST'
+
+    def verify(self, request):
+        form = request.form
+        message = (form.get('nonce', '') + USER_ID + KEY).encode('utf-8')
+        return (form.get('key') == KEY and form.get('signature') ==
+                sign_hex(SECRET.encode('utf-8'), message,
+                         hashlib.sha256).upper())
+
+    def error(self, message):
+        return {'status': 'error', 'reason': message}
+
+    def ticker(self, request):
+        p = self.rng.uniform(1000, 10000)
+        return {'bid': str(p - 0.5), 'ask': str(p + 0.5), 'last': str(p),
+                'high': str(p + 100), 'low': str(p - 100), 'open': str(p),
+                'vwap': str(p), 'volume': '1000',
+                'timestamp': str(int(time.time()))}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'timestamp': str(int(time.time())),
+                'bids': [[str(p), str(s)] for p, s in bids],
+                'asks': [[str(p), str(s)] for p, s in asks]}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return [{'date': str(int(time.time())), 'tid': i, 'price': str(p),
+                 'amount': str(s), 'type': 0}
+                for i, (p, s) in enumerate(bids)]
+
+
+class BittrexEmulation(Emulation):
+    routes = [('/public/getmarketsummary', 'ticker'),
+              ('/public/getorderbook', 'order_book'),
+              ('/public/getmarkethistory', 'trades')]
+
+    def signed(self, request):
+        return 'apisign' in request.headers
+
+    def verify(self, request):
+        return (request.query.get('apikey') == KEY and
+                request.headers['apisign'] ==
+                sign_hex(SECRET.encode('utf-8'), request.url.encode('utf-8'),
+                         hashlib.sha512))
+
+    def error(self, message):
+        return {'success': False, 'message': message, 'result': None}
+
+    def ticker(self, request):
+        p = self.rng.uniform(0.01, 0.1)
+        return {'success': True, 'message': '', 'result': [{
+            'MarketName': request.query.get('market', 'BTC-LTC'),
+            'High': p + 0.01, 'Low': p - 0.01, 'Volume': 1000, 'Last': p,
+            'Bid': p - 0.0001, 'Ask': p + 0.0001, 'PrevDay': p,
+            'TimeStamp': time.strftime('%Y-%m-%dT%H:%M:%S')}]}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'success': True, 'message': '', 'result': {
+            'buy': [{'Quantity': s, 'Rate': p} for p, s in bids],
+            'sell': [{'Quantity': s, 'Rate': p} for p, s in asks]}}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return {'success': True, 'message': '', 'result': [
+            {'Id': i, 'TimeStamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+             'Quantity': s, 'Price': p, 'Total': p * s, 'FillType': 'FILL',
+             'OrderType': 'BUY'} for i, (p, s) in enumerate(bids)]}
+
+    def private(self, request):
+        return {'success': True, 'message': '', 'result': {}}
+
+
+class GDAXEmulation(Emulation):
+    routes = [(r'/products/[^/]+/ticker', 'ticker'),
+              (r'/products/[^/]+/book', 'order_book'),
+              (r'/products/[^/]+/trades', 'trades'), ('^/time', 'time')]
+
+    def signed(self, request):
+        return 'CB-ACCESS-SIGN' in request.headers
+
+    def verify(self, request):
+        headers = request.headers
+        message = (headers.get('CB-ACCESS-TIMESTAMP', '') + request.method +
+                   request.target + request.body.decode('utf-8'))
+        return (headers.get('CB-ACCESS-KEY') == KEY and
+                headers.get('CB-ACCESS-PASSPHRASE') == PASSPHRASE and
+                headers['CB-ACCESS-SIGN'].encode('utf-8') ==
+                sign_b64(SECRET, message.encode('utf-8'), hashlib.sha256))
+
+    def error(self, message):
+        return {'message': message}
+
+    def time(self, request):
+        return {'iso': time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'epoch': time.time()}
+
+    def ticker(self, request):
+        p = self.rng.uniform(1000, 10000)
+        return {'trade_id': 1, 'price': str(p), 'size': '0.1',
+                'bid': str(p - 0.5), 'ask': str(p + 0.5), 'volume': '1000',
+                'time': time.strftime('%Y-%m-%dT%H:%M:%SZ')}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'sequence': int(time.time() * 1000),
+                'bids': [[str(p), str(s), 1] for p, s in bids],
+                'asks': [[str(p), str(s), 1] for p, s in asks]}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return [{'time': time.strftime('%Y-%m-%dT%H:%M:%SZ'), 'trade_id': i,
+                 'price': str(p), 'size': str(s), 'side': 'buy'}
+                for i, (p, s) in enumerate(bids)]
+
+
+class PoloniexEmulation(Emulation):
+    routes = [('command=returnTicker', 'ticker'),
+              ('command=returnOrderBook', 'order_book'),
+              ('command=returnTradeHistory', 'trades')]
+
+    def signed(self, request):
+        return 'Sign' in request.headers
+
+    def verify(self, request):
+        return (request.headers.get('Key') == KEY and
+                'nonce' in request.form and request.headers['Sign'] ==
+                sign_hex(SECRET.encode('utf-8'), request.body,
+                         hashlib.sha512))
+
+    def ticker(self, request):
+        p = self.rng.uniform(0.01, 0.1)
+        return {'BTC_LTC': {'last': str(p), 'lowestAsk': str(p + 0.0001),
+                            'highestBid': str(p - 0.0001),
+                            'percentChange': '0.01', 'baseVolume': '100',
+                            'quoteVolume': '1000', 'high24hr': str(p + 0.01),
+                            'low24hr': str(p - 0.01)}}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'bids': [[str(p), s] for p, s in bids],
+                'asks': [[str(p), s] for p, s in asks], 'isFrozen': '0',
+                'seq': int(time.time())}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return [{'globalTradeID': i, 'tradeID': i, 'type': 'buy',
+                 'date': time.strftime('%Y-%m-%d %H:%M:%S'), 'rate': str(p),
+                 'amount': str(s), 'total': str(p * s)}
+                for i, (p, s) in enumerate(bids)]
+
+
+class BterEmulation(Emulation):
+    routes = [('/ticker/', 'ticker'), ('/depth/', 'order_book'),
+              ('/trade/', 'trades')]
+
+    def signed(self, request):
+        return '/private/' in request.path or 'SIGN' in request.headers
+
+    def verify(self, request):
+        return (request.headers.get('KEY') == KEY and
+                'nonce' in request.form and request.headers.get('SIGN') ==
+                sign_hex(SECRET.encode('utf-8'), request.body,
+                         hashlib.sha512))
+
+    def error(self, message):
+        return {'result': 'false', 'message': message}
+
+    def ticker(self, request):
+        p = self.rng.uniform(1000, 10000)
+        return {'result': 'true', 'last': p, 'high': p + 100, 'low': p - 100,
+                'avg': p, 'sell': p + 0.5, 'buy': p - 0.5, 'vol_btc': 100,
+                'vol_cny': 100 * p}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'result': 'true', 'bids': bids, 'asks': asks}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return {'result': 'true', 'elapsed': '0ms', 'data': [
+            {'date': str(int(time.time())), 'tid': str(i), 'price': p,
+             'amount': s, 'type': 'buy'} for i, (p, s) in enumerate(bids)]}
+
+    def private(self, request):
+        return {'result': 'true', 'available_funds': {}, 'locked_funds': {}}
+
+
+class CCEXEmulation(BittrexEmulation):
+    routes = [(r'\.json', 'ticker'), ('a=getorderbook', 'order_book'),
+              ('a=getmarkethistory', 'trades')]
+
+    def signed(self, request):
+        return '/api.html' in request.path or 'apisign' in request.headers
+
+    def ticker(self, request):
+        p = self.rng.uniform(0.01, 0.1)
+        return {'ticker': {'high': p + 0.01, 'low': p - 0.01, 'avg': p,
+                           'lastbuy': p, 'lastsell': p, 'buy': p - 0.0001,
+                           'sell': p + 0.0001, 'lastprice': p,
+                           'updated': int(time.time())}}
+
+
+class CoincheckEmulation(Emulation):
+    routes = [('/ticker', 'ticker'), ('/order_books', 'order_book'),
+              ('/trades', 'trades')]
+
+    def signed(self, request):
+        return 'ACCESS-SIGNATURE' in request.headers
+
+    def verify(self, request):
+        headers = request.headers
+        message = (headers.get('ACCESS-NONCE', '').encode('utf-8') +
+                   request.url.encode('utf-8') + request.body)
+        return (headers.get('ACCESS-KEY') == KEY and
+                headers['ACCESS-SIGNATURE'] ==
+                sign_hex(SECRET.encode('utf-8'), message, hashlib.sha256))
+
+    def error(self, message):
+        return {'success': False, 'error': message}
+
+    def ticker(self, request):
+        p = self.rng.uniform(100000, 1000000)
+        return {'last': p, 'bid': p - 1, 'ask': p + 1, 'high': p + 1000,
+                'low': p - 1000, 'volume': '1000',
+                'timestamp': int(time.time())}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'bids': [[str(p), str(s)] for p, s in bids],
+                'asks': [[str(p), str(s)] for p, s in asks]}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return {'success': True, 'data': [
+            {'id': i, 'amount': str(s), 'rate': str(p), 'pair': 'btc_jpy',
+             'order_type': 'buy',
+             'created_at': time.strftime('%Y-%m-%dT%H:%M:%S.000Z')}
+            for i, (p, s) in enumerate(bids)]}
+
+    def private(self, request):
+        return {'success': True}
+
+
+class CryptopiaEmulation(Emulation):
+    routes = [('/GetMarket/', 'ticker'), ('/GetMarkets', 'markets'),
+              ('/GetMarketOrders/', 'order_book'),
+              ('/GetMarketHistory/', 'trades')]
+
+    def signed(self, request):
+        return request.method == 'POST'
+
+    def verify(self, request):
+        try:
+            key, signature, nonce = request.headers.get(
+                'Authorization', '').split('amx ', 1)[1].split(':')
+        except (IndexError, ValueError):
+            return False
+        content = base64.b64encode(hashlib.md5(request.body).digest())
+        message = (KEY + 'POST' + quote_plus(request.url).lower() + nonce +
+                   content.decode('utf-8'))
+        return (key == KEY and signature.encode('utf-8') ==
+                sign_b64(SECRET, message.encode('utf-8'), hashlib.sha256))
+
+    def error(self, message):
+        return {'Success': False, 'Error': message, 'Data': None}
+
+    def _market(self):
+        p = self.rng.uniform(0.01, 0.1)
+        return {'TradePairId': 100, 'Label': 'LTC/BTC', 'AskPrice': p + 0.0001,
+                'BidPrice': p - 0.0001, 'Low': p - 0.01, 'High': p + 0.01,
+                'Volume': 1000, 'LastPrice': p, 'BaseVolume': 1000 * p}
+
+    def ticker(self, request):
+        return {'Success': True, 'Message': None, 'Data': self._market()}
+
+    def markets(self, request):
+        return {'Success': True, 'Message': None, 'Data': [self._market()]}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'Success': True, 'Message': None, 'Data': {
+            side: [{'TradePairId': 100, 'Label': 'LTC/BTC', 'Price': p,
+                    'Volume': s, 'Total': p * s} for p, s in quotes]
+            for side, quotes in (('Buy', bids), ('Sell', asks))}}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return {'Success': True, 'Message': None, 'Data': [
+            {'TradePairId': 100, 'Label': 'LTC/BTC', 'Type': 'Buy',
+             'Price': p, 'Amount': s, 'Total': p * s,
+             'Timestamp': int(time.time())} for p, s in bids]}
+
+    def private(self, request):
+        return {'Success': True, 'Error': None, 'Data': []}
+
+
+class HitBTCEmulation(Emulation):
+    routes = [('/orderbook', 'order_book'), ('/ticker', 'ticker'),
+              ('/trades', 'trades')]
+
+    def signed(self, request):
+        return '/trading/' in request.path or 'X-Signature' in request.headers
+
+    def verify(self, request):
+        message = request.target.encode('utf-8') + request.body
+        return (request.query.get('apikey') == KEY and
+                'nonce' in request.query and
+                request.headers.get('X-Signature') ==
+                sign_hex(SECRET.encode('utf-8'), message, hashlib.sha512))
+
+    def error(self, message):
+        return {'error': {'code': 'AuthorizationFailed', 'message': message}}
+
+    def ticker(self, request):
+        p = self.rng.uniform(1000, 10000)
+        return {'ask': str(p + 0.5), 'bid': str(p - 0.5), 'last': str(p),
+                'low': str(p - 100), 'high': str(p + 100), 'open': str(p),
+                'volume': '1000', 'volume_quote': str(1000 * p),
+                'timestamp': int(time.time() * 1000)}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'bids': [[str(p), str(s)] for p, s in bids],
+                'asks': [[str(p), str(s)] for p, s in asks]}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return {'trades': [[i, str(p), str(s), int(time.time() * 1000)]
+                           for i, (p, s) in enumerate(bids)]}
+
+    def private(self, request):
+        return {'balance': []}
+
+
+class ItBitEmulation(Emulation):
+    routes = [(r'/markets/[^/]+/ticker', 'ticker'),
+              (r'/markets/[^/]+/order_book', 'order_book'),
+              (r'/markets/[^/]+/trades', 'trades')]
+
+    def signed(self, request):
+        return 'Authorization' in request.headers
+
+    def verify(self, request):
+        headers = request.headers
+        key, _, signature = headers['Authorization'].partition(':')
+        nonce = headers.get('X-Auth-Nonce', '')
+        message = json.dumps([request.method, request.url,
+                              request.body.decode('utf-8'), nonce,
+                              headers.get('X-Auth-Timestamp', '')],
+                             separators=(',', ':'))
+        digest = hashlib.sha256((nonce + message).encode('utf-8')).digest()
+        expected = base64.b64encode(hmac.new(
+            SECRET.encode('utf-8'), request.url.encode('utf-8') + digest,
+            hashlib.sha512).digest())
+        return key == KEY and signature.encode('utf-8') == expected
+
+    def error(self, message):
+        return {'code': 10002, 'description': message}
+
+    def ticker(self, request):
+        p = self.rng.uniform(1000, 10000)
+        return {'pair': 'XBTUSD', 'bid': str(p - 0.5), 'bidAmt': '1',
+                'ask': str(p + 0.5), 'askAmt': '1', 'lastPrice': str(p),
+                'lastAmt': '0.1', 'volume24h': '1000', 'volumeToday': '100',
+                'high24h': str(p + 100), 'low24h': str(p - 100),
+                'openToday': str(p), 'vwapToday': str(p), 'vwap24h': str(p),
+                'serverTimeUTC': time.strftime('%Y-%m-%dT%H:%M:%S.000Z')}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'bids': [[str(p), str(s)] for p, s in bids],
+                'asks': [[str(p), str(s)] for p, s in asks]}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return {'count': len(bids), 'recentTrades': [
+            {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+             'matchNumber': str(i), 'price': str(p), 'amount': str(s)}
+            for i, (p, s) in enumerate(bids)]}
+
+    def private(self, request):
+        return []
+
+
+class OKCoinEmulation(Emulation):
+    routes = [('/ticker.do', 'ticker'), ('/depth.do', 'order_book'),
+              ('/trades.do', 'trades')]
+
+    def signed(self, request):
+        return request.method == 'POST'
+
+    def verify(self, request):
+        form = request.form
+        signature = form.pop('sign', None)
+        message = '&'.join('%s=%s' % (k, form[k]) for k in sorted(form))
+        message += '&secret_key=' + SECRET
+        return (form.get('api_key') == KEY and signature ==
+                hashlib.md5(message.encode('utf-8')).hexdigest().upper())
+
+    def error(self, message):
+        return {'result': False, 'error_code': 10005}
+
+    def ticker(self, request):
+        p = self.rng.uniform(1000, 10000)
+        return {'date': str(int(time.time())), 'ticker': {
+            'buy': str(p - 0.5), 'sell': str(p + 0.5), 'last': str(p),
+            'high': str(p + 100), 'low': str(p - 100), 'vol': '1000'}}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'bids': bids, 'asks': asks[::-1]}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return [{'date': int(time.time()), 'date_ms': int(time.time() * 1000),
+                 'tid': i, 'price': p, 'amount': s, 'type': 'buy'}
+                for i, (p, s) in enumerate(bids)]
+
+    def private(self, request):
+        return {'result': True, 'info': {'funds': {}}}
+
+
+class QuadrigaCXEmulation(BitstampEmulation):
+    routes = [('/ticker', 'ticker'), ('/order_book', 'order_book'),
+              ('/transactions', 'trades')]
+
+    def verify(self, request):
+        try:
+            data = request.json
+        except ValueError:
+            return False
+        message = (str(data.get('nonce', '')) + USER_ID + KEY).encode('utf-8')
+        return (data.get('key') == KEY and data.get('signature') ==
+                sign_hex(SECRET.encode('utf-8'), message, hashlib.sha256))
+
+    def error(self, message):
+        return {'error': {'code': 106, 'message': message}}
+
+
+class QuoineEmulation(Emulation):
+    routes = [(r'/products/[^/]+/price_levels', 'order_book'),
+              (r'/products/[^/?]+', 'ticker'), ('/products', 'products'),
+              ('/executions', 'trades')]
+
+    def signed(self, request):
+        return 'X-Quoine-Auth' in request.headers
+
+    def verify(self, request):
+        payload = verify_jwt(request.headers['X-Quoine-Auth'],
+                             SECRET.encode('utf-8'))
+        return (payload is not None and payload.get('token_id') == KEY and
+                'nonce' in payload and payload.get('path') == request.target)
+
+    def error(self, message):
+        return {'message': message}
+
+    def _product(self, product_id=1):
+        p = self.rng.uniform(1000, 10000)
+        return {'id': product_id, 'product_type': 'CurrencyPair',
+                'currency_pair_code': 'BTCUSD', 'market_ask': p + 0.5,
+                'market_bid': p - 0.5, 'last_traded_price': p,
+                'volume_24h': 1000, 'high_market_ask': p + 100,
+                'low_market_bid': p - 100}
+
+    def ticker(self, request):
+        return self._product(request.path.rstrip('/').rsplit('/', 1)[1])
+
+    def products(self, request):
+        return [self._product()]
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'buy_price_levels': [[str(p), str(s)] for p, s in bids],
+                'sell_price_levels': [[str(p), str(s)] for p, s in asks]}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return {'current_page': 1, 'total_pages': 1, 'models': [
+            {'id': i, 'quantity': str(s), 'price': str(p),
+             'taker_side': 'buy', 'created_at': int(time.time())}
+            for i, (p, s) in enumerate(bids)]}
+
+    def private(self, request):
+        return []
+
+
+class RockTradingEmulation(Emulation):
+    routes = [('/ticker', 'ticker'), ('/orderbook', 'order_book'),
+              ('/trades', 'trades')]
+
+    def signed(self, request):
+        return re.search('/balances|/orders|/atms/', request.path) is not None
+
+    def verify(self, request):
+        headers = request.headers
+        message = (headers.get('X-TRT-NONCE', '') + request.url).encode('utf-8')
+        return (headers.get('X-TRT-KEY') == KEY and
+                headers.get('X-TRT-SIGN') ==
+                sign_hex(SECRET.encode('utf-8'), message, hashlib.sha512))
+
+    def error(self, message):
+        return {'errors': [{'code': 1, 'message': message}]}
+
+    def ticker(self, request):
+        p = self.rng.uniform(1000, 10000)
+        return {'fund_id': 'BTCEUR', 'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'bid': p - 0.5, 'ask': p + 0.5, 'last': p, 'volume': 1000 * p,
+                'volume_traded': 1000, 'open': p, 'high': p + 100,
+                'low': p - 100, 'close': p}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'fund_id': 'BTCEUR',
+                'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'bids': [{'price': p, 'amount': s} for p, s in bids],
+                'asks': [{'price': p, 'amount': s} for p, s in asks]}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return {'meta': {'total_count': len(bids)}, 'trades': [
+            {'id': i, 'fund_id': 'BTCEUR', 'amount': s, 'price': p,
+             'side': 'buy', 'dark': False,
+             'date': time.strftime('%Y-%m-%dT%H:%M:%S')}
+            for i, (p, s) in enumerate(bids)]}
+
+    def private(self, request):
+        return {'balances': []}
+
+
+class VaultoroEmulation(Emulation):
+    routes = [('/markets', 'ticker'), ('/orderbook', 'order_book'),
+              ('/latesttrades', 'trades')]
+
+    def signed(self, request):
+        return request.path.startswith('/1/')
+
+    def verify(self, request):
+        return (request.query.get('apikey') == KEY and
+                'nonce' in request.query and
+                request.headers.get('X-Signature') ==
+                sign_hex(SECRET.encode('utf-8'), request.url.encode('utf-8'),
+                         hashlib.sha256))
+
+    def error(self, message):
+        return {'status': 'error', 'message': message}
+
+    def ticker(self, request):
+        p = self.rng.uniform(0.001, 0.01)
+        return {'status': 'success', 'data': {
+            'MarketCurrency': 'GLD', 'BaseCurrency': 'BTC',
+            'MarketName': 'GLD-BTC', 'LastPrice': p, '24hLow': p - 0.0001,
+            '24hHigh': p + 0.0001, '24hVolume': 100}}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {'status': 'success', 'data': [
+            {'b': [{'Gold_Price': p, 'Gold_Amount': s} for p, s in bids]},
+            {'s': [{'Gold_Price': p, 'Gold_Amount': s} for p, s in asks]}]}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return [{'Time': time.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                 'Gold_Price': p, 'Gold_Volume': s, 'Type': 'buy'}
+                for p, s in bids]
+
+    def private(self, request):
+        return {'status': 'success', 'data': []}
+
+
+class YunbiEmulation(Emulation):
+    routes = [('/tickers', 'ticker'), ('/order_book', 'order_book'),
+              ('/trades', 'trades')]
+
+    def signed(self, request):
+        return 'access_key' in request.query or 'access_key' in request.form
+
+    def verify(self, request):
+        params = dict(request.query, **request.form)
+        signature = params.pop('signature', None)
+        message = '%s|%s|%s' % (request.method, request.path, '&'.join(
+            '%s=%s' % (k, params[k]) for k in sorted(params)))
+        return (params.get('access_key') == KEY and 'tonce' in params and
+                signature == sign_hex(SECRET.encode('utf-8'),
+                                      message.encode('utf-8'),
+                                      hashlib.sha256))
+
+    def error(self, message):
+        return {'error': {'code': 2005, 'message': message}}
+
+    def ticker(self, request):
+        p = self.rng.uniform(1000, 10000)
+        return {'at': int(time.time()), 'ticker': {
+            'buy': str(p - 0.5), 'sell': str(p + 0.5), 'last': str(p),
+            'low': str(p - 100), 'high': str(p + 100), 'vol': '1000'}}
+
+    def order_book(self, request):
+        bids, asks = self.book()
+        return {side: [{'price': str(p), 'volume': str(s),
+                        'remaining_volume': str(s), 'state': 'wait'}
+                       for p, s in quotes]
+                for side, quotes in (('bids', bids), ('asks', asks))}
+
+    def trades(self, request):
+        bids, asks = self.book(10)
+        return [{'id': i, 'price': str(p), 'volume': str(s),
+                 'funds': str(p * s), 'market': 'btccny', 'side': 'up',
+                 'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ')}
+                for i, (p, s) in enumerate(bids)]
+
+    def private(self, request):
+        return {'sn': USER_ID, 'accounts': []}
+
+
+EMULATIONS = {'Kraken': KrakenEmulation, 'Bitfinex': BitfinexEmulation,
+              'Gemini': GeminiEmulation, 'Bitstamp': BitstampEmulation,
+              'Bittrex': BittrexEmulation, 'GDAX': GDAXEmulation,
+              'Poloniex': PoloniexEmulation, 'Bter': BterEmulation,
+              'CCEX': CCEXEmulation, 'Coincheck': CoincheckEmulation,
+              'Cryptopia': CryptopiaEmulation, 'HitBTC': HitBTCEmulation,
+              'ItBit': ItBitEmulation, 'OKCoin': OKCoinEmulation,
+              'QuadrigaCX': QuadrigaCXEmulation, 'Quoine': QuoineEmulation,
+              'RockTrading': RockTradingEmulation,
+              'Vaultoro': VaultoroEmulation, 'Yunbi': YunbiEmulation}
+
+# Exchanges whose client's sign() does not create the signature the exchange
+# documents, hence whose private queries are rejected by the emulation, or
+# fail before being sent; name: reason
+INVALID_SIGNERS = {
+    'Bter': "signs the query string instead of a form body carrying the "
+            "nonce, and sends the signature as 'Key'",
+    'CCEX': "passes str to hmac.new() and raises a TypeError",
+    'Coincheck': "signs the endpoint path instead of the full url",
+    'HitBTC': "appends 'api' to the host, yielding an invalid url, and sends "
+              "'Api-signature' instead of 'X-Signature'",
+    'ItBit': "signs a dict instead of the (empty) JSON body string",
+    'OKCoin': "sends ACCESS-* headers instead of an MD5 'sign' parameter",
+    'QuadrigaCX': "sends an hmac object instead of its hexdigest, as headers "
+                  "instead of the JSON body, to the base url",
+    'Quoine': "signs and requests the path without its leading slash",
+    'RockTrading': "signs with SHA384 and sends X-TRT-APIKEY/X-TRT-SIGNATURE "
+                   "instead of SHA512 X-TRT-KEY/X-TRT-SIGN",
+    'Vaultoro': "drops the nonce and apikey from the query",
+    'Yunbi': "passes str to hmac.new() and raises a TypeError"}
+
+
+##
+# Server
+##
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep connections alive, like the exchanges do; headers and body are
+    # written separately, hence Nagle's algorithm would delay the body
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def handle_request(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        request = MockRequest(self.command, self.path, self.headers, body,
+                              self.headers.get('Host', ''))
+        status, payload = self.server.exchange.respond(request)
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_DELETE = do_PUT = do_HEAD = handle_request
+
+    def log_message(self, format, *args):
+        log.debug("MockExchange: " + format, *args)
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class MockExchange:
+    """
+    Local HTTP server emulating an exchange's REST API.
+    """
+    def __init__(self, exchange, latency=0.0, error_rate=0.0,
+                 error_status=500, seed=0):
+        """
+        Initialize Object.
+        :param exchange: str, one of EMULATIONS
+        :param latency: float, seconds to delay each response by, or callable
+                        returning them
+        :param error_rate: float, share of requests answered with an error
+        :param error_status: int, HTTP status of injected errors
+        :param seed: int, seed of generated responses and injected errors
+        """
+        self.name = exchange
+        self.rng = random.Random(seed)
+        self.emulation = EMULATIONS[exchange](self.rng)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = []
+        self.rejected = 0
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.url = None
+
+    def start(self):
+        self._server = _Server(('127.0.0.1', 0), _Handler)
+        self._server.exchange = self
+        self.url = 'http://127.0.0.1:%s' % self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        args=(0.05,), daemon=True,
+                                        name='MockExchange %s' % self.name)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def fail_next(self, count=1, status=None):
+        """
+        Answers the next count requests with an error.
+        :param count: int
+        :param status: int, HTTP status; defaults to error_status
+        :return:
+        """
+        with self._lock:
+            self._failures.extend([status or self.error_status] * count)
+
+    def connect(self, client):
+        """
+        Points the given REST client or interface at this server, with the
+        mock's credentials and without rate limiting.
+        :param client: APIClient obj
+        :return: client
+        """
+        client.uri = self.url
+        client.session = get_session(self.url)
+        client.rate_limiter = None
+        client.key, client.secret = KEY, SECRET
+        client.id = client.client_id = client.userId = USER_ID
+        client.passphrase = PASSPHRASE
+        return client
+
+    def respond(self, request):
+        """
+        Returns the status and payload answering the given request.
+        :param request: MockRequest obj
+        :return: tuple of int, json-serializable obj
+        """
+        with self._lock:
+            self.requests.append(request)
+            failure = self._failures.pop(0) if self._failures else None
+            if failure is None and self.error_rate:
+                if self.rng.random() < self.error_rate:
+                    failure = self.error_status
+        delay = self.latency() if callable(self.latency) else self.latency
+        if delay:
+            time.sleep(delay)
+        if failure is not None:
+            return failure, self.emulation.error('Injected error')
+        status, payload = self.emulation.route(request)
+        if status == 401:
+            with self._lock:
+                self.rejected += 1
+        return status, payload
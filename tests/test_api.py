@@ -3,12 +3,17 @@ import logging
 import unittest
 import requests
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 # Import Third-Party
 
 # Import Homebrew
 from bitex.api.REST.api import APIClient
 from bitex.api.REST import KrakenREST, CryptopiaREST, CCEXRest, GeminiREST
 from bitex.api.REST import YunbiREST, RockTradingREST
+from bitex.api.REST.ratelimit import TokenBucket, RateLimiter
+from bitex.api.REST.cache import ResponseCache
+from bitex.api.REST.response import APIResponse
 
 log = logging.getLogger(__name__)
 
@@ -171,3 +176,124 @@ class TheRockTradingAPITest(APITests):
     def test_private_query(self):
         self.fail("Test not implemented!")
 
+
+
+class SessionTests(unittest.TestCase):
+    """
+    Tests that clients share pooled sessions per host.
+    """
+    def test_clients_of_same_host_share_session(self):
+        a = KrakenREST()
+        b = KrakenREST(key='12345', secret='abcde')
+        self.assertIs(a.session, b.session)
+        self.assertIsNot(a.session, GeminiREST().session)
+
+    def test_configure_pool_keeps_session(self):
+        a = KrakenREST()
+        session = a.session
+        a.configure_pool(pool_connections=2, pool_maxsize=20)
+        self.assertIs(a.session, session)
+        adapter = a.session.get_adapter('https://api.kraken.com/0/public/Time')
+        self.assertEqual(adapter._pool_maxsize, 20)
+
+
+class RateLimiterTests(unittest.TestCase):
+    """
+    Tests the token buckets used to rate limit queries.
+    """
+    def test_bucket_allows_bursts_up_to_capacity(self):
+        bucket = TokenBucket.from_limit(3, 1)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.reserve(), 1 / 3, places=2)
+
+    def test_public_and_private_buckets_are_separate(self):
+        limiter = RateLimiter.from_limits({'public': (1, 10),
+                                           'private': (1, 10)})
+        self.assertEqual(limiter.reserve('Time'), 0)
+        self.assertEqual(limiter.reserve('private/Balance', authenticate=True), 0)
+        self.assertGreater(limiter.reserve('Time'), 0)
+
+    def test_endpoint_buckets_and_costs(self):
+        limiter = RateLimiter.from_limits({'public': (10, 1),
+                                           'endpoints': {'book': (1, 10)},
+                                           'costs': {'trades': 10}})
+        self.assertEqual(limiter.reserve('book/BTCUSD'), 0)
+        self.assertGreater(limiter.reserve('book/BTCUSD'), 0)
+        self.assertEqual(limiter.reserve('pubticker/BTCUSD'), 0)
+        self.assertGreater(limiter.reserve('trades/BTCUSD'), 0)
+
+    def test_clients_of_same_host_share_limiter(self):
+        self.assertIs(KrakenREST().rate_limiter, KrakenREST().rate_limiter)
+        self.assertIsNone(YunbiREST().rate_limiter)
+
+    def test_wait_blocks_until_token_is_available(self):
+        limiter = RateLimiter(public=TokenBucket.from_limit(1, 0.1))
+        started = time.time()
+        limiter.wait('Time')
+        limiter.wait('Time')
+        self.assertGreaterEqual(time.time() - started, 0.09)
+
+
+class ResponseCacheTests(unittest.TestCase):
+    """
+    Tests caching and coalescing of public queries.
+    """
+    def setUp(self):
+        self.api = KrakenREST()
+        self.cache = ResponseCache(ttl=10, maxsize=2,
+                                   endpoint_ttls={'public/Trades': 0})
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        time.sleep(0.1)
+        r = requests.Response()
+        r.status_code = 200
+        r._content = b'{}'
+        return APIResponse(r)
+
+    def key(self, endpoint='public/Ticker', **kwargs):
+        return self.cache.make_key(self.api, 'GET', endpoint, False,
+                                   {'params': kwargs})
+
+    def test_private_and_non_get_queries_are_not_cached(self):
+        self.assertIsNone(self.cache.make_key(self.api, 'POST', 'public/Ticker',
+                                              False, {}))
+        self.assertIsNone(self.cache.make_key(self.api, 'GET', 'private/Balance',
+                                              True, {}))
+        self.assertIsNone(self.key('public/Trades'))
+
+    def test_responses_are_cached(self):
+        self.cache.fetch(self.key(pair='a'), 'public/Ticker', self.fetch)
+        self.cache.fetch(self.key(pair='a'), 'public/Ticker', self.fetch)
+        self.cache.fetch(self.key(pair='b'), 'public/Ticker', self.fetch)
+        self.assertEqual(self.calls, 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        for pair in ('a', 'b', 'a', 'c', 'a', 'b'):
+            self.cache.fetch(self.key(pair=pair), 'public/Ticker', self.fetch)
+        self.assertEqual(self.calls, 4)
+
+    def test_concurrent_queries_are_coalesced(self):
+        with ThreadPoolExecutor(5) as ex:
+            results = list(ex.map(lambda _: self.cache.fetch(
+                self.key(), 'public/Ticker', self.fetch), range(5)))
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(r.status_code == 200 for r in results))
+        self.assertEqual(len(set(id(r.json()) for r in results)), 5)
+
+    def test_cached_data_may_be_modified(self):
+        def fetch():
+            r = requests.Response()
+            r.status_code = 200
+            r._content = b'{"result": {"a": 1}}'
+            return APIResponse(r)
+
+        def formatter(data):
+            return data.pop('result')
+
+        for i in range(3):
+            r = self.cache.fetch(self.key(), 'public/Ticker', fetch)
+            r.set_formatter(formatter)
+            self.assertEqual(r.formatted, {'a': 1})
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 2))
@@ -0,0 +1,150 @@
+# Import Built-Ins
+import logging
+import math
+import unittest
+
+# Import Third-Party
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Import Homebrew
+from bitex.formatters.arrays import OrderBookSnapshot, TradeBatch, BUY, SELL
+from bitex.formatters.arrays import iso_to_ns, seconds_to_ns
+from bitex.formatters.gdax import GdaxFormatter
+from bitex.formatters.bittrex import BtrxFormatter
+from bitex.formatters.kraken import KrknFormatter
+from bitex.formatters.poloniex import PlnxFormatter
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+BIDS = [['100.0', '1.0', 1], ['99.0', '2.0', 2], ['98.0', '3.0', 3]]
+ASKS = [['101.0', '1.0', 1], ['102.0', '2.0', 2]]
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class OrderBookSnapshotTests(unittest.TestCase):
+    def test_from_levels(self):
+        book = OrderBookSnapshot.from_levels(BIDS, ASKS)
+        self.assertEqual(book.bids.prices.dtype, np.float64)
+        self.assertEqual(list(book.bids.prices), [100.0, 99.0, 98.0])
+        self.assertEqual(list(book.asks.cumulative_size), [1.0, 3.0])
+        self.assertEqual(book.spread, 1.0)
+        self.assertEqual(book.mid, 100.5)
+
+    def test_unsorted_levels_are_sorted(self):
+        book = OrderBookSnapshot.from_levels(BIDS[::-1], ASKS[::-1])
+        self.assertEqual(list(book.bids.prices), [100.0, 99.0, 98.0])
+        self.assertEqual(list(book.asks.sizes), [1.0, 2.0])
+
+    def test_vwap(self):
+        book = OrderBookSnapshot.from_levels(BIDS, ASKS)
+        self.assertEqual(book.asks.vwap(1), 101.0)
+        self.assertAlmostEqual(book.asks.vwap(2), 101.5)
+        self.assertTrue(math.isnan(book.asks.vwap(4)))
+        np.testing.assert_allclose(book.bids.vwap([1, 3]),
+                                   [100.0, (100 + 2 * 99) / 3])
+
+    def test_size_to(self):
+        book = OrderBookSnapshot.from_levels(BIDS, ASKS)
+        self.assertEqual(book.bids.size_to(99), 3.0)
+        self.assertEqual(book.bids.size_to(101), 0.0)
+        self.assertEqual(book.asks.size_to(101.5), 1.0)
+
+    def test_fixed_point(self):
+        book = OrderBookSnapshot.from_levels(BIDS, ASKS, decimals=8)
+        self.assertEqual(book.bids.prices.dtype, np.int64)
+        self.assertEqual(book.bids.prices[0], 100 * 10 ** 8)
+        self.assertEqual(book.bids.best, 100.0)
+        self.assertAlmostEqual(book.asks.vwap(2), 101.5)
+
+    def test_formatters(self):
+        data = {'error': [], 'result': {'XXBTZEUR': {'bids': BIDS,
+                                                     'asks': ASKS}}}
+        book = KrknFormatter.order_book(data, None, 'XXBTZEUR', as_array=True)
+        self.assertEqual(len(book.bids), 3)
+        self.assertEqual(KrknFormatter.order_book(data, None, 'XXBTZEUR'),
+                         data['result']['XXBTZEUR'])
+
+        data = {'success': True,
+                'result': {'buy': [{'Quantity': 1, 'Rate': 2}], 'sell': []}}
+        book = BtrxFormatter.order_book(data, None, 'BTC-LTC', as_array=True)
+        self.assertEqual(book.bids.best, 2.0)
+        self.assertEqual(len(book.asks), 0)
+        self.assertIsNone(book.spread)
+
+
+class TradeBatchTests(unittest.TestCase):
+    def make_batch(self, decimals=None):
+        return TradeBatch.from_columns([3, 1, 2], ['3.5', '1.5', '2.5'],
+                                       [1, 2, 3], [BUY, SELL, BUY], decimals)
+
+    def test_from_columns_sorts_by_timestamp(self):
+        batch = self.make_batch()
+        self.assertEqual(list(batch.ts), [1, 2, 3])
+        self.assertEqual(list(batch), [(1, 1.5, 2.0, SELL), (2, 2.5, 3.0, BUY),
+                                       (3, 3.5, 1.0, BUY)])
+
+    def test_trade_takes_25_bytes(self):
+        batch = self.make_batch()
+        self.assertEqual(sum(col.itemsize for col in (batch.ts, batch.prices,
+                                                      batch.sizes, batch.sides)),
+                         25)
+
+    def test_fixed_point(self):
+        batch = self.make_batch(decimals=2)
+        self.assertEqual(list(batch.prices), [150, 250, 350])
+
+    def test_slicing_by_time(self):
+        batch = self.make_batch()
+        self.assertEqual(list(batch.between(2).ts), [2, 3])
+        self.assertEqual(list(batch.between(1, 3).ts), [1, 2])
+        self.assertEqual(batch[1], (2, 2.5, 3.0, BUY))
+
+    def test_concat(self):
+        batch = self.make_batch()
+        self.assertEqual(list(TradeBatch.concat([batch[:1], batch[1:]]).ts),
+                         [1, 2, 3])
+        self.assertEqual(list(TradeBatch.concat([batch[1:], batch[:1]]).ts),
+                         [1, 2, 3])
+        with self.assertRaises(ValueError):
+            TradeBatch.concat([batch, self.make_batch(decimals=2)])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_concat_overlapping_fixed_point(self):
+        batch = self.make_batch(decimals=2)
+        result = TradeBatch.concat([batch[1:], batch[:2]])
+        self.assertEqual(result.decimals, 2)
+        self.assertEqual(result.prices.typecode, 'q')
+        self.assertEqual(list(result.ts), [1, 2, 2, 3])
+        self.assertEqual(list(result.to_numpy()['price']),
+                         [150, 250, 250, 350])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_to_numpy(self):
+        arrays = self.make_batch().to_numpy()
+        self.assertEqual(arrays['price'].dtype, np.float64)
+        self.assertEqual(list(arrays['side']), [SELL, BUY, BUY])
+
+    def test_timestamps(self):
+        self.assertEqual(seconds_to_ns('1480941692.1234'), 1480941692123400000)
+        self.assertEqual(seconds_to_ns(1480941692), 1480941692000000000)
+        self.assertEqual(iso_to_ns('2016-12-05T12:41:32.5Z'),
+                         1480941692500000000)
+        self.assertEqual(iso_to_ns('2016-12-05 12:41:32'), 1480941692000000000)
+
+    def test_formatters(self):
+        data = [{'time': '2016-12-05T12:41:32.5Z', 'trade_id': 1,
+                 'price': '10.00', 'size': '0.01', 'side': 'sell'}]
+        batch = GdaxFormatter.trades(data, None, 'BTC-USD', as_array=True)
+        self.assertEqual(list(batch), [(1480941692500000000, 10.0, 0.01, SELL)])
+        self.assertIs(GdaxFormatter.trades(data, None, 'BTC-USD'), data)
+
+        data = [{'date': '2016-12-05 12:41:32', 'type': 'buy', 'rate': '0.01',
+                 'amount': '5', 'total': '0.05'}]
+        batch = PlnxFormatter.trades(data, None, 'BTC_ETH', as_array=8)
+        self.assertEqual(list(batch), [(1480941692000000000, 10 ** 6,
+                                        5 * 10 ** 8, BUY)])
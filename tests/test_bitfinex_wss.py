@@ -0,0 +1,99 @@
+# Import Built-Ins
+import logging
+import json
+import queue
+import time
+import unittest
+from threading import Thread
+
+# Import Third-Party
+from websocket import WebSocketTimeoutException
+
+# Import Homebrew
+from bitex.api.WSS.bitfinex import BitfinexWSS
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class ParseStageTests(unittest.TestCase):
+    def check_order(self, parser):
+        wss = BitfinexWSS(parser=parser, parse_workers=4)
+        if parser != 'inline':
+            wss._parse_pool = wss.parsers[parser](wss.parse_workers)
+        try:
+            frames = [json.dumps([i % 3, [i] * (1000 if i % 7 else 1)])
+                      for i in range(50)]
+            for i, frame in enumerate(frames):
+                wss._enqueue(i, frame)
+            decoded = []
+            while not wss.receiver_q.empty():
+                ts, payload = wss.receiver_q.get_nowait()
+                decoded.append((ts, wss._decode(payload)))
+        finally:
+            if wss._parse_pool is not None:
+                wss._parse_pool.shutdown()
+        self.assertEqual(decoded, [(i, json.loads(frame))
+                                   for i, frame in enumerate(frames)])
+
+    def test_inline(self):
+        self.check_order('inline')
+
+    def test_thread_pool_keeps_order(self):
+        self.check_order('thread')
+
+    def test_process_pool_keeps_order(self):
+        self.check_order('process')
+
+    def test_invalid_parser(self):
+        with self.assertRaises(ValueError):
+            BitfinexWSS(parser='gpu')
+
+
+class FakeConnection:
+    def __init__(self):
+        self.frames = queue.Queue()
+
+    def recv(self):
+        try:
+            return self.frames.get(timeout=0.05)
+        except queue.Empty:
+            raise WebSocketTimeoutException()
+
+    def close(self):
+        pass
+
+
+class EventDrivenLoopTests(unittest.TestCase):
+    def setUp(self):
+        self.wss = BitfinexWSS()
+        self.wss.conn = FakeConnection()
+        self.wss.channels[10] = self.wss._handle_ticker
+        self.wss.channel_labels[10] = ('ticker', {'pair': 'BTCUSD'})
+        self.wss.running = True
+        self.wss.receiver_thread = Thread(target=self.wss.receive)
+        self.wss.processing_thread = Thread(target=self.wss.process)
+        self.wss.receiver_thread.start()
+        self.wss.processing_thread.start()
+
+    def tearDown(self):
+        self.wss.stop()
+
+    def test_unpause_resumes_immediately(self):
+        self.wss.pause()
+        time.sleep(0.1)  # Let the receiver finish its pending recv()
+        self.wss.conn.frames.put('[10, [1, 2, 3]]')
+        with self.assertRaises(queue.Empty):
+            self.wss.data_q.get(timeout=0.1)
+
+        start = time.time()
+        self.wss.unpause()
+        msg = self.wss.data_q.get(timeout=1)
+        self.assertLess(time.time() - start, 0.1)
+        self.assertEqual(msg.data, [1, 2, 3])
+
+    def test_stop_wakes_up_threads(self):
+        self.wss.pause()
+        self.wss.stop()
+        self.assertIsNone(self.wss.receiver_thread)
+        self.assertIsNone(self.wss.processing_thread)
@@ -0,0 +1,151 @@
+# Import Built-Ins
+import logging
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.WSS.capture import CaptureWriter, CaptureReader, replay
+from bitex.api.WSS.capture import index_path
+from bitex.api.WSS.bitfinex import BitfinexWSS
+from bitex.api.WSS.gemini import GeminiWSS
+from bitex.api.WSS.poloniex import PoloniexWSS
+from bitex.api.WSS.messages import Ticker, Trade, BookDelta
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class CaptureFileTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'feed.cap')
+        self.frames = [(1000.0 + i, 'wss://a#%s' % (i % 2), json.dumps([i]))
+                       for i in range(25)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, frames):
+        with CaptureWriter(self.path, chunk_frames=10, max_delay=60) as writer:
+            for frame in frames:
+                writer.write(*frame)
+        return writer
+
+    def test_round_trip(self):
+        writer = self.write(self.frames + [(1025.0, 'wss://a', b'\x00\x01')])
+        self.assertEqual(writer.frames, 26)
+        reader = CaptureReader(self.path)
+        self.assertEqual(len(reader.chunks), 3)
+        self.assertEqual(len(reader), 26)
+        self.assertEqual(list(reader), self.frames +
+                         [(1025.0, 'wss://a', b'\x00\x01')])
+
+    def test_time_range(self):
+        self.write(self.frames)
+        frames = list(CaptureReader(self.path).frames(1012.0, 1021.0))
+        self.assertEqual(frames, self.frames[12:22])
+
+    def test_append(self):
+        self.write(self.frames[:5])
+        self.write(self.frames[5:])
+        self.assertEqual(list(CaptureReader(self.path)), self.frames)
+
+    def test_index_is_rebuilt(self):
+        self.write(self.frames)
+        os.remove(index_path(self.path))
+        self.assertEqual(list(CaptureReader(self.path)), self.frames)
+        self.assertTrue(os.path.exists(index_path(self.path)))
+
+    def test_incomplete_chunk_is_dropped(self):
+        self.write(self.frames[:10])
+        with open(self.path, 'ab') as f:
+            f.write(b'\x10\x00\x00')
+        self.assertEqual(list(CaptureReader(self.path)), self.frames[:10])
+        self.write(self.frames[10:])
+        self.assertEqual(list(CaptureReader(self.path)), self.frames)
+
+    def test_delay_writes_chunk(self):
+        writer = CaptureWriter(self.path, max_delay=1.0)
+        writer.write(1000.0, 'wss://a', 'first')
+        writer.write(1001.0, 'wss://a', 'second')
+        self.assertEqual(len(CaptureReader(self.path)), 2)
+        writer.close()
+
+
+class ReplayTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'feed.cap')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_client_capture_and_replay(self):
+        wss = BitfinexWSS()
+        wss.capture(self.path)
+        frames = [json.dumps({'event': 'subscribed', 'channel': 'ticker',
+                              'chanId': 10, 'pair': 'BTCUSD'}),
+                  json.dumps([10, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10])]
+        for i, frame in enumerate(frames):
+            wss.record(wss.addr, frame, 1000.0 + i)
+        wss.stop_capture()
+        self.assertIsNone(wss.recorder)
+
+        replayed = BitfinexWSS()
+        stats = replay(replayed, self.path)
+        self.assertEqual(stats['frames'], 2)
+        msg = replayed.data_q.get_nowait()
+        self.assertIsInstance(msg, Ticker)
+        self.assertEqual((msg.pair, msg.ts), ('BTCUSD', 1001.0))
+
+    def test_poloniex_capture_and_replay(self):
+        wss = PoloniexWSS(endpoints=['BTC_ETH', 'ticker'])
+        self.assertTrue(wss.supports_replay())
+        self.assertFalse(wss.supports_engine())
+        wss.capture(self.path)
+        # WAMP events, as passed by the session: topic, args, kwargs
+        wss.on_event('ticker', ('BTC_ETH', '0.05', '0.051', '0.049'), {},
+                     1000.0)
+        wss.on_event('BTC_ETH', (
+            {'type': 'orderBookModify',
+             'data': {'type': 'bid', 'rate': '0.049', 'amount': '2'}},
+            {'type': 'newTrade',
+             'data': {'tradeID': '1', 'rate': '0.05', 'amount': '1',
+                      'type': 'buy'}}), {'seq': 7}, 1001.0)
+        wss.stop_capture()
+        live = wss.drain()
+
+        replayed = PoloniexWSS(endpoints=['BTC_ETH', 'ticker'])
+        self.assertEqual(replay(replayed, self.path)['frames'], 2)
+        messages = replayed.drain()
+        self.assertEqual(messages, live)
+        self.assertEqual([type(m) for m in messages],
+                         [Ticker, BookDelta, Trade])
+        self.assertEqual(messages[0].data, ('0.05', '0.051', '0.049'))
+        self.assertEqual((messages[2].data['seq'], messages[2].ts), (7, 1001.0))
+
+    def test_multiprocess_poloniex_cannot_be_captured(self):
+        wss = PoloniexWSS(endpoints=['ticker'], multiprocess=True)
+        with self.assertRaises(ValueError):
+            wss.capture(self.path)
+
+    def test_speed(self):
+        with CaptureWriter(self.path) as writer:
+            for i in range(3):
+                writer.write(1000.0 + 0.1 * i, 'wss://a', json.dumps({
+                    'type': 'trade', 'symbol': 'BTCUSD', 'price': str(i)}))
+        wss = GeminiWSS(endpoints=['btcusd'])
+        started = time.monotonic()
+        self.assertEqual(replay(wss, self.path, speed=2)['frames'], 3)
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+        self.assertEqual([type(m) for m in wss.drain()], [Trade] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
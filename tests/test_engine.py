@@ -0,0 +1,224 @@
+# Import Built-Ins
+import logging
+import asyncio
+import json
+import queue
+import threading
+import unittest
+
+# Import Third-Party
+from aiohttp import web
+
+# Import Homebrew
+from bitex.api.WSS.base import WSSAPI
+from bitex.api.WSS.engine import WSSEngine
+from bitex.api.WSS.bitfinex import BitfinexWSS
+from bitex.api.WSS.bitstamp import BitstampWSS
+from bitex.api.WSS.gemini import GeminiWSS
+from bitex.api.WSS.okcoin import OKCoinWSS
+from bitex.api.WSS.messages import Message, Ticker, BookDelta, Trade
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class FeedServer:
+    """
+    Local websocket server, echoing each message received back three times.
+    """
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.connections = 0
+        self.port = None
+        ready = threading.Event()
+        threading.Thread(target=self._run, args=(ready,), daemon=True).start()
+        ready.wait()
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self.loop)
+        app = web.Application()
+        app.router.add_get('/{feed}', self.handler)
+        self.runner = web.AppRunner(app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        self.loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        ready.set()
+        self.loop.run_forever()
+
+    async def handler(self, request):
+        self.connections += 1
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for msg in ws:
+            for i in range(3):
+                await ws.send_str('%s:%s:%s' % (request.match_info['feed'],
+                                                msg.data, i))
+        return ws
+
+    def url(self, feed):
+        return 'ws://127.0.0.1:%s/%s' % (self.port, feed)
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(),
+                                         self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class EchoClient(WSSAPI):
+    def __init__(self, urls):
+        super(EchoClient, self).__init__(None, 'Echo')
+        self.urls = urls
+        self.opened = queue.Queue()
+
+    def feed_urls(self):
+        return self.urls
+
+    def on_open(self, url, conn):
+        self.opened.put(url)
+        conn.send('hello')
+
+    def on_message(self, url, raw, ts):
+        if raw.endswith('hello:1'):
+            raise ConnectionResetError()
+        self.data_q.put(raw)
+
+
+class WSSEngineTests(unittest.TestCase):
+    def setUp(self):
+        self.server = FeedServer()
+        self.engine = WSSEngine(reconnect_delay=0.01)
+        self.engine.start()
+
+    def tearDown(self):
+        self.engine.stop()
+        self.server.close()
+
+    def test_clients_share_engine_and_reconnect(self):
+        clients = [EchoClient([self.server.url('a'), self.server.url('b')]),
+                   EchoClient([self.server.url('c')])]
+        for client in clients:
+            self.engine.add(client)
+
+        self.assertEqual(self.engine.thread.name, 'WSS Engine')
+        received = sorted(clients[0].get(timeout=5) for i in range(4))
+        self.assertEqual(received, ['a:hello:0', 'a:hello:0',
+                                    'b:hello:0', 'b:hello:0'])
+        self.assertEqual(clients[1].get(timeout=5), 'c:hello:0')
+
+        # The third message of each round is never read, as the client
+        # raised ConnectionResetError on the second one, and was reconnected.
+        for i in range(2):
+            clients[1].opened.get(timeout=5)
+        self.assertGreaterEqual(self.server.connections, 6)
+
+        self.engine.remove(clients[0])
+        self.assertFalse(clients[0].running)
+
+    def test_full_blocking_queue_stalls_only_its_client(self):
+        blocked = EchoClient([self.server.url('a')])
+        blocked.configure_queue(maxsize=1)
+        client = EchoClient([self.server.url('b')])
+        self.engine.add(blocked)
+        self.engine.add(client)
+
+        # blocked's queue fills with its first message, after which its
+        # worker waits on put(); client keeps receiving and reconnecting
+        for i in range(5):
+            self.assertEqual(client.get(timeout=5), 'b:hello:0')
+        self.assertEqual(blocked.data_q.qsize(), 1)
+        self.assertEqual(blocked.get(timeout=5), 'a:hello:0')
+        self.assertEqual(blocked.get(timeout=5), 'a:hello:0')
+
+    def test_clients_without_on_message_are_rejected(self):
+        class UnsupportedClient(WSSAPI):
+            pass
+
+        client = UnsupportedClient(self.server.url('a'), 'Unsupported')
+        self.assertFalse(client.supports_engine())
+        self.assertTrue(EchoClient([]).supports_engine())
+        with self.assertRaises(TypeError):
+            self.engine.add(client)
+        self.assertFalse(client.running)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, text):
+        self.sent.append(json.loads(text))
+
+
+class EngineAdapterTests(unittest.TestCase):
+    def test_bitstamp_speaks_pusher_protocol(self):
+        wss = BitstampWSS(include_only=['live_trades', 'diff_order_book_btceur'])
+        conn = FakeConnection()
+        wss.on_open(wss.feed_urls()[0], conn)
+        self.assertEqual(conn.sent[0], {'event': 'pusher:subscribe',
+                                        'data': {'channel': 'live_trades'}})
+
+        wss.on_message(None, '{"event": "pusher:ping", "data": {}}', 1)
+        self.assertEqual(conn.sent[-1]['event'], 'pusher:pong')
+
+        wss.on_message(None, json.dumps({'event': 'trade', 'data': '{}',
+                                         'channel': 'live_trades'}), 1)
+        wss.on_message(None, json.dumps({'event': 'data', 'data': '{}',
+                                         'channel': 'diff_order_book_btceur'}),
+                       1)
+        trade, delta = wss.drain()
+        self.assertIsInstance(trade, Trade)
+        self.assertEqual(trade[:4], ('Bitstamp', 'live_trades', 'BTCUSD', {}))
+        self.assertIsInstance(delta, BookDelta)
+        self.assertEqual(delta[:4], ('Bitstamp', 'diff_order_book', 'BTCEUR', {}))
+
+    def test_gemini_multiplexes_symbols_over_pool(self):
+        wss = GeminiWSS(endpoints=['btcusd', 'ethusd', 'ethbtc'], pool_size=2)
+        self.assertEqual(sorted(len(s) for s in wss.slots.values()), [1, 2])
+        conns = {url: FakeConnection() for url in wss.feed_urls()}
+        for url, conn in conns.items():
+            wss.on_open(url, conn)
+            self.assertEqual(conn.sent[0]['subscriptions'][0]['symbols'],
+                             sorted(wss.slots[url]))
+
+        # New symbols are added to the least busy connection
+        wss.subscribe('zecusd')
+        self.assertEqual(sorted(len(s) for s in wss.slots.values()), [2, 2])
+        wss.unsubscribe('ZECUSD')
+        sent = [msg for conn in conns.values() for msg in conn.sent[1:]]
+        self.assertEqual([(m['type'], m['subscriptions'][0]['symbols'])
+                          for m in sent],
+                         [('subscribe', ['ZECUSD']), ('unsubscribe', ['ZECUSD'])])
+        with self.assertRaises(KeyError):
+            wss.unsubscribe('ZECUSD')
+
+        url = wss.feed_urls()[0]
+        wss.on_message(url, '{"type": "heartbeat"}', 1)
+        wss.on_message(url, '{"type": "trade", "symbol": "BTCUSD"}', 1)
+        self.assertEqual(wss.data_q.get_nowait(),
+                         Trade('Gemini', 'trade', 'BTCUSD',
+                               {'type': 'trade', 'symbol': 'BTCUSD'}, 1))
+        self.assertTrue(wss.data_q.empty())
+
+    def test_okcoin_types_unknown_channels_as_message(self):
+        wss = OKCoinWSS()
+        for channel in ('ok_sub_spotusd_btc_ticker', 'ok_sub_spotusd_btc_x',
+                        'addChannel'):
+            wss.on_message(None, json.dumps({'channel': channel,
+                                             'data': {}}), 1)
+        self.assertEqual([(type(m), m.pair) for m in wss.drain()],
+                         [(Ticker, 'USDBTC'), (Message, 'USDBTC'),
+                          (Message, None)])
+
+    def test_bitfinex_resubscribes_after_reconnect(self):
+        wss = BitfinexWSS()
+        wss.channel_labels[10] = ('raw_book', {'symbol': 'tBTCUSD',
+                                               'prec': 'R0'})
+        conn = FakeConnection()
+        wss.on_open(wss.feed_urls()[0], conn)
+        self.assertEqual(conn.sent, [{'event': 'subscribe', 'channel': 'book',
+                                      'symbol': 'tBTCUSD', 'prec': 'R0'}])
+        self.assertEqual(wss.channel_labels, {})
+
+        with self.assertRaises(ConnectionResetError):
+            wss.on_message(None, '{"event": "info", "code": 20051}', 1)
@@ -0,0 +1,79 @@
+# Import Built-Ins
+import logging
+import time
+import unittest
+from unittest import mock
+
+# Import Third-Party
+
+# Import Homebrew
+import bitex.interfaces
+from bitex.fanout import fan_out, INTERFACES
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class DummyInterface:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+
+    def ticker(self, pair, **kwargs):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError(pair)
+        return pair, kwargs
+
+
+class FanOutTests(unittest.TestCase):
+    def test_results_are_yielded_as_completed(self):
+        fast, slow = DummyInterface(), DummyInterface(delay=0.2)
+        results = list(fan_out('ticker', {fast: ['a', 'b'], slow: ['c']},
+                               test=True))
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[-1].pair, 'c')
+        self.assertEqual(results[-1].response, ('c', {'test': True}))
+        self.assertTrue(all(r.error is None for r in results))
+
+    def test_late_calls_do_not_block_others(self):
+        fast, slow = DummyInterface(), DummyInterface(delay=2)
+        started = time.time()
+        results = list(fan_out('ticker', {fast: ['a'], slow: ['b']},
+                               timeout=0.2))
+        self.assertLess(time.time() - started, 1)
+        errors = {r.pair: r.error for r in results}
+        self.assertIsNone(errors['a'])
+        self.assertIsInstance(errors['b'], TimeoutError)
+
+    def test_slow_constructors_do_not_block_others(self):
+        class SlowInterface(DummyInterface):
+            created = 0
+
+            def __init__(self):
+                # Like Quoine(), which fetches products on creation
+                SlowInterface.created += 1
+                time.sleep(2)
+                super(SlowInterface, self).__init__()
+
+        started = time.time()
+        with mock.patch.dict(INTERFACES, {'slow': 'SlowInterface'}), \
+                mock.patch.object(bitex.interfaces, 'SlowInterface',
+                                  SlowInterface, create=True):
+            results = list(fan_out('ticker', {'slow': ['a', 'b'],
+                                              DummyInterface(): ['c']},
+                                   timeout=0.2))
+        self.assertLess(time.time() - started, 1)
+        errors = {r.pair: r.error for r in results}
+        self.assertIsNone(errors['c'])
+        self.assertIsInstance(errors['a'], TimeoutError)
+        self.assertIsInstance(errors['b'], TimeoutError)
+        self.assertEqual(SlowInterface.created, 1)
+
+    def test_errors_are_returned(self):
+        results = list(fan_out('ticker', {DummyInterface(fail=True): ['a']}))
+        self.assertIsInstance(results[0].error, ValueError)
+
+    def test_unknown_exchange_raises(self):
+        with self.assertRaises(ValueError):
+            list(fan_out('ticker', {'unknown': ['a']}))
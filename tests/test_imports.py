@@ -0,0 +1,58 @@
+# Import Built-Ins
+import logging
+import os
+import subprocess
+import sys
+import unittest
+
+# Import Third-Party
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules which must not be imported by REST-only use of bitex
+HEAVY = ('numpy', 'aiohttp', 'autobahn', 'pusherclient', 'websocket',
+         'multiprocessing', 'bitex.api.WSS.', 'bitex.interfaces.')
+
+
+def run(code, *flags):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable] + list(flags) + ['-c', code],
+                          env=env, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, universal_newlines=True,
+                          check=True)
+
+
+def loaded(code):
+    out = run(code + "\nimport sys\nprint('\\n'.join(sys.modules))").stdout
+    return [m for m in out.split() if m.startswith(HEAVY) or m in HEAVY]
+
+
+class LazyImportTests(unittest.TestCase):
+    def test_import_bitex_loads_no_interfaces(self):
+        self.assertEqual(loaded('import bitex'), [])
+
+    def test_interface_loads_only_its_own_modules(self):
+        self.assertEqual(loaded('import bitex; bitex.Kraken'),
+                         ['bitex.interfaces.kraken'])
+        self.assertEqual(loaded('from bitex.interfaces import Kraken'),
+                         ['bitex.interfaces.kraken'])
+
+    def test_wss_clients_are_available(self):
+        self.assertIn('bitex.api.WSS.gdax',
+                      loaded('from bitex.api.WSS import GDAXWSS'))
+        import bitex
+        self.assertIn('Kraken', dir(bitex))
+        with self.assertRaises(AttributeError):
+            bitex.NoSuchExchange
+
+    def test_import_time(self):
+        # Measured in a fresh interpreter, as -X importtime requires 3.7+
+        code = ('import time\nstarted = time.perf_counter()\nimport bitex\n'
+                'print(time.perf_counter() - started)')
+        self.assertLess(float(run(code).stdout), 0.1)
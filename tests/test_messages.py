@@ -0,0 +1,28 @@
+# Import Built-Ins
+import logging
+import unittest
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.WSS.messages import MESSAGE_TYPES, Message, Ticker, Trade
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class MessageTests(unittest.TestCase):
+    def test_messages_are_slotted_tuples(self):
+        for msg_type in MESSAGE_TYPES:
+            msg = msg_type('Bitfinex', 'ticker', 'BTCUSD', [1, 2], 0)
+            self.assertFalse(hasattr(msg, '__dict__'))
+            self.assertIsInstance(msg, Message)
+            exchange, channel, pair, data, ts = msg
+            self.assertEqual(msg.pair, 'BTCUSD')
+
+    def test_dispatch_by_type_and_kind(self):
+        msgs = [Ticker('GDAX', 'full', 'BTC-USD', {}, 0),
+                Trade('GDAX', 'full', 'BTC-USD', {}, 0)]
+        handlers = {Ticker: 'ticker', Trade: 'trade'}
+        self.assertEqual([handlers[type(msg)] for msg in msgs],
+                         [msg.kind for msg in msgs])
@@ -0,0 +1,130 @@
+# Import Built-Ins
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.metadata import MetadataCache, default_cache_path
+from bitex.api.WSS import gdax, gemini, poloniex
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class MetadataCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'metadata.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_default_path(self):
+        with mock.patch.dict(os.environ, {'BITEX_CACHE_DIR': self.directory}):
+            self.assertEqual(default_cache_path(), self.path)
+
+    def test_missing_value_is_fetched_in_background(self):
+        cache = MetadataCache(self.path)
+        release = threading.Event()
+
+        def fetch():
+            release.wait(5)
+            return ['BTCUSD']
+        self.assertIsNone(cache.get('symbols', fetch))
+        release.set()
+        self.assertEqual(cache.get('symbols', fetch, wait=True, timeout=5),
+                         ['BTCUSD'])
+
+    def test_refreshes_are_deduplicated(self):
+        cache = MetadataCache(self.path)
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return 1
+        for _ in range(5):
+            cache.get('key', fetch)
+        release.set()
+        self.assertEqual(cache.get('key', fetch, wait=True, timeout=5), 1)
+        self.assertEqual(len(calls), 1)
+
+    def test_expired_value_is_returned_while_refreshing(self):
+        cache = MetadataCache(False, ttl=0)
+        cache.set('key', 'old')
+        refreshed = threading.Event()
+
+        def fetch():
+            refreshed.set()
+            return 'new'
+        self.assertEqual(cache.get('key', fetch, wait=True), 'old')
+        self.assertTrue(refreshed.wait(5))
+        time.sleep(0.1)
+        self.assertEqual(cache.get('key', fetch), 'new')
+
+    def test_failed_fetch_keeps_value(self):
+        cache = MetadataCache(False, ttl=0)
+        cache.set('key', 'old')
+
+        def fetch():
+            raise ConnectionError
+        cache.get('key', fetch)
+        time.sleep(0.1)
+        self.assertEqual(cache.get('key', fetch), 'old')
+
+    def test_persistence(self):
+        MetadataCache(self.path).set('key', [1, 2])
+        self.assertEqual(MetadataCache(self.path).get('key', None), [1, 2])
+
+        MetadataCache(self.path).clear()
+        self.assertIsNone(MetadataCache(self.path).get('key', lambda: None,
+                                                       wait=True, timeout=5))
+
+    def test_disabled_persistence(self):
+        MetadataCache(False).set('key', 1)
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+class ConstructorTests(unittest.TestCase):
+    """
+    Constructors of clients take symbols from the cache, without touching the
+    network.
+    """
+    def setUp(self):
+        self.cache = MetadataCache(False)
+        self.cache.set('gdax.pairs', ['BTC-USD'])
+        self.cache.set('gemini.symbols', ['btcusd', 'ethusd'])
+        self.cache.set('poloniex.endpoints', ['BTC_ETH', 'ticker'])
+
+    def test_cached_symbols(self):
+        with mock.patch('bitex.metadata.requests.get') as get:
+            with mock.patch.object(gdax, 'metadata_cache', self.cache):
+                self.assertEqual(gdax.GDAXWSS().pairs, ['BTC-USD'])
+            with mock.patch.object(gemini, 'metadata_cache', self.cache):
+                self.assertEqual(gemini.GeminiWSS().symbols,
+                                 ['BTCUSD', 'ETHUSD'])
+            with mock.patch.object(poloniex, 'metadata_cache', self.cache):
+                self.assertEqual(poloniex.PoloniexWSS().endpoints,
+                                 ['BTC_ETH', 'ticker'])
+        self.assertFalse(get.called)
+
+    def test_prepare_waits_for_missing_symbols(self):
+        cache = MetadataCache(False)
+        with mock.patch.object(gemini, 'metadata_cache', cache), \
+                mock.patch.object(gemini, 'fetch_symbols',
+                                  return_value=['btcusd']):
+            wss = gemini.GeminiWSS()
+            wss.prepare()
+        self.assertEqual(wss.symbols, ['BTCUSD'])
+
+
+if __name__ == '__main__':
+    unittest.main()
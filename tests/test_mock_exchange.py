@@ -0,0 +1,114 @@
+# Import Built-Ins
+import logging
+import base64
+import time
+import unittest
+
+# Import Third-Party
+import requests
+
+# Import Homebrew
+from bitex.interfaces import Kraken, Bitfinex, Bitstamp, Bittrex, GDAX
+from bitex.interfaces import Gemini, Poloniex, Bter, CCEX, Coincheck
+from bitex.interfaces import Cryptopia, HitBtc, ItBit, OKCoin, QuadrigaCX
+from bitex.interfaces import Quoine, RockTradingLtd, Vaultoro, Yunbi
+from bitex.api.REST.quoine import jwt_available
+from mock_exchange import MockExchange, INVALID_SIGNERS
+from benchmark_rest import benchmark, QUERIES
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+INTERFACES = {'Kraken': (Kraken, 'XXBTZUSD'), 'Bitfinex': (Bitfinex, 'btcusd'),
+              'Bitstamp': (Bitstamp, 'btcusd'), 'Bittrex': (Bittrex, 'BTC-LTC'),
+              'GDAX': (GDAX, 'BTC-USD'), 'Gemini': (Gemini, 'btcusd'),
+              'Poloniex': (Poloniex, 'BTC_LTC'), 'Bter': (Bter, 'btc_cny'),
+              'CCEX': (CCEX, 'ltc-btc'), 'Coincheck': (Coincheck, 'btc_jpy'),
+              'Cryptopia': (Cryptopia, 'LTC_BTC'), 'HitBTC': (HitBtc, 'BTCUSD'),
+              'ItBit': (ItBit, 'XBTUSD'), 'OKCoin': (OKCoin, 'btc_usd'),
+              'QuadrigaCX': (QuadrigaCX, 'btc_cad'), 'Quoine': (Quoine, 'BTCUSD'),
+              'RockTrading': (RockTradingLtd, 'BTCEUR'),
+              'Vaultoro': (Vaultoro, 'GLD-BTC'), 'Yunbi': (Yunbi, 'btccny')}
+
+
+def skip_unavailable(test, exchange):
+    if exchange == 'Quoine' and not jwt_available:
+        test.skipTest('QuoineREST requires PyJWT')
+
+
+class MockExchangeTests(unittest.TestCase):
+    def test_interfaces(self):
+        for name, (interface, pair) in INTERFACES.items():
+            with self.subTest(exchange=name), MockExchange(name) as exchange:
+                skip_unavailable(self, name)
+                client = exchange.connect(interface())
+                for method in ('ticker', 'order_book', 'trades'):
+                    r = getattr(client, method)(pair)
+                    self.assertEqual(r.status_code, 200, (method, r.json()))
+                if name in INVALID_SIGNERS:
+                    continue
+                r = client.balance()
+                self.assertEqual(r.status_code, 200, r.json())
+                self.assertEqual(exchange.rejected, 0)
+
+    def test_invalid_signature(self):
+        for name, (interface, pair) in INTERFACES.items():
+            if name in INVALID_SIGNERS:
+                continue
+            with self.subTest(exchange=name), MockExchange(name) as exchange:
+                client = exchange.connect(interface())
+                client.secret = base64.b64encode(b'wrong').decode('utf-8')
+                self.assertEqual(client.balance().status_code, 401)
+                self.assertEqual(exchange.rejected, 1)
+
+    def test_invalid_signers(self):
+        # Once a client's sign() is fixed, remove it from INVALID_SIGNERS
+        for name, reason in INVALID_SIGNERS.items():
+            client_class, _, query = QUERIES[name]
+            with self.subTest(exchange=name), MockExchange(name) as exchange:
+                skip_unavailable(self, name)
+                client = exchange.connect(client_class())
+                try:
+                    status = client.query(*query).status_code
+                except (TypeError, requests.RequestException):
+                    status = None
+                self.assertNotEqual(status, 200, reason)
+
+    def test_injected_errors(self):
+        with MockExchange('Kraken') as exchange:
+            kraken = exchange.connect(Kraken())
+            exchange.fail_next(2, status=503)
+            self.assertEqual(kraken.ticker('XBTUSD').status_code, 503)
+            self.assertEqual(kraken.ticker('XBTUSD').status_code, 503)
+            self.assertEqual(kraken.ticker('XBTUSD').status_code, 200)
+
+        with MockExchange('Kraken', error_rate=1.0) as exchange:
+            kraken = exchange.connect(Kraken())
+            self.assertEqual(kraken.ticker('XBTUSD').status_code, 500)
+
+    def test_latency(self):
+        with MockExchange('Kraken', latency=0.05) as exchange:
+            kraken = exchange.connect(Kraken())
+            started = time.monotonic()
+            kraken.ticker('XBTUSD')
+            self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+
+class BenchmarkTests(unittest.TestCase):
+    def test_benchmark(self):
+        for exchange in QUERIES:
+            for private in (False, True):
+                if private and exchange in INVALID_SIGNERS:
+                    continue
+                with self.subTest(exchange=exchange, private=private):
+                    skip_unavailable(self, exchange)
+                    stats = benchmark(exchange, requests=20, concurrency=2,
+                                      private=private)
+                    self.assertEqual(stats['errors'], 0)
+                    self.assertEqual(stats['requests'], 20)
+                    self.assertLessEqual(stats['p50'], stats['p99'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# Import Built-Ins
+import logging
+import unittest
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.WSS.orderbook import L2Book, L3Book
+from bitex.api.WSS.bitfinex import BitfinexWSS
+from bitex.api.WSS.messages import BookSnapshot, BookDelta
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class L2BookTests(unittest.TestCase):
+    def setUp(self):
+        self.book = L2Book('BTCUSD')
+        self.book.update([['100', 1, '2'], ['99', 2, '3'],
+                          ['101', 1, '-1'], ['102', 3, '-4']], ts=1)
+
+    def test_snapshot(self):
+        self.assertEqual(self.book.best_bid, [100.0, 1, 2.0])
+        self.assertEqual(self.book.best_ask, [101.0, 1, -1.0])
+        self.assertEqual(self.book.snapshot(depth=1),
+                         {'bids': [[100.0, 1, 2.0]], 'asks': [[101.0, 1, -1.0]],
+                          'ts': 1})
+
+    def test_deltas(self):
+        self.book.update([100.5, 1, 1])
+        self.book.update(['101', 0, -1])
+        self.book.update(['99', 5, '7'])
+        snapshot = self.book.snapshot()
+        self.assertEqual(snapshot['bids'], [[100.5, 1, 1.0], [100.0, 1, 2.0],
+                                            [99.0, 5, 7.0]])
+        self.assertEqual(snapshot['asks'], [[102.0, 3, -4.0]])
+
+    def test_new_snapshot_replaces_book(self):
+        self.book.update([[50, 1, 1]])
+        self.assertEqual(self.book.snapshot(), {'bids': [[50.0, 1, 1.0]],
+                                                'asks': [], 'ts': None})
+
+
+class L3BookTests(unittest.TestCase):
+    def setUp(self):
+        self.book = L3Book('BTCUSD')
+        self.book.update([[1, '100', '2'], [2, '100', '1'], [3, '101', '-1']])
+
+    def test_aggregated_best_levels(self):
+        self.assertEqual(self.book.best_bid, [100.0, 2, 3.0])
+        self.assertEqual(self.book.best_ask, [101.0, 1, -1.0])
+
+    def test_deltas_keep_time_priority(self):
+        self.book.update([1, '100', '1.5'])
+        self.book.update([2, '99', '1'])
+        self.book.update([3, 0, -1])
+        snapshot = self.book.snapshot()
+        self.assertEqual(snapshot['bids'], [[1, 100.0, 1.5], [2, 99.0, 1.0]])
+        self.assertEqual(snapshot['asks'], [])
+        self.assertEqual(len(self.book.orders), 2)
+
+
+class BitfinexBookHandlerTests(unittest.TestCase):
+    def test_books_are_maintained_and_data_is_queued(self):
+        wss = BitfinexWSS()
+        wss.channel_labels[10] = ('book', {'pair': 'BTCUSD'})
+        wss.channel_labels[11] = ('raw_book', {'pair': 'BTCUSD'})
+        wss._handle_book(1, 10, [[[100, 1, 1], [101, 1, -1]]])
+        wss._handle_book(2, 10, [[100, 0, 1]])
+        wss._handle_raw_book(3, 11, [[[5, 100, 1]]])
+
+        self.assertIsNone(wss.books['BTCUSD'].best_bid)
+        self.assertEqual(wss.books['BTCUSD'].best_ask, [101.0, 1, -1.0])
+        self.assertEqual(wss.raw_books['BTCUSD'].best_bid, [100.0, 1, 1.0])
+        self.assertEqual([type(msg) for msg in wss.drain()],
+                         [BookSnapshot, BookDelta, BookSnapshot])
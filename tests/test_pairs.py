@@ -0,0 +1,134 @@
+# Import Built-Ins
+import logging
+import threading
+import time
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex import pairs
+from bitex.pairs import Pair, PairRegistry, registry, kraken_registry
+from bitex.metadata import MetadataCache
+from bitex.formatters.kraken import KrknFormatter
+from bitex.interfaces.kraken import Kraken
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class PairRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.registry = PairRegistry('Test', [
+            Pair('btc-usd', 'BTC', 'USD', Decimal('0.01'), Decimal('1E-8'))],
+            aliases={'btc-usd': ['XBTUSD']})
+
+    def test_lookups(self):
+        for name in ('BTCUSD', 'btc_usd', 'btc-usd', 'BTC/USD', 'xbtusd'):
+            self.assertEqual(self.registry.native(name), 'btc-usd')
+        self.assertEqual(self.registry.canonical('xbtusd'), 'BTCUSD')
+        self.assertEqual(self.registry.tick_size('BTCUSD'), Decimal('0.01'))
+        self.assertEqual(self.registry.lot_size('BTCUSD'), Decimal('1E-8'))
+        self.assertIn('BTC_USD', self.registry)
+        self.assertEqual(len(self.registry), 1)
+
+    def test_unknown_pair(self):
+        self.assertIsNone(self.registry.get('ETHUSD'))
+        self.assertNotIn('ETHUSD', self.registry)
+        with self.assertRaises(KeyError):
+            self.registry.native('ETHUSD')
+
+
+class KrakenRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = MetadataCache(False)
+        self.listing = None  # Listing fetched from Kraken; None fails fetches
+        self.fetches = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+        def fetch():
+            self.gate.wait(5)
+            self.fetches += 1
+            return self.listing
+
+        sources = dict(pairs.SOURCES, Kraken=('kraken.asset_pairs', fetch,
+                                              pairs.KRAKEN_ASSET_PAIRS,
+                                              kraken_registry))
+        for name, value in (('metadata_cache', self.cache),
+                            ('SOURCES', sources), ('_registries', {}),
+                            ('_checked', {})):
+            patcher = mock.patch.object(pairs, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(condition())
+
+    def test_snapshot(self):
+        kraken = registry('Kraken')
+        self.assertIs(kraken, registry('Kraken'))
+        self.assertEqual(kraken.native('btcusd'), 'XXBTZUSD')
+        self.assertEqual(kraken.native('XBTUSD'), 'XXBTZUSD')
+        self.assertEqual(kraken.native('XBT_USD'), 'XXBTZUSD')
+        self.assertEqual(kraken.native('doge/btc'), 'XXDGXXBT')
+        self.assertEqual(kraken.native('USDTUSD'), 'USDTZUSD')
+        self.assertEqual(kraken.canonical('DASHXBT'), 'DASHBTC')
+        self.assertEqual(kraken.tick_size('XXBTZUSD'), Decimal('0.1'))
+        self.assertEqual(kraken.lot_size('ETHXBT'), Decimal('0.00000001'))
+
+    def test_fetched_listing_replaces_snapshot(self):
+        self.listing = {'ADAUSD': ['ADAUSD', 'ADA', 'ZUSD', 6, 8]}
+        self.gate.clear()
+        # The listing is fetched in the background, the snapshot used meanwhile
+        self.assertNotIn('ADAUSD', registry('Kraken'))
+        self.gate.set()
+        self.wait_for(lambda: self.cache.peek('kraken.asset_pairs'))
+        kraken = registry('Kraken')
+        self.assertEqual(kraken.native('ada_usd'), 'ADAUSD')
+        self.assertNotIn('XXBTZUSD', kraken)
+        self.assertIs(kraken, registry('Kraken'))
+
+    def test_failed_fetch_keeps_snapshot(self):
+        kraken = registry('Kraken')
+        self.wait_for(lambda: self.fetches == 1)
+        # The cache is checked at most every CHECK_INTERVAL seconds
+        self.assertIs(registry('Kraken'), kraken)
+        time.sleep(0.05)
+        self.assertEqual(self.fetches, 1)
+        with mock.patch.object(pairs, 'CHECK_INTERVAL', 0):
+            self.assertIs(registry('Kraken'), kraken)
+        self.wait_for(lambda: self.fetches == 2)
+
+    def test_refresh(self):
+        self.listing = {'ADAUSD': ['ADAUSD', 'ADA', 'ZUSD', 6, 8]}
+        self.assertEqual(registry('Kraken', refresh=True).native('ada_usd'),
+                         'ADAUSD')
+        self.assertEqual(self.cache.peek('kraken.asset_pairs'), self.listing)
+
+
+class KrakenPairFormattingTests(unittest.TestCase):
+    def test_format_pair(self):
+        self.assertEqual(KrknFormatter.format_pair('BTC/EUR'), 'XXBTZEUR')
+        self.assertEqual(KrknFormatter.format_pair('dashxbt'), 'DASHXBT')
+        # Unlisted pairs are formatted by string rules
+        self.assertEqual(KrknFormatter.format_pair('xxbtxltc'), 'XXBTXLTC')
+
+    def test_order_book(self):
+        book = {'bids': [], 'asks': []}
+        data = {'result': {'XXBTZUSD': book}}
+        for pair in ('BTCUSD', 'XBTUSD', 'XXBTZUSD'):
+            self.assertIs(KrknFormatter.order_book(data, None, pair), book)
+
+    def test_make_params(self):
+        q = Kraken().make_params('btcusd', 'ETH-BTC', 'ADAUSD')
+        self.assertEqual(q, {'pair': 'XXBTZUSD,XETHXXBT,ADAUSD'})
+
+
+if __name__ == '__main__':
+    unittest.main()
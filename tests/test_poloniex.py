@@ -0,0 +1,51 @@
+# Import Built-Ins
+import logging
+import asyncio
+import queue
+import unittest
+from functools import partial
+
+# Import Third-Party
+from autobahn.wamp.types import ComponentConfig
+
+# Import Homebrew
+from bitex.api.WSS.messages import Ticker, BookDelta, Trade
+from bitex.api.WSS.poloniex import PoloniexSession, PoloniexWSS, put_event
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class PoloniexSessionTests(unittest.TestCase):
+    def test_single_session_subscribes_to_all_channels(self):
+        q = queue.Queue()
+        session = PoloniexSession(ComponentConfig('realm1', {
+            'channels': ['BTC_ETH', 'ticker'],
+            'on_event': partial(put_event, q)}))
+        handlers = {}
+
+        async def subscribe(handler, channel):
+            handlers[channel] = handler
+        session.subscribe = subscribe
+
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(session.onJoin())
+        loop.close()
+
+        self.assertEqual(sorted(handlers), ['BTC_ETH', 'ticker'])
+        handlers['ticker']('BTC_ETH', '0.1')
+        handlers['BTC_ETH']({'type': 'orderBookRemove', 'data': {'rate': '1'}},
+                            {'type': 'newTrade', 'data': {'rate': '2'}}, seq=5)
+        self.assertEqual(q.get_nowait()[:4],
+                         Ticker('Poloniex', 'ticker', 'BTC_ETH', ('0.1',), 0)[:4])
+        delta, trade = q.get_nowait(), q.get_nowait()
+        self.assertIsInstance(delta, BookDelta)
+        self.assertEqual(delta.data, {'rate': '1', 'type': 'orderBookRemove',
+                                      'seq': 5})
+        self.assertIsInstance(trade, Trade)
+        self.assertEqual(trade.pair, 'BTC_ETH')
+
+    def test_data_channel(self):
+        self.assertIsInstance(PoloniexWSS(['ticker']).data_q, queue.Queue)
+        wss = PoloniexWSS(['ticker'], multiprocess=True)
+        self.assertFalse(isinstance(wss.data_q, queue.Queue))
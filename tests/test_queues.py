@@ -0,0 +1,119 @@
+# Import Built-Ins
+import logging
+import queue
+import threading
+import unittest
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.WSS.queues import DataQueue, BLOCK, DROP_OLDEST, CONFLATE
+from bitex.api.WSS.messages import Ticker, BookSnapshot, BookDelta, Trade
+from bitex.api.WSS.poloniex import PoloniexWSS
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class DataQueueTests(unittest.TestCase):
+    def drain(self, q):
+        items = []
+        while not q.empty():
+            items.append(q.get_nowait())
+            q.task_done()
+        return items
+
+    def test_block(self):
+        q = DataQueue(1, BLOCK)
+        q.put(('ticker', 'BTCUSD', 1))
+        t = threading.Thread(target=q.put, args=(('ticker', 'BTCUSD', 2),))
+        t.start()
+        t.join(0.05)
+        self.assertTrue(t.is_alive())
+        self.assertEqual(q.get(), ('ticker', 'BTCUSD', 1))
+        t.join(1)
+        self.assertEqual(q.get(), ('ticker', 'BTCUSD', 2))
+
+    def test_drop_oldest(self):
+        q = DataQueue(2, DROP_OLDEST)
+        for i in range(5):
+            q.put(('trades', 'BTCUSD', i))
+        self.assertEqual(self.drain(q), [('trades', 'BTCUSD', 3),
+                                         ('trades', 'BTCUSD', 4)])
+        self.assertEqual(q.stats()['dropped'], 3)
+        q.join()  # Dropped messages must not count as unfinished tasks
+
+    def test_conflate(self):
+        q = DataQueue(3, CONFLATE)
+        q.put(Ticker('Bitfinex', 'ticker', 'BTCUSD', 1, 0))
+        q.put(Ticker('Bitfinex', 'ticker', 'ETHUSD', 1, 0))
+        q.put(Ticker('Bitfinex', 'ticker', 'BTCUSD', 2, 0))
+        self.assertEqual(q.get_nowait().data, 2)
+        for pair in ('BTCUSD', 'LTCUSD', 'XMRUSD'):
+            q.put(Ticker('Bitfinex', 'ticker', pair, 3, 0))
+        self.assertEqual(q.qsize(), 3)
+        self.assertEqual([msg.pair for msg in self.drain(q)],
+                         ['BTCUSD', 'LTCUSD', 'XMRUSD'])
+        self.assertEqual((q.conflated, q.dropped), (1, 1))
+
+    def test_deltas_and_trades_are_not_conflated(self):
+        q = DataQueue(10, CONFLATE)
+        msgs = [BookSnapshot('GDAX', 'full', 'BTC-USD', 0, 0),
+                BookDelta('GDAX', 'full', 'BTC-USD', 1, 0),
+                BookDelta('GDAX', 'full', 'BTC-USD', 2, 0),
+                Trade('GDAX', 'full', 'BTC-USD', 3, 0),
+                Trade('GDAX', 'full', 'BTC-USD', 4, 0),
+                Ticker('GDAX', 'full', 'BTC-USD', 5, 0),
+                BookSnapshot('GDAX', 'full', 'BTC-USD', 6, 0)]
+        for msg in msgs:
+            q.put(msg)
+        self.assertEqual([(type(m), m.data) for m in self.drain(q)],
+                         [(BookSnapshot, 6), (BookDelta, 1), (BookDelta, 2),
+                          (Trade, 3), (Trade, 4), (Ticker, 5)])
+        self.assertEqual(q.conflated, 1)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            DataQueue(policy='lifo')
+
+    def test_client_queue(self):
+        wss = PoloniexWSS(['ticker', 'BTC_ETH'])
+        q = wss.configure_queue(10, CONFLATE)
+        self.assertIs(wss.data_q, q)
+        q.put(Ticker('Poloniex', 'ticker', 'BTC_ETH', (1,), 1))
+        q.put(Ticker('Poloniex', 'ticker', 'BTC_XMR', (1,), 1))
+        q.put(Ticker('Poloniex', 'ticker', 'BTC_ETH', (2,), 2))
+        self.assertEqual((q.qsize(), q.conflated), (2, 1))
+
+
+class BatchTests(unittest.TestCase):
+    def test_get_batch(self):
+        q = DataQueue(3, BLOCK)
+        for i in range(3):
+            q.put(i)
+        t = threading.Thread(target=q.put, args=(3,))
+        t.start()
+        self.assertEqual(q.get_batch(2), [0, 1])
+        t.join(1)
+        self.assertEqual(q.get_batch(), [2, 3])
+        self.assertEqual(q.get_batch(timeout=0.01), [])
+
+    def test_get_batch_waits_for_first_message(self):
+        q = DataQueue()
+        threading.Timer(0.05, q.put, args=('a',)).start()
+        self.assertEqual(q.get_batch(timeout=5), ['a'])
+
+    def test_client_drain(self):
+        wss = PoloniexWSS(['ticker'])
+        for i in range(5):
+            wss.data_q.put(i)
+        self.assertEqual(wss.drain(2), [0, 1])
+        self.assertEqual(wss.get_batch(timeout=1), [2, 3, 4])
+        self.assertEqual(wss.drain(), [])
+
+        # Queues without get_batch(), i.e. multiprocessing.Queue
+        wss.data_q = queue.Queue()
+        for i in range(3):
+            wss.data_q.put(i)
+        self.assertEqual(wss.get_batch(2, timeout=1), [0, 1])
+        self.assertEqual(wss.get_batch(timeout=1), [2])
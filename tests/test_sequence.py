@@ -0,0 +1,144 @@
+# Import Built-Ins
+import logging
+import json
+import threading
+import time
+import unittest
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.WSS.sequence import SequenceTracker, BookResynchronizer
+from bitex.api.WSS.sequence import IN_ORDER, OUT_OF_ORDER, GAP
+from bitex.api.WSS.bitfinex import BitfinexWSS
+from bitex.api.WSS.gdax import GDAXWSS
+from bitex.api.WSS.messages import Trade, Ticker, BookSnapshot, BookDelta
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class SequenceTrackerTests(unittest.TestCase):
+    def test_check(self):
+        tracker = SequenceTracker()
+        self.assertEqual(tracker.check('a', 5), IN_ORDER)
+        self.assertEqual(tracker.check('a', 6), IN_ORDER)
+        self.assertEqual(tracker.check('b', 1), IN_ORDER)
+        self.assertEqual(tracker.check('a', 6), OUT_OF_ORDER)
+        self.assertEqual(tracker.check('a', 9), GAP)
+        self.assertEqual(tracker.check('a', 10), IN_ORDER)
+        self.assertEqual((tracker.gaps, tracker.out_of_order), (1, 1))
+
+    def test_reset(self):
+        tracker = SequenceTracker()
+        tracker.reset('a', 10)
+        self.assertEqual(tracker.check('a', 12), GAP)
+        tracker.reset('a')
+        self.assertEqual(tracker.check('a', 1), IN_ORDER)
+
+
+class BookResynchronizerTests(unittest.TestCase):
+    def setUp(self):
+        self.output = []
+        self.snapshot_seq = 10
+        self.fetching = threading.Event()
+        self.release = threading.Event()
+        self.done = threading.Event()
+        self.sync = BookResynchronizer(self.fetch, self.on_snapshot,
+                                       self.on_delta, retry_delay=0)
+
+    def fetch(self, key):
+        self.fetching.set()
+        self.release.wait(5)
+        return self.snapshot_seq, 'snapshot %s' % self.snapshot_seq
+
+    def on_snapshot(self, key, snapshot):
+        self.output.append(snapshot)
+        self.done.set()
+
+    def on_delta(self, key, seq, delta):
+        self.output.append(seq)
+
+    def resync(self, *seqs):
+        self.fetching.wait(5)
+        for seq in seqs:
+            self.sync.process('BTCUSD', seq, None)
+        self.fetching.clear()
+        self.done.clear()
+        self.release.set()
+        self.done.wait(5)
+        self.release.clear()
+        # Buffered deltas are replayed after the snapshot
+        deadline = time.monotonic() + 5
+        while 'BTCUSD' in self.sync._buffers and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    def test_snapshot_and_buffered_deltas_are_replayed_in_order(self):
+        self.sync.process('BTCUSD', 9, None)
+        self.resync(10, 11, 12)
+        self.sync.process('BTCUSD', 13, None)
+        self.assertEqual(self.output, ['snapshot 10', 11, 12, 13])
+
+    def test_gap_triggers_resync(self):
+        self.sync.process('BTCUSD', 10, None)
+        self.resync(11)
+        self.snapshot_seq = 20
+        self.sync.process('BTCUSD', 15, None)
+        self.resync(21)
+        self.sync.process('BTCUSD', 21, None)
+        self.sync.process('BTCUSD', 22, None)
+        self.assertEqual(self.output, ['snapshot 10', 11, 'snapshot 20', 21,
+                                       22])
+        self.assertEqual(self.sync.resyncs, 2)
+
+    def test_callbacks_are_made_without_holding_the_lock(self):
+        def on_snapshot(key, snapshot):
+            # Would deadlock if called with the lock held
+            self.sync.process(key, 13, None)
+            self.on_snapshot(key, snapshot)
+
+        self.sync.on_snapshot = on_snapshot
+        self.sync.process('BTCUSD', 9, None)
+        self.resync(11, 12)
+        self.sync.process('BTCUSD', 14, None)
+        self.assertEqual(self.output, ['snapshot 10', 11, 12, 13, 14])
+
+
+class GDAXSequencingTests(unittest.TestCase):
+    def test_channels(self):
+        wss = GDAXWSS(resync_books=True, pairs=['BTC-USD'])
+        wss.book_sync.fetch_snapshot = lambda pair: (10, {'sequence': 10})
+        wss.on_message(None, json.dumps({'type': 'open', 'sequence': 11,
+                                         'product_id': 'BTC-USD'}), 1)
+        snapshot = wss.get(timeout=5)
+        delta = wss.get(timeout=5)
+        self.assertIsInstance(snapshot, BookSnapshot)
+        self.assertIsInstance(delta, BookDelta)
+        self.assertEqual((snapshot.channel, delta.channel), ('snapshot', 'full'))
+        self.assertIsNone(wss.conflation_key(delta))
+
+        wss.book_sync = None
+        for seq, msg_type in ((12, 'match'), (13, 'ticker')):
+            wss.on_message(None, json.dumps({'type': msg_type, 'sequence': seq,
+                                             'product_id': 'BTC-USD'}), 1)
+        trade, ticker = wss.drain()
+        self.assertEqual((type(trade), trade.channel), (Trade, 'matches'))
+        self.assertEqual((type(ticker), ticker.channel), (Ticker, 'ticker'))
+        self.assertNotEqual(wss.conflation_key(ticker),
+                            wss.conflation_key(snapshot))
+
+
+class BitfinexSequencingTests(unittest.TestCase):
+    def test_gap_restarts_client(self):
+        wss = BitfinexWSS()
+        wss.sequencing = True
+        wss.channel_labels[10] = ('trades', {'pair': 'BTCUSD'})
+        wss.channels[10] = wss._handle_trades
+        wss.handle_data(0, [10, ['te', [1, 2, 3, 4]], 1])
+        wss.handle_data(0, [10, 'hb', 2])
+        wss.handle_data(0, [10, ['te', [1, 2, 3, 4]], 4])
+        self.assertEqual(wss.data_q.get_nowait(),
+                         Trade('Bitfinex', 'trades', 'BTCUSD',
+                               [['te', [1, 2, 3, 4]]], 0))
+        self.assertTrue(wss.data_q.empty())
+        self.assertEqual(wss._controller_q.get_nowait(), 'restart')
@@ -0,0 +1,84 @@
+# Import Built-Ins
+import logging
+import json
+import unittest
+
+# Import Third-Party
+
+# Import Homebrew
+from bitex.api.REST.stream import OrderBookScanner, iter_order_book
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class ChunkedResponse:
+    def __init__(self, body, chunk_size):
+        self.chunks = [body[i:i + chunk_size]
+                       for i in range(0, len(body), chunk_size)]
+        self.read = 0
+        self.closed = False
+        self.url = 'http://localhost/'
+        self.status_code = 200
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+POLONIEX_BOOK = {'asks': [['0.0%d' % i, i] for i in range(1, 50)],
+                 'bids': [['0.00%d' % i, i] for i in range(1, 50)],
+                 'isFrozen': '0', 'seq': 1234}
+BITTREX_BOOK = {'success': True, 'message': '',
+                'result': {'buy': [{'Quantity': i, 'Rate': i / 10}
+                                   for i in range(20)],
+                           'sell': [{'Quantity': i, 'Rate': i * 10}
+                                    for i in range(20)]}}
+
+
+class OrderBookScannerTests(unittest.TestCase):
+    def test_levels_split_across_chunks(self):
+        body = json.dumps(POLONIEX_BOOK)
+        for size in (1, 3, 7, 64, len(body)):
+            scanner = OrderBookScanner({'bids': 'bids', 'asks': 'asks'})
+            levels = []
+            for i in range(0, len(body), size):
+                levels += scanner.feed(body[i:i + size])
+            self.assertEqual([l for s, l in levels if s == 'asks'],
+                             POLONIEX_BOOK['asks'])
+            self.assertEqual([l for s, l in levels if s == 'bids'],
+                             POLONIEX_BOOK['bids'])
+
+    def test_nested_sides_are_renamed(self):
+        scanner = OrderBookScanner({'buy': 'bids', 'sell': 'asks'})
+        levels = scanner.feed(json.dumps(BITTREX_BOOK))
+        self.assertEqual(levels[0], ('bids', {'Quantity': 0, 'Rate': 0}))
+        self.assertEqual(len(levels), 40)
+
+    def test_depth_limits_levels_per_side(self):
+        scanner = OrderBookScanner({'bids': 'bids', 'asks': 'asks'}, depth=5)
+        levels = scanner.feed(json.dumps(POLONIEX_BOOK))
+        self.assertEqual(len(levels), 10)
+        self.assertEqual(levels[5], ('bids', ['0.001', 1]))
+        self.assertTrue(scanner.done)
+
+
+class IterOrderBookTests(unittest.TestCase):
+    def test_stops_reading_once_depth_is_reached(self):
+        r = ChunkedResponse(json.dumps(BITTREX_BOOK).encode(), 64)
+        levels = list(iter_order_book(r, {'buy': 'bids', 'sell': 'asks'},
+                                      depth=3))
+        self.assertEqual(len(levels), 6)
+        self.assertLess(r.read, len(r.chunks))
+        self.assertTrue(r.closed)
+
+    def test_multibyte_characters_split_across_chunks(self):
+        body = json.dumps({'bids': [['1', 'é']], 'asks': []},
+                          ensure_ascii=False).encode()
+        r = ChunkedResponse(body, 1)
+        self.assertEqual(list(iter_order_book(r, {'bids': 'bids'})),
+                         [('bids', ['1', 'é'])])
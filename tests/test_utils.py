@@ -0,0 +1,157 @@
+# Import Built-Ins
+import logging
+import asyncio
+import pickle
+import unittest
+from decimal import Decimal
+
+# Import Third-Party
+import requests
+
+# Import Homebrew
+from bitex.api.REST.response import APIResponse
+from bitex.utils import return_api_response, set_json_decoder, json_loads
+from bitex.utils import JSON_BACKENDS
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+def make_response(content, status_code=200):
+    r = requests.Response()
+    r.status_code = status_code
+    r._content = content
+    r.request = requests.Request('GET', 'http://localhost/').prepare()
+    return APIResponse(r)
+
+
+class ReturnAPIResponseTests(unittest.TestCase):
+    def test_formatter_is_applied(self):
+        @return_api_response(lambda data, *args, **kwargs: data['a'])
+        def query():
+            return make_response(b'{"a": 1}')
+
+        self.assertEqual(query().formatted, 1)
+
+    def test_as_array_is_passed_to_formatter_only(self):
+        @return_api_response(lambda data, *args, **kwargs: kwargs)
+        def query(**kwargs):
+            self.assertEqual(kwargs, {'count': 1})
+            return make_response(b'{"a": 1}')
+
+        self.assertEqual(query(count=1, as_array=True).formatted,
+                         {'count': 1, 'as_array': True})
+        self.assertEqual(query(count=1).formatted, {'count': 1})
+
+    def test_awaitable_responses_are_formatted_once_awaited(self):
+        @return_api_response(lambda data, *args, **kwargs: data['a'])
+        async def query():
+            return make_response(b'{"a": 1}')
+
+        coro = query()
+        self.assertTrue(asyncio.iscoroutine(coro))
+        loop = asyncio.new_event_loop()
+        try:
+            r = loop.run_until_complete(coro)
+        finally:
+            loop.close()
+        self.assertEqual(r.formatted, 1)
+
+
+class JSONDecoderTests(unittest.TestCase):
+    def tearDown(self):
+        set_json_decoder()
+
+    def test_default_backend_decodes_str_and_bytes(self):
+        for raw in ('{"a": [1, "2.5", 3.5]}', b'{"a": [1, "2.5", 3.5]}'):
+            self.assertEqual(json_loads(raw), {'a': [1, '2.5', 3.5]})
+
+    def test_stdlib_backend(self):
+        self.assertEqual(set_json_decoder('json'), 'json')
+        self.assertEqual(json_loads(b'[1.5]'), [1.5])
+
+    def test_decimal_floats(self):
+        self.assertEqual(set_json_decoder('json', parse_float=Decimal), 'json')
+        self.assertEqual(json_loads(b'[0.1, 2]'), [Decimal('0.1'), 2])
+        self.assertEqual(make_response(b'[0.1]').json(), [Decimal('0.1')])
+
+    def test_decimal_floats_are_parsed_losslessly(self):
+        for backend in (None,) + JSON_BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(set_json_decoder(backend, parse_float=Decimal),
+                                 'json')
+                self.assertEqual(json_loads(b'[0.12345678901234567890123]'),
+                                 [Decimal('0.12345678901234567890123')])
+
+    def test_numeric_strings_with_every_backend(self):
+        # Kraken's public/Ticker response, which sends prices as strings
+        ticker = (b'{"error":[],"result":{"XXBTZUSD":{"a":["6470.00000","1",'
+                  b'"1.000"],"b":["6469.90000","2","2.000"],"c":["6470.00000",'
+                  b'"0.01000000"],"t":[4411,12010],"o":"6451.2"}}}')
+        for backend in JSON_BACKENDS:
+            try:
+                set_json_decoder(backend, parse_numeric_strings=Decimal)
+            except ImportError:
+                continue
+            with self.subTest(backend=backend):
+                result = json_loads(ticker)['result']['XXBTZUSD']
+                self.assertEqual(result['a'], [Decimal('6470.00000'),
+                                               Decimal('1'), Decimal('1.000')])
+                self.assertTrue(all(isinstance(v, Decimal)
+                                    for v in result['a'] + result['b']))
+                self.assertEqual(result['c'][1], Decimal('0.01000000'))
+                self.assertEqual(result['t'], [4411, 12010])
+                self.assertEqual(result['o'], Decimal('6451.2'))
+                self.assertEqual(json_loads(b'[0.5, "42", "1e5", "-2.5E-3"]'),
+                                 [0.5, Decimal('42'), Decimal('1e5'),
+                                  Decimal('-2.5E-3')])
+                self.assertEqual(json_loads(b'["XXBT", "007", "1.", " 1", ""]'),
+                                 ['XXBT', '007', '1.', ' 1', ''])
+
+    def test_parse_float_leaves_strings(self):
+        set_json_decoder(parse_float=Decimal)
+        self.assertEqual(json_loads(b'[0.1, "0.1"]'), [Decimal('0.1'), '0.1'])
+
+    def test_invalid_configurations_raise(self):
+        with self.assertRaises(ValueError):
+            set_json_decoder('yaml')
+
+
+class APIResponseTests(unittest.TestCase):
+    def test_wraps_response_without_copying(self):
+        r = make_response(b'{"a": 1}')
+        self.assertIsInstance(r, requests.Response)
+        self.assertNotIn('_content', r.__dict__)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.text, '{"a": 1}')
+
+    def test_json_is_decoded_once(self):
+        r = make_response(b'{"a": [1, 2]}')
+        self.assertIs(r.json(), r.json())
+        self.assertIs(APIResponse(r).json(), r.json())
+
+    def test_formatter_is_applied_lazily_and_once(self):
+        calls = []
+
+        def formatter(data, *args, **kwargs):
+            calls.append((args, kwargs))
+            return data['a']
+
+        r = make_response(b'{"a": 1}')
+        r.set_formatter(formatter, 'pair', depth=1)
+        self.assertEqual(calls, [])
+        self.assertEqual(r.formatted, 1)
+        self.assertEqual(r.formatted, 1)
+        self.assertEqual(calls, [(('pair',), {'depth': 1})])
+
+    def test_invalid_json_results_in_no_formatted_data(self):
+        r = make_response(b'not json')
+        r.set_formatter(lambda data: data)
+        self.assertIsNone(r.formatted)
+
+    def test_can_be_pickled(self):
+        r = make_response(b'{"a": 1}')
+        r.formatted = 'formatted'
+        r = pickle.loads(pickle.dumps(r))
+        self.assertEqual(r.formatted, 'formatted')
+        self.assertEqual(r.json(), {'a': 1})